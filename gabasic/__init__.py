@@ -1,18 +1,49 @@
-from .base import ToolboxContributor
-from .fittype import FitnessMax
-from .indivs import BitString
-from .eval import SumItems
-from .sel import TournamentSelection, ProportionalSelection
-from .gaops import (
-  OnePointCrossover,
-  TwoPointCrossover,
-  UniformCrossover,
-  FlipBitMutation,
-  GaussianMutation,
-  OnePointMappingCrossover,
-  TwoPointMappingCrossover,
-  UniformMappingCrossover
-)
-from .algo import SimpleGa
+import importlib
+
+# Submodule defining each public name. Submodules are only imported when one
+# of their names is first used, so importing the package (and starting
+# ``python -m gabasic``) only pays for the components a model actually uses.
+_EXPORTS = {
+  'ToolboxContributor': 'base',
+  'FitnessMax': 'fittype',
+  'BitString': 'indivs',
+  'PackedBits': 'indivs',
+  'PackedBitString': 'indivs',
+  'ChunkedMapping': 'indivs',
+  'SumItems': 'eval',
+  'TournamentSelection': 'sel',
+  'ProportionalSelection': 'sel',
+  'OnePointCrossover': 'gaops',
+  'TwoPointCrossover': 'gaops',
+  'UniformCrossover': 'gaops',
+  'FlipBitMutation': 'gaops',
+  'GaussianMutation': 'gaops',
+  'OnePointMappingCrossover': 'gaops',
+  'TwoPointMappingCrossover': 'gaops',
+  'UniformMappingCrossover': 'gaops',
+  'OnePointArrayCrossover': 'gaops',
+  'TwoPointArrayCrossover': 'gaops',
+  'UniformArrayCrossover': 'gaops',
+  'ProcessPoolMap': 'parallel',
+  'SimpleGa': 'algo',
+  'MatrixGa': 'algo',
+  'IslandGa': 'algo'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+  module_name = _EXPORTS.get(name)
+  if module_name is None:
+    raise AttributeError(
+      'module {!r} has no attribute {!r}'.format(__name__, name)
+    )
+  value = getattr(importlib.import_module('.' + module_name, __name__), name)
+  globals()[name] = value
+  return value
+
+def __dir__():
+  return sorted(set(globals()) | set(_EXPORTS))
 
 # vim: set ts=2 sw=2 expandtab:
@@ -1,66 +1,72 @@
-import sys
+import argparse
 import configparser
-import importlib
-from . import SimpleGa
+from .model import build_ga
+from .checkpoint import read_checkpoint, read_checkpoint_header
 
-import matplotlib.pyplot as plt
 
+arg_parser = argparse.ArgumentParser(prog='gabasic')
+arg_parser.add_argument(
+  'model_ini',
+  nargs='?',
+  help='GA model configuration INI (taken from the checkpoint if resuming)'
+)
+arg_parser.add_argument(
+  '--resume',
+  metavar='CHECKPOINT',
+  help='resume the run saved in a checkpoint file'
+)
+arg_parser.add_argument(
+  '--metrics',
+  metavar='FILE',
+  help='stream the statistics of each generation to a JSON Lines file '
+    '(or CSV, if the name ends in .csv); overrides metrics_file'
+)
+arg_parser.add_argument(
+  '--print-every',
+  metavar='N',
+  type=int,
+  help='print the statistics of every N-th generation (0 prints none); '
+    'overrides print_every'
+)
+arg_parser.add_argument(
+  '--no-plot',
+  action='store_true',
+  help='do not plot the results of the run (e.g., on headless machines)'
+)
+arg_parser.add_argument(
+  '--plot-file',
+  metavar='IMAGE',
+  help='save the plot to an image file instead of showing it'
+)
+args = arg_parser.parse_args()
+if args.model_ini is None and args.resume is None:
+  arg_parser.error('a model INI or a checkpoint to resume is required')
 
-def resolve_symbol(fq_symbol_name):
-  symbol_comps = fq_symbol_name.split('.')
-  symbol_name = symbol_comps[-1]
-  is_local = len(symbol_comps) == 1
-  source_module = importlib.import_module('gabasic')
-  if not is_local:
-    mod_name = '.'.join(symbol_comps[:-1])
-    source_module = importlib.import_module(mod_name)
-  return getattr(source_module, symbol_name)
-
-def create_component(ini_config, ini_key, *args, **kwargs):
-  comp_name = ini_config['GA'][ini_key]
-  comp_cls = resolve_symbol(comp_name)
-  comp_config = {} if not parser.has_section(comp_name) else dict(ini_config[comp_name].items())
-  comp_config.update(kwargs)
-  return comp_cls(*args, **comp_config)
-    
-if len(sys.argv) < 2:
-  print('Usage: gabasic <configuration INI>')
-  sys.exit(1)
-
-print('Executing GA using INI: {}'.format(sys.argv[1]))
 parser = configparser.ConfigParser()
-parser.read(sys.argv[1])
-ga_config = dict(parser['GA'].items())
-fitness_type = create_component(parser, 'fitness_type')
-individual = create_component(parser, 'individual', ga_config['fitness_type'])
-fitness_eval = create_component(parser, 'fitness_eval')
-selection = create_component(parser, 'selection')
-crossover_type = create_component(parser, 'crossover_type')
-mutation_type = create_component(parser, 'mutation_type')
-toolbox_mods = [fitness_eval, individual, selection, crossover_type, mutation_type]
-
-if 'algorithm' in parser['GA']:
-  ga = create_component(parser, 'algorithm', toolbox_mods, **ga_config)
+if args.model_ini is not None:
+  print('Executing GA using INI: {}'.format(args.model_ini))
+  parser.read(args.model_ini)
 else:
-  ga = SimpleGa(toolbox_mods, **ga_config)
-
-pop, log = ga.run()
-
-# Plot the results of the run
-gen = log.select("gen")
-avg_fit = log.select("avg")
-best_fit = log.select("max")
-
-line1 = plt.plot(gen, avg_fit, "b-", label="Average Fitness")
-line2 = plt.plot(gen, best_fit, "r-", label="Best Fitness")
-plt.xlabel("Generation")
-plt.ylabel("Fitness", color="b")
+  print('Resuming GA from checkpoint: {}'.format(args.resume))
+  parser.read_dict(read_checkpoint_header(args.resume)['model'])
+if args.metrics is not None:
+  parser['GA']['metrics_file'] = args.metrics
+if args.print_every is not None:
+  parser['GA']['print_every'] = str(args.print_every)
+ga = build_ga(parser)
 
-lns = line1 + line2
-labels = [l.get_label() for l in lns]
-plt.legend(lns, labels, loc="center right")
+resume_state = None
+if args.resume is not None:
+  # The checkpoint refers to classes created by the model's components, so it
+  # can only be read once they have been constructed.
+  resume_state = read_checkpoint(args.resume)
+pop, log = ga.run(resume_state)
 
-plt.show()
+if not args.no_plot:
+  # Plotting needs matplotlib, which takes long to import; it is only imported
+  # when a plot is requested.
+  from .plot import plot_metrics
+  plot_metrics(log, args.plot_file)
 
 
 # vim: set ts=2 sw=2 expandtab:
@@ -1,7 +1,20 @@
 # pylint: disable=no-member
 
+import pickle
+import random
+import cProfile
+import operator
+import traceback
+import multiprocessing
 import numpy as np
-from deap import algorithms, tools, base
+from deap import algorithms, tools, base, creator
+from .parallel import ProcessPoolMap
+from .checkpoint import write_checkpoint, dumps_state
+from .metrics import open_metrics_sink
+from . import matrixops
+from . import profiling
+from . import fitcache
+from .termination import create_termination
 
 
 class SimpleGa(object):
@@ -11,29 +24,741 @@ class SimpleGa(object):
     self.max_generation_count = int(kwargs.get('max_generation_count', '100'))
     self.crossover_probability = float(kwargs.get('crossover_probability', '0.5'))
     self.mutation_probability = float(kwargs.get('mutation_probability', '0.1'))
+    self.seed = kwargs.get('seed')
+    self.workers = kwargs.get('workers')
+    if self.workers is not None:
+      self.workers = int(self.workers)
+    self.chunk_size = int(kwargs.get('chunk_size', '16'))
+    self.checkpoint_file = kwargs.get('checkpoint_file')
+    self.checkpoint_every = int(kwargs.get('checkpoint_every', '10'))
+    if self.checkpoint_every < 1:
+      raise ValueError('Checkpoint interval must be positive.')
+    self.metrics_file = kwargs.get('metrics_file')
+    self.print_every = int(kwargs.get('print_every', '1'))
+    if self.print_every < 0:
+      raise ValueError('Print interval cannot be negative.')
+    self._metrics = None
+    self.profile_operators = kwargs.get(
+      'profile_operators',
+      'false'
+    ).lower() in ('1', 'true', 'yes', 'on')
+    self.profile_file = kwargs.get('profile_file')
+    self.fitness_cache_size = int(kwargs.get('fitness_cache_size', '0'))
+    # Criteria that may stop the run before ``max_generation_count``.
+    self.termination = create_termination(**kwargs)
+    # Model INI contents stored in every checkpoint's header, so that a run
+    # can be resumed from the checkpoint alone.
+    self.model_config = None
+    self.toolbox_mods = list(toolbox_mods)
     self.toolbox = base.Toolbox()
-    for a_mod in toolbox_mods:
-      a_mod.configure_toolbox(self.toolbox)
+    op_owners = profiling.configure_toolbox(self.toolbox, toolbox_mods)
     self.stats = tools.Statistics(lambda ind: ind.fitness.values)
     self.stats.register('avg', np.mean)
     self.stats.register('std', np.std)
     self.stats.register('min', np.min)
     self.stats.register('max', np.max)
-    self.hof = tools.HallOfFame(1)
+    # Components may register ``similar`` for individuals that cannot be
+    # compared with ``==`` (e.g., NumPy arrays).
+    self.hof = tools.HallOfFame(
+      1,
+      similar=getattr(self.toolbox, 'similar', operator.eq)
+    )
+    # Operators are only wrapped (see OperatorTimer) while measuring them, so
+    # other runs pay nothing for it.
+    self._timer = None
+    if self.profile_operators or self.profile_file is not None:
+      self._timer = profiling.OperatorTimer(self.toolbox, op_owners)
+    # Individual components may register ``genotype_key`` for individuals
+    # whose genotype is not identified by their items alone.
+    self._fitness_cache = None
+    if self.fitness_cache_size:
+      for a_mod in self.toolbox_mods:
+        if not getattr(a_mod, 'cacheable_fitness', True):
+          raise ValueError(
+            '{} fitness cannot be cached; remove fitness_cache_size.'.format(
+              type(a_mod).__name__
+            )
+          )
+      self._fitness_cache = fitcache.FitnessCache(
+        self.fitness_cache_size,
+        getattr(self.toolbox, 'genotype_key', fitcache.genotype_key)
+      )
+
+  @property
+  def multiprocess(self):
+    """Whether individuals are handled by more than one process."""
+    return self.workers is not None
   
-  def run(self):
-    population = self.toolbox.population(n=self.population_size)
-    population, log = algorithms.eaSimple(
-      population,
+  def run(self, resume=None):
+    """Run the GA.
+
+    Parameters
+    ----------
+    resume : dict or None
+      If provided, the run state read from a checkpoint (see
+      ``gabasic.checkpoint``); the run continues after the generation at
+      which the checkpoint was written, exactly as the interrupted run would
+      have.
+
+    Returns
+    -------
+    tuple
+      Final population and logbook.
+    """
+    self._start(resume)
+    try:
+      if self.workers is None:
+        return self._timed_evolve(resume)
+      inner_map = self.toolbox.map
+      pool_map = ProcessPoolMap(self.toolbox, self.workers, self.chunk_size)
+      with pool_map:
+        self.toolbox.register('map', pool_map)
+        try:
+          return self._timed_evolve(resume)
+        finally:
+          self.toolbox.map = inner_map
+    finally:
+      self._finish()
+
+  def _start(self, resume):
+    if resume is not None:
+      self._restore_checkpoint(resume)
+    elif self.seed is not None:
+      random.seed(int(self.seed))
+      np.random.seed(int(self.seed))
+    if self.termination is not None:
+      self.termination.start()
+    if self.metrics_file is not None:
+      self._metrics = open_metrics_sink(self.metrics_file, self._log_fields())
+      if resume is not None:
+        # Records written after the checkpoint are dropped, as the resumed
+        # run produces them again.
+        for a_record in resume['logbook']:
+          self._metrics.write(a_record)
+
+  def _finish(self):
+    if self._metrics is not None:
+      self._metrics.close()
+      self._metrics = None
+
+  def _timed_evolve(self, resume):
+    if self._timer is None:
+      return self._evolve(resume)
+    profiler = None
+    if self.profile_file is not None:
+      profiler = cProfile.Profile()
+    with self._timer:
+      if profiler is not None:
+        profiler.enable()
+      try:
+        return self._evolve(resume)
+      finally:
+        if profiler is not None:
+          profiler.disable()
+          profiler.dump_stats(self.profile_file)
+          if self.print_every:
+            print(profiling.format_profile_summary(profiler, self._timer))
+
+  def _lap_fields(self):
+    result = []
+    if self.profile_operators:
+      result += self._timer.fields
+    if self._fitness_cache is not None:
+      result += self._fitness_cache.fields
+    return result
+
+  def _lap(self):
+    """Measurements taken since the previous generation was logged."""
+    result = {}
+    if self.profile_operators:
+      result.update(self._timer.lap())
+    if self._fitness_cache is not None:
+      result.update(self._fitness_cache.lap())
+    return result
+
+  def _log_fields(self):
+    result = ['gen', 'nevals'] + self.stats.fields + self._lap_fields()
+    if self.termination is not None:
+      result.append('stop')
+    return result
+
+  def _stop_reason(self, gen, nevals):
+    """Check the termination criteria once generation ``gen`` is over.
+
+    Parameters
+    ----------
+    gen : int
+      Generation that just ended.
+    nevals : int
+      Number of individuals evaluated since the previous check.
+
+    Returns
+    -------
+    str or None
+      Why the run stops after ``gen`` (the criteria met, or
+      ``max_generation_count``), or None if it goes on. Runs without
+      termination criteria are never given a reason.
+    """
+    if self.termination is None:
+      return None
+    result = self.termination.update(gen, nevals, self.hof[0].fitness)
+    if result is None and gen >= self.max_generation_count:
+      result = 'max_generation_count'
+    return result
+
+  def _log(self, logbook, gen, nevals, record, stop=None):
+    """Record the statistics of a generation, streaming them to the metrics
+    file and printing them as configured.
+
+    The record of the last generation of a run stopped by its termination
+    criteria holds the reason it stopped (see py:meth:: _stop_reason) as its
+    ``stop`` field.
+    """
+    record = dict(record, **self._lap())
+    if stop is not None:
+      record['stop'] = stop
+    logbook.record(gen=gen, nevals=nevals, **record)
+    if self._metrics is not None:
+      self._metrics.write(logbook[-1])
+    if self.print_every and (
+      gen % self.print_every == 0 or
+      gen == self.max_generation_count or
+      stop is not None
+    ):
+      # Only the latest record is printed, even if earlier ones were not.
+      logbook.buffindex = len(logbook) - 1
+      print(logbook.stream)
+
+  def _restore_checkpoint(self, state):
+    for a_mod, a_mod_state in zip(self.toolbox_mods, state['components']):
+      if a_mod_state is not None:
+        a_mod.restore_checkpoint_state(a_mod_state)
+    self.hof = state['halloffame']
+    if self.termination is not None and state.get('termination') is not None:
+      self.termination.restore_checkpoint_state(state['termination'])
+    random.setstate(state['random_state'])
+    np.random.set_state(state['numpy_random_state'])
+
+  def _checkpoint_due(self, gen):
+    return self.checkpoint_file is not None and gen % self.checkpoint_every == 0
+
+  def _checkpoint(self, gen, logbook, **run_state):
+    """Write a checkpoint if one is due after generation ``gen``."""
+    if not self._checkpoint_due(gen):
+      return
+    state = {
+      'generation': gen,
+      'logbook': logbook,
+      'halloffame': self.hof,
+      'random_state': random.getstate(),
+      'numpy_random_state': np.random.get_state(),
+      'components': [a_mod.checkpoint_state() for a_mod in self.toolbox_mods],
+      'termination': (
+        None if self.termination is None
+        else self.termination.checkpoint_state()
+      )
+    }
+    state.update(run_state)
+    write_checkpoint(
+      self.checkpoint_file,
+      {'generation': gen, 'model': self.model_config},
+      state
+    )
+    if self._metrics is not None:
+      self._metrics.flush()
+
+  def _evaluate_invalid(self, population):
+    invalid_ind = [ind for ind in population if not ind.fitness.valid]
+    if self._fitness_cache is not None:
+      self._fitness_cache.evaluate(
+        invalid_ind,
+        self.toolbox.evaluate,
+        self.toolbox.map
+      )
+      return len(invalid_ind)
+    fitnesses = self.toolbox.map(self.toolbox.evaluate, invalid_ind)
+    for ind, fit in zip(invalid_ind, fitnesses):
+      ind.fitness.values = fit
+    return len(invalid_ind)
+
+  def _generation(self, population):
+    """Replace a population with its offspring.
+
+    Returns
+    -------
+    int
+      Number of offspring evaluated.
+    """
+    offspring = self.toolbox.select(population, len(population))
+    offspring = algorithms.varAnd(
+      offspring,
       self.toolbox,
-      cxpb=self.crossover_probability,
-      mutpb=self.mutation_probability,
-      ngen=self.max_generation_count,
-      stats=self.stats,
-      halloffame=self.hof,
-      verbose=True
+      self.crossover_probability,
+      self.mutation_probability
+    )
+    nevals = self._evaluate_invalid(offspring)
+    self.hof.update(offspring)
+    population[:] = offspring
+    return nevals
+
+  def _evolve(self, resume=None):
+    # Same generational loop as ``deap.algorithms.eaSimple`` (drawing the same
+    # random numbers), with checkpoints written between generations.
+    if resume is None:
+      population = self.toolbox.population(n=self.population_size)
+      logbook = tools.Logbook()
+      logbook.header = self._log_fields()
+      nevals = self._evaluate_invalid(population)
+      self.hof.update(population)
+      stop = self._stop_reason(0, nevals)
+      self._log(logbook, 0, nevals, self.stats.compile(population), stop)
+      if stop is not None:
+        return population, logbook
+      first_gen = 1
+    else:
+      population = resume['population']
+      logbook = resume['logbook']
+      first_gen = resume['generation'] + 1
+
+    for gen in range(first_gen, self.max_generation_count + 1):
+      nevals = self._generation(population)
+      stop = self._stop_reason(gen, nevals)
+      self._log(logbook, gen, nevals, self.stats.compile(population), stop)
+      self._checkpoint(gen, logbook, population=population)
+      if stop is not None:
+        break
+
+    return population, logbook
+
+class MatrixGa(SimpleGa):
+  """Variant of py:class:: SimpleGa that keeps the whole population in one
+  matrix.
+
+  Individuals are the rows of a 2-D NumPy matrix, and their fitness values
+  the rows of a parallel matrix (one column per objective). Selection,
+  crossover, mutation and evaluation each run as one batched NumPy operation
+  per generation, using the operators that the model's components register
+  through ``configure_matrix_toolbox`` (see ``gabasic.matrixops``); the
+  components are configured from the INI file exactly as for
+  py:class:: SimpleGa.
+
+  Generations follow ``deap.algorithms.eaSimple``: the offspring are selected,
+  consecutive pairs mate with probability ``crossover_probability``, each one
+  mutates with probability ``mutation_probability``, and only the offspring
+  that changed are evaluated again. The logbook has the same format, and the
+  hall of fame holds a regular individual built from the best row seen. The
+  population returned by py:meth:: run is the final matrix.
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
+  def __init__(self, toolbox_mods, **kwargs):
+    super(MatrixGa, self).__init__(toolbox_mods, **kwargs)
+    fitness_type = kwargs.get('fitness_type', 'FitnessMax')
+    self.fitness_weights = creator.__dict__[fitness_type].weights
+    self.matrix_toolbox = base.Toolbox()
+    op_owners = profiling.configure_toolbox(
+      self.matrix_toolbox,
+      toolbox_mods,
+      'configure_matrix_toolbox'
+    )
+    if self._timer is not None:
+      self._timer = profiling.OperatorTimer(self.matrix_toolbox, op_owners)
+
+  def run(self, resume=None):
+    self._start(resume)
+    try:
+      return self._timed_evolve(resume)
+    finally:
+      self._finish()
+
+  def _update_hof(self, population, fitness):
+    best_idx = np.argmax(matrixops.fitness_ranks(fitness, self.fitness_weights))
+    best = self.matrix_toolbox.individual_from_row(population[best_idx])
+    best.fitness.values = tuple(fitness[best_idx].tolist())
+    self.hof.update([best])
+
+  def _record(self, logbook, gen, nevals, fitness):
+    record = {
+      a_name: a_func(fitness)
+      for a_name, a_func in self.stats.functions.items()
+    }
+    stop = self._stop_reason(gen, nevals)
+    self._log(logbook, gen, nevals, record, stop)
+    return stop
+
+  def _evolve(self, resume=None):
+    toolbox = self.matrix_toolbox
+    if resume is None:
+      population = toolbox.population(self.population_size)
+      fitness = toolbox.evaluate(population)
+      logbook = tools.Logbook()
+      logbook.header = self._log_fields()
+      self._update_hof(population, fitness)
+      if self._record(logbook, 0, len(population), fitness) is not None:
+        return population, logbook
+      first_gen = 1
+    else:
+      population = resume['population']
+      fitness = resume['fitness']
+      logbook = resume['logbook']
+      first_gen = resume['generation'] + 1
+    row_count = len(population)
+
+    for gen in range(first_gen, self.max_generation_count + 1):
+      chosen = toolbox.select(fitness, self.fitness_weights, row_count)
+      population = population[chosen]
+      fitness = fitness[chosen]
+      invalid = np.zeros(row_count, dtype=bool)
+
+      mated = 2 * np.flatnonzero(
+        np.random.random_sample(row_count // 2) < self.crossover_probability
+      )
+      if len(mated):
+        (population[mated], population[mated + 1]) = toolbox.mate(
+          population[mated],
+          population[mated + 1]
+        )
+        invalid[mated] = True
+        invalid[mated + 1] = True
+
+      mutants = np.flatnonzero(
+        np.random.random_sample(row_count) < self.mutation_probability
+      )
+      if len(mutants):
+        population[mutants] = toolbox.mutate(population[mutants])
+        invalid[mutants] = True
+
+      nevals = int(np.count_nonzero(invalid))
+      if nevals:
+        fitness[invalid] = toolbox.evaluate(population[invalid])
+
+      self._update_hof(population, fitness)
+      stop = self._record(logbook, gen, nevals, fitness)
+      self._checkpoint(gen, logbook, population=population, fitness=fitness)
+      if stop is not None:
+        break
+
+    return population, logbook
+
+class _IslandProcess(object):
+  """Process running one island of an py:class:: IslandGa, and the pipe the
+  run talks to it through.
+  """
+
+  def __init__(self, ga, index, state):
+    super(_IslandProcess, self).__init__()
+    if 'fork' in multiprocessing.get_all_start_methods():
+      context = multiprocessing.get_context('fork')
+    else:
+      context = multiprocessing.get_context()
+    (self._connection, island_connection) = context.Pipe()
+    self._process = context.Process(
+      target=ga._run_island,
+      args=(index, island_connection, state),
+      daemon=True
+    )
+    self._process.start()
+    island_connection.close()
+
+  def request(self, *command):
+    self._connection.send_bytes(dumps_state(command))
+
+  def reply(self):
+    (outcome, payload) = pickle.loads(self._connection.recv_bytes())
+    if outcome == 'error':
+      raise RuntimeError('Island process failed:\n{}'.format(payload))
+    return payload
+
+  def close(self):
+    if self._process.is_alive():
+      try:
+        self.request('stop')
+      except OSError:
+        pass
+      self._process.join(5.0)
+      if self._process.is_alive():
+        self._process.terminate()
+        self._process.join()
+    self._connection.close()
+
+
+class IslandGa(SimpleGa):
+  """Variant of py:class:: SimpleGa that evolves several populations
+  (islands) at once, each in a process of its own, which periodically
+  exchange their best individuals.
+
+  Each of the ``islands`` islands holds ``population_size`` individuals and
+  evolves exactly as the population of py:class:: SimpleGa does, using a copy
+  of the toolbox in a process forked when the run starts. Every
+  ``migration_interval`` generations, each island sends copies of its
+  ``migrants`` best individuals to the next island, where they replace the
+  worst ones. Islands form a fixed ring (``migration_topology=ring``), or a
+  ring shuffled anew for every migration (``migration_topology=random``).
+  Islands only wait for one another to exchange individuals or to write a
+  checkpoint, and individuals travel pickled the way checkpoints are (see
+  ``gabasic.checkpoint``).
+
+  The RNGs of each island are seeded with a seed drawn from the RNGs of the
+  run, which also shuffle the rings, so results depend on ``seed`` alone. The
+  logbook holds the statistics of all islands together, and one chapter per
+  island (``island0``, ``island1``, ...) with the statistics of that island
+  (only its best fitness is printed);
+  measurements taken in the islands (see ``profile_operators`` and
+  ``fitness_cache_size``) are only found in the chapters. Termination
+  criteria (see ``gabasic.termination``) are only checked when the islands
+  synchronize. The population returned by py:meth:: run holds the individuals
+  of every island, island after island.
+
+  Attributes
+  ----------
+  islands : int
+    Number of islands.
+  migration_interval : int
+    Number of generations between migrations.
+  migrants : int
+    Number of individuals each island sends on every migration.
+  migration_topology : str
+    Either ``ring`` or ``random``.
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
+  TOPOLOGIES = ('ring', 'random')
+
+  def __init__(self, toolbox_mods, **kwargs):
+    super(IslandGa, self).__init__(toolbox_mods, **kwargs)
+    self.islands = int(kwargs.get('islands', '4'))
+    if self.islands < 1:
+      raise ValueError('At least one island is required.')
+    self.migration_interval = int(kwargs.get('migration_interval', '10'))
+    if self.migration_interval < 1:
+      raise ValueError('Migration interval must be positive.')
+    self.migrants = int(kwargs.get('migrants', '2'))
+    if not 0 <= self.migrants < self.population_size:
+      raise ValueError(
+        'The number of migrants must be smaller than the population size.'
+      )
+    self.migration_topology = kwargs.get('migration_topology', 'ring')
+    if self.migration_topology not in IslandGa.TOPOLOGIES:
+      raise ValueError('Unknown migration topology "{}"; use one of: {}'.format(
+        self.migration_topology,
+        ', '.join(IslandGa.TOPOLOGIES)
+      ))
+    # Each island already runs in a process of its own.
+    self.workers = None
+
+  @property
+  def multiprocess(self):
+    return True
+
+  def _lap_fields(self):
+    # Operators run, and fitness values are cached, in the island processes,
+    # whose chapters hold the measurements (see _island_record).
+    return []
+
+  def _lap(self):
+    return {}
+
+  def _island_record(self, nevals, population):
+    record = dict(
+      self.stats.compile(population),
+      **super(IslandGa, self)._lap()
+    )
+    fitness = np.array([ind.fitness.values for ind in population])
+    return (nevals, record, fitness)
+
+  def _run_island(self, index, connection, state):
+    """Evolve one island, as told by the run through ``connection``.
+
+    Runs in the island's own process, forked from the process running the
+    GA.
+    """
+    try:
+      # Each island keeps its own hall of fame, sent along with its records.
+      self.hof.clear()
+      if 'population' in state:
+        population = state['population']
+        gen = state['generation']
+        random.setstate(state['random_state'])
+        np.random.set_state(state['numpy_random_state'])
+        records = []
+      else:
+        random.seed(state['seed'])
+        np.random.seed(state['seed'] % (2 ** 32))
+        population = self.toolbox.population(n=self.population_size)
+        nevals = self._evaluate_invalid(population)
+        self.hof.update(population)
+        gen = 0
+        records = [self._island_record(nevals, population)]
+
+      while True:
+        command = pickle.loads(connection.recv_bytes())
+        if command[0] == 'stop':
+          break
+        if command[0] == 'evolve':
+          (_, last_gen, emigrant_count) = command
+          for gen in range(gen + 1, last_gen + 1):
+            nevals = self._generation(population)
+            records.append(self._island_record(nevals, population))
+          reply = (
+            records,
+            tools.selBest(population, emigrant_count),
+            list(self.hof)
+          )
+          records = []
+        elif command[0] == 'immigrate':
+          IslandGa._replace_worst(population, command[1])
+          reply = None
+        else:
+          reply = {
+            'generation': gen,
+            'population': population,
+            'random_state': random.getstate(),
+            'numpy_random_state': np.random.get_state()
+          }
+        connection.send_bytes(dumps_state(('ok', reply)))
+    except Exception:
+      connection.send_bytes(pickle.dumps(('error', traceback.format_exc())))
+    finally:
+      connection.close()
+
+  @staticmethod
+  def _replace_worst(population, immigrants):
+    by_fitness = sorted(
+      range(len(population)),
+      key=lambda ind_idx: population[ind_idx].fitness
     )
-    
-    return population, log
+    for ind_idx, an_immigrant in zip(by_fitness, immigrants):
+      population[ind_idx] = an_immigrant
+
+  def _next_stop(self, last_gen):
+    """Generation after which the islands next wait for one another."""
+    gen = max(last_gen + 1, 1)
+    result = -(-gen // self.migration_interval) * self.migration_interval
+    if self.checkpoint_file is not None:
+      result = min(
+        result,
+        -(-gen // self.checkpoint_every) * self.checkpoint_every
+      )
+    return min(result, self.max_generation_count)
+
+  def _migrate(self, islands, emigrants):
+    order = list(range(len(islands)))
+    if self.migration_topology == 'random':
+      random.shuffle(order)
+    for position, source_idx in enumerate(order):
+      destination_idx = order[(position + 1) % len(order)]
+      islands[destination_idx].request('immigrate', emigrants[source_idx])
+    for an_island in islands:
+      an_island.reply()
+
+  def _island_states(self, islands):
+    for an_island in islands:
+      an_island.request('state')
+    return [an_island.reply() for an_island in islands]
+
+  def _log_islands(self, logbook, first_gen, island_records):
+    """Log the generations the islands evolved since they last synchronized.
+
+    Termination criteria are only checked after the last of those
+    generations.
+
+    Returns
+    -------
+    str or None
+      Why the run stops, if it does (see py:meth:: _stop_reason).
+    """
+    gen_count = len(island_records[0])
+    total_nevals = 0
+    stop = None
+    for gen_idx in range(gen_count):
+      gen = first_gen + gen_idx
+      fitness = []
+      nevals = 0
+      for island_idx, records in enumerate(island_records):
+        (island_nevals, record, island_fitness) = records[gen_idx]
+        logbook.chapters['island{}'.format(island_idx)].record(
+          gen=gen,
+          nevals=island_nevals,
+          **record
+        )
+        fitness.append(island_fitness)
+        nevals += island_nevals
+      fitness = np.concatenate(fitness)
+      total_nevals += nevals
+      if gen_idx == gen_count - 1:
+        stop = self._stop_reason(gen, total_nevals)
+      self._log(logbook, gen, nevals, {
+        a_name: a_func(fitness)
+        for a_name, a_func in self.stats.functions.items()
+      }, stop)
+    return stop
+
+  def _evolve(self, resume=None):
+    if resume is None:
+      island_states = [
+        {'seed': random.getrandbits(64)} for _ in range(self.islands)
+      ]
+      logbook = tools.Logbook()
+      chapter_names = [
+        'island{}'.format(island_idx) for island_idx in range(self.islands)
+      ]
+      # Only the best fitness of each island is printed.
+      logbook.header = self._log_fields() + chapter_names
+      for a_chapter_name in chapter_names:
+        logbook.chapters[a_chapter_name].header = ['max']
+      last_gen = -1
+    else:
+      island_states = resume['islands']
+      logbook = resume['logbook']
+      last_gen = resume['generation']
+
+    islands = []
+    try:
+      for island_idx, a_state in enumerate(island_states):
+        islands.append(_IslandProcess(self, island_idx, a_state))
+      while last_gen < self.max_generation_count:
+        stop_gen = self._next_stop(last_gen)
+        migrating = (
+          self.islands > 1 and
+          self.migrants > 0 and
+          stop_gen > 0 and
+          stop_gen % self.migration_interval == 0
+        )
+        for an_island in islands:
+          an_island.request(
+            'evolve',
+            stop_gen,
+            self.migrants if migrating else 0
+          )
+        replies = [an_island.reply() for an_island in islands]
+        for (_, _, island_hof) in replies:
+          self.hof.update(island_hof)
+        stop = self._log_islands(
+          logbook,
+          last_gen + 1,
+          [records for (records, _, _) in replies]
+        )
+        if migrating and stop is None:
+          self._migrate(islands, [emigrants for (_, emigrants, _) in replies])
+        if self._checkpoint_due(stop_gen):
+          self._checkpoint(
+            stop_gen,
+            logbook,
+            islands=self._island_states(islands)
+          )
+        last_gen = stop_gen
+        if stop is not None:
+          break
+      island_states = self._island_states(islands)
+    finally:
+      for an_island in islands:
+        an_island.close()
+
+    population = [
+      ind for a_state in island_states for ind in a_state['population']
+    ]
+    return population, logbook
 
 # vim: set ts=2 sw=2 expandtab:
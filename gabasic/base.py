@@ -1,5 +1,10 @@
 
 class ToolboxContributor(object):
+  # Whether the fitness the component evaluates may be reused for individuals
+  # with the same genotype (see ``fitness_cache_size``); components whose
+  # scores must be drawn anew every generation set it to ``False``.
+  cacheable_fitness = True
+
   def __init__(self):
     super(ToolboxContributor, self).__init__()
   
@@ -8,4 +13,25 @@ class ToolboxContributor(object):
       'ToolboxContributor missing configure_toolbox() implementation.'
     )
 
+  def configure_matrix_toolbox(self, toolbox):
+    """Register batched operators for py:class:: MatrixGa, which keeps the
+    whole population in a single matrix (see ``gabasic.matrixops``).
+    Components that have no batched counterpart keep this default.
+    """
+    raise NotImplementedError(
+      '{} cannot be used with MatrixGa.'.format(type(self).__name__)
+    )
+
+  def checkpoint_state(self):
+    """Global state of the component that a run checkpoint must preserve
+    (e.g., lookup tables grown during the run), or ``None`` if there is none.
+    """
+    return None
+
+  def restore_checkpoint_state(self, state):
+    """Restore the state returned by py:meth:: checkpoint_state when a run is
+    resumed from a checkpoint.
+    """
+    pass
+
 # vim: set ts=2 sw=2 expandtab:
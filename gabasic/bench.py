@@ -0,0 +1,538 @@
+"""Benchmarks for the ``gabasic`` and ``tictactoe`` hot paths.
+
+Run with ``python -m gabasic.bench``:
+
+``run [-o <results file>]``
+  Run the benchmark suite: every operator and evaluator at several population
+  and genome sizes, the benchmarks of ``tictactoe.bench``, and whole
+  generations of the shipped model INI files. Results are printed and, if
+  requested, written to a JSON file.
+``compare <baseline file> [<results file>]``
+  Compare results (the suite is run if no results file is given) against a
+  baseline, flagging every benchmark that got slower than the tolerance.
+``startup <model INI>``
+  Start ``python -X importtime -m gabasic`` on a model, stop it as soon as the
+  first generation is printed, and report the time that took along with the
+  modules that took longest to import.
+"""
+import os
+import sys
+import json
+import time
+import random
+import timeit
+import platform
+import tempfile
+import warnings
+import argparse
+import datetime
+import statistics
+import subprocess
+import configparser
+
+
+# Location of the shipped model INI files.
+_REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PER_SECOND = 'per second'
+SECONDS = 'seconds'
+
+
+def ops_per_second(operation, op_count, repeat=5):
+  """Time an operation and express the best result in operations per second.
+
+  Parameters
+  ----------
+  operation : callable
+    Callable that performs ``op_count`` operations per invocation.
+  op_count : int
+    Number of operations performed by each invocation of ``operation``.
+  repeat : int
+    Number of timing repetitions; the fastest one is used.
+
+  Returns
+  -------
+  float
+    Operations completed per second.
+  """
+  best_time = min(timeit.repeat(operation, number=1, repeat=repeat))
+  return op_count / best_time
+
+def parse_importtime(text):
+  """Parse the report written by ``python -X importtime``.
+
+  Parameters
+  ----------
+  text : str
+    Report, as written to the standard error stream.
+
+  Returns
+  -------
+  list
+    Tuple ``(module name, self microseconds, cumulative microseconds)`` for
+    each module imported, in the order the report lists them. Modules imported
+    directly by the program (rather than by another module) are the ones
+    whose name does not start with a space.
+  """
+  result = []
+  for a_line in text.splitlines():
+    if not a_line.startswith('import time:'):
+      continue
+    fields = a_line[len('import time:'):].split('|')
+    if len(fields) != 3 or not fields[0].strip().isdigit():
+      continue
+    result.append((fields[2].rstrip()[1:], int(fields[0]), int(fields[1])))
+  return result
+
+def startup_profile(model_ini, python=sys.executable):
+  """Measure the time ``python -m gabasic`` takes to print the first
+  generation of a model.
+
+  Parameters
+  ----------
+  model_ini : str
+    Location of the model INI file.
+  python : str
+    Python interpreter to use.
+
+  Returns
+  -------
+  dict
+    ``first_generation`` (seconds from starting the interpreter until the
+    first generation is printed), ``import_time`` (seconds spent importing
+    modules) and ``imports`` (as returned by py:func:: parse_importtime).
+  """
+  env = dict(os.environ, PYTHONUNBUFFERED='1')
+  with tempfile.TemporaryFile(mode='w+') as importtime_file:
+    start_time = time.perf_counter()
+    process = subprocess.Popen(
+      [
+        python, '-X', 'importtime', '-m', 'gabasic', model_ini,
+        '--no-plot', '--print-every', '1'
+      ],
+      stdout=subprocess.PIPE,
+      stderr=importtime_file,
+      env=env,
+      universal_newlines=True
+    )
+    first_generation = None
+    try:
+      for a_line in process.stdout:
+        if a_line.split('\t', 1)[0].strip() == '0':
+          first_generation = time.perf_counter() - start_time
+          break
+    finally:
+      process.kill()
+      process.communicate()
+    if first_generation is None:
+      raise RuntimeError(
+        'Model {} did not print its first generation.'.format(model_ini)
+      )
+    importtime_file.seek(0)
+    imports = parse_importtime(importtime_file.read())
+
+  return {
+    'first_generation': first_generation,
+    'import_time': sum(
+      cumulative for name, _, cumulative in imports
+      if not name.startswith(' ')
+    ) / 1e6,
+    'imports': imports
+  }
+
+def _toolbox(*components):
+  from deap import base
+  toolbox = base.Toolbox()
+  for a_component in components:
+    a_component.configure_toolbox(toolbox)
+  return toolbox
+
+def _bit_strings(count, size, seed=2048):
+  from gabasic import FitnessMax, BitString, SumItems
+  with warnings.catch_warnings():
+    # Every benchmark creates the DEAP classes anew.
+    warnings.simplefilter('ignore', RuntimeWarning)
+    FitnessMax()
+    individual = BitString('FitnessMax', bitstring_size=str(size))
+  toolbox = _toolbox(individual, SumItems())
+  random.seed(seed)
+  result = toolbox.population(n=count)
+  for an_individual in result:
+    an_individual.fitness.values = toolbox.evaluate(an_individual)
+  return result
+
+class _Mapping(dict):
+  # Takes attributes, like the DEAP individuals derived from ``dict``.
+  pass
+
+def _mappings(count, size, seed=2048):
+  # Mappings holding ``size`` of the keys of a domain about twice as large,
+  # like the policies of ``tictactoe``.
+  rng = random.Random(seed)
+  domain = [(rank, idx) for rank in range(9) for idx in range(size // 4 + 1)]
+  return [
+    _Mapping(
+      (a_key, rng.randrange(9)) for a_key in rng.sample(domain, size)
+    )
+    for _ in range(count)
+  ]
+
+def bench_mate(component, individuals):
+  mate = _toolbox(component).mate
+  pairs = list(zip(individuals[::2], individuals[1::2]))
+  def mate_all():
+    for ind1, ind2 in pairs:
+      mate(ind1, ind2)
+  return ops_per_second(mate_all, len(pairs))
+
+def bench_mutate(component, individuals):
+  mutate = _toolbox(component).mutate
+  def mutate_all():
+    for an_individual in individuals:
+      mutate(an_individual)
+  return ops_per_second(mutate_all, len(individuals))
+
+def bench_evaluate(component, individuals):
+  evaluate = _toolbox(component).evaluate
+  def evaluate_all():
+    for an_individual in individuals:
+      evaluate(an_individual)
+  return ops_per_second(evaluate_all, len(individuals))
+
+def bench_clone(clone, individuals):
+  def clone_all():
+    for an_individual in individuals:
+      clone(an_individual)
+  return ops_per_second(clone_all, len(individuals))
+
+def bench_select(component, population):
+  select = _toolbox(component).select
+  return ops_per_second(
+    lambda: select(population, len(population)),
+    len(population)
+  )
+
+def generations_per_second(model_ini, generation_count):
+  """Run a model for a number of generations and report how many it ran per
+  second.
+
+  The model runs with a fixed seed and without printing, in a temporary
+  working directory (models may write files there), and the time includes
+  creating and evaluating the initial population.
+  """
+  from gabasic.model import build_ga
+  ini_config = configparser.ConfigParser()
+  ini_config.read(model_ini)
+  from gabasic.termination import CRITERIA
+  # Runs must last exactly ``generation_count`` generations.
+  ignored_keys = ['checkpoint_file', 'metrics_file', 'stop_when']
+  for a_key in ignored_keys + list(CRITERIA):
+    ini_config.remove_option('GA', a_key)
+  ini_config['GA']['max_generation_count'] = str(generation_count)
+  ini_config['GA']['print_every'] = '0'
+  ini_config['GA']['seed'] = '2048'
+  with warnings.catch_warnings():
+    warnings.simplefilter('ignore', RuntimeWarning)
+    ga = build_ga(ini_config)
+
+  cwd = os.getcwd()
+  with tempfile.TemporaryDirectory() as run_dir:
+    os.chdir(run_dir)
+    try:
+      start_time = time.perf_counter()
+      ga.run()
+      return generation_count / (time.perf_counter() - start_time)
+    finally:
+      os.chdir(cwd)
+
+def suite(model_inis=None):
+  """List the benchmarks of the suite.
+
+  Parameters
+  ----------
+  model_inis : list or None
+    Model INI files whose generations are benchmarked; the shipped
+    ``one_max.ini`` and ``tic_tac_toe.ini`` files by default.
+
+  Returns
+  -------
+  list
+    Tuple ``(name, unit, benchmark)`` for each benchmark, ``benchmark`` being
+    a callable that returns the measurement.
+  """
+  import gabasic
+  import tictactoe.bench
+
+  result = []
+  for size in (100, 1000):
+    individuals = lambda size=size: _bit_strings(1000, size)
+    for component in (
+      gabasic.OnePointCrossover(),
+      gabasic.TwoPointCrossover(),
+      gabasic.UniformCrossover()
+    ):
+      result.append((
+        '{} pairs, {} bits'.format(type(component).__name__, size),
+        PER_SECOND,
+        lambda c=component, i=individuals: bench_mate(c, i())
+      ))
+    result.append((
+      'FlipBitMutation calls, {} bits'.format(size),
+      PER_SECOND,
+      lambda i=individuals: bench_mutate(gabasic.FlipBitMutation(), i())
+    ))
+    result.append((
+      'SumItems calls, {} bits'.format(size),
+      PER_SECOND,
+      lambda i=individuals: bench_evaluate(gabasic.SumItems(), i())
+    ))
+    result.append((
+      'BitString clones, {} bits'.format(size),
+      PER_SECOND,
+      lambda i=individuals: bench_clone(gabasic.BitString.clone, i())
+    ))
+  for population_size in (100, 1000):
+    for component in (
+      gabasic.TournamentSelection(tournament_size='3'),
+      gabasic.ProportionalSelection()
+    ):
+      result.append((
+        '{} picks, {} individuals'.format(
+          type(component).__name__,
+          population_size
+        ),
+        PER_SECOND,
+        lambda c=component, n=population_size: bench_select(
+          c,
+          _bit_strings(n, 100)
+        )
+      ))
+  for size in (30, 300):
+    for component in (
+      gabasic.OnePointMappingCrossover(),
+      gabasic.TwoPointMappingCrossover(),
+      gabasic.UniformMappingCrossover()
+    ):
+      result.append((
+        '{} pairs, {} keys'.format(type(component).__name__, size),
+        PER_SECOND,
+        lambda c=component, n=size: bench_mate(c, _mappings(200, n))
+      ))
+  for name, benchmark in tictactoe.bench.BENCHMARKS:
+    result.append((name, PER_SECOND, benchmark))
+
+  if model_inis is None:
+    model_inis = [
+      os.path.join(_REPO_DIR, 'one_max.ini'),
+      os.path.join(_REPO_DIR, 'tic_tac_toe.ini')
+    ]
+  for a_model_ini in model_inis:
+    model_name = os.path.basename(a_model_ini)
+    result.append((
+      '{} generations'.format(model_name),
+      PER_SECOND,
+      lambda m=a_model_ini: generations_per_second(m, 10)
+    ))
+    result.append((
+      '{} time to first generation'.format(model_name),
+      SECONDS,
+      lambda m=a_model_ini: statistics.median(
+        startup_profile(m)['first_generation'] for _ in range(3)
+      )
+    ))
+  return result
+
+def run_suite(model_inis=None, name_filter=None):
+  """Run the benchmark suite (see py:func:: suite), printing each result as
+  it is measured.
+
+  Parameters
+  ----------
+  model_inis : list or None
+    Model INI files whose generations are benchmarked.
+  name_filter : str or None
+    If provided, only the benchmarks whose name contains it are run.
+
+  Returns
+  -------
+  dict
+    Results, as written to results files.
+  """
+  results = {}
+  for name, unit, benchmark in suite(model_inis):
+    if name_filter is not None and name_filter not in name:
+      continue
+    value = benchmark()
+    results[name] = {'value': value, 'unit': unit}
+    print(_format_result(name, value, unit), flush=True)
+  return {
+    'created': datetime.datetime.now().isoformat(timespec='seconds'),
+    'python': platform.python_version(),
+    'platform': platform.platform(),
+    'results': results
+  }
+
+def _format_result(name, value, unit):
+  if unit == SECONDS:
+    return '{:<52s}{:>14.3f} s'.format(name, value)
+  return '{:<52s}{:>14,.0f} {}'.format(name, value, unit)
+
+def compare_results(baseline, current, tolerance=0.1):
+  """Compare benchmark results against a baseline.
+
+  Parameters
+  ----------
+  baseline : dict
+    Baseline results, as written to results files.
+  current : dict
+    Results to compare.
+  tolerance : float
+    Fraction by which a benchmark may get slower before it is flagged.
+
+  Returns
+  -------
+  list
+    Tuple ``(name, baseline value, current value, change, slower)`` for each
+    benchmark in both results; ``change`` is the relative change in speed
+    (positive when faster), and ``slower`` tells whether it exceeds the
+    tolerance.
+  """
+  result = []
+  for name, a_current in current['results'].items():
+    a_baseline = baseline['results'].get(name)
+    if a_baseline is None:
+      continue
+    if a_current['unit'] == SECONDS:
+      change = a_baseline['value'] / a_current['value'] - 1.0
+    else:
+      change = a_current['value'] / a_baseline['value'] - 1.0
+    result.append((
+      name,
+      a_baseline['value'],
+      a_current['value'],
+      change,
+      change < -tolerance
+    ))
+  return result
+
+def main(argv):
+  arg_parser = argparse.ArgumentParser(prog='gabasic.bench')
+  commands = arg_parser.add_subparsers(dest='command')
+  commands.required = True
+
+  run_parser = commands.add_parser('run', help='run the benchmark suite')
+  compare_parser = commands.add_parser(
+    'compare',
+    help='compare results against a baseline'
+  )
+  for a_parser in (run_parser, compare_parser):
+    a_parser.add_argument(
+      '-o',
+      '--output',
+      metavar='FILE',
+      help='write the results of the suite to a JSON file'
+    )
+    a_parser.add_argument(
+      '--model',
+      action='append',
+      metavar='INI',
+      help='benchmark generations of this model INI instead of the shipped '
+        'ones (may be repeated)'
+    )
+    a_parser.add_argument(
+      '--filter',
+      metavar='TEXT',
+      help='only run the benchmarks whose name contains this text'
+    )
+  compare_parser.add_argument('baseline', help='baseline results file')
+  compare_parser.add_argument(
+    'results',
+    nargs='?',
+    help='results file to compare (the suite is run if not given)'
+  )
+  compare_parser.add_argument(
+    '--tolerance',
+    type=float,
+    default=0.1,
+    help='fraction by which a benchmark may get slower (default: 0.1)'
+  )
+
+  startup_parser = commands.add_parser(
+    'startup',
+    help='profile the time taken to start a model'
+  )
+  startup_parser.add_argument('model_ini', help='GA model configuration INI')
+  startup_parser.add_argument(
+    '--repeat',
+    type=int,
+    default=5,
+    help='number of times the model is started (default: 5)'
+  )
+  startup_parser.add_argument(
+    '--top',
+    type=int,
+    default=10,
+    help='number of slowest imports to list (default: 10)'
+  )
+  args = arg_parser.parse_args(argv)
+
+  if args.command == 'startup':
+    return main_startup(args)
+
+  if args.command == 'compare' and args.results is not None:
+    with open(args.results) as results_file:
+      results = json.load(results_file)
+  else:
+    results = run_suite(args.model, args.filter)
+  if args.output is not None:
+    with open(args.output, 'w') as results_file:
+      json.dump(results, results_file, indent=2)
+
+  if args.command == 'compare':
+    with open(args.baseline) as baseline_file:
+      baseline = json.load(baseline_file)
+    comparison = compare_results(baseline, results, args.tolerance)
+    print()
+    for name, _, _, change, slower in comparison:
+      print('{:<52s}{:>+9.1%}{}'.format(
+        name,
+        change,
+        '  SLOWER' if slower else ''
+      ))
+    slower_count = sum(1 for a_row in comparison if a_row[-1])
+    print('{} of {} benchmarks slower than {:.0%} tolerance'.format(
+      slower_count,
+      len(comparison),
+      args.tolerance
+    ))
+    return 1 if slower_count else 0
+  return 0
+
+def main_startup(args):
+  profiles = [startup_profile(args.model_ini) for _ in range(args.repeat)]
+  print('{:<32s}{:>10.3f} s (median of {})'.format(
+    'Time to first generation',
+    statistics.median(a_profile['first_generation'] for a_profile in profiles),
+    args.repeat
+  ))
+  print('{:<32s}{:>10.3f} s'.format(
+    'Time importing modules',
+    statistics.median(a_profile['import_time'] for a_profile in profiles)
+  ))
+  print('Slowest imports (cumulative):')
+  top_level = sorted(
+    (
+      (cumulative, name.strip()) for name, _, cumulative
+      in profiles[-1]['imports'] if not name.startswith('  ')
+    ),
+    reverse=True
+  )
+  for cumulative, name in top_level[:args.top]:
+    print('  {:<30s}{:>10.3f} s'.format(name, cumulative / 1e6))
+
+  return 0
+
+if __name__ == '__main__':
+  sys.exit(main(sys.argv[1:]))
+
+# vim: set ts=2 sw=2 expandtab:
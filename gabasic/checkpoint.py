@@ -0,0 +1,120 @@
+"""Reading and writing GA run checkpoints.
+
+A checkpoint file holds two pickled ``dict`` objects: a header with plain
+information about the run (such as the model configuration), readable before
+the model exists, followed by the state of the run at the end of a
+generation. Classes created through ``deap.creator`` are stored by name and
+resolved against the classes of the resuming process, which must have created
+them already (by constructing the model's components), so resumed individuals
+have exactly the same types as newly created ones.
+"""
+import io
+import os
+import copyreg
+import pickle
+from deap import creator
+
+
+def _creator_class(class_name):
+  if not hasattr(creator, class_name):
+    raise pickle.UnpicklingError(
+      'Checkpoint requires creator class "{}", which does not exist; '
+      'was the model configured before resuming?'.format(class_name)
+    )
+  return getattr(creator, class_name)
+
+def _reduce_creator_class(cls):
+  return (_creator_class, (cls.__name__,))
+
+# ``deap.creator`` pickles its classes by their definition, and defines them
+# anew when unpickled; checkpoints refer to them by name instead.
+_dispatch_table = copyreg.dispatch_table.copy()
+_dispatch_table[creator.MetaCreator] = _reduce_creator_class
+
+def _dump_state(state, state_file):
+  state_pickler = pickle.Pickler(state_file, protocol=pickle.HIGHEST_PROTOCOL)
+  state_pickler.dispatch_table = _dispatch_table
+  state_pickler.dump(state)
+
+def dumps_state(state):
+  """Pickle run state (or any part of it, such as individuals) the same way
+  checkpoints do.
+
+  Parameters
+  ----------
+  state : object
+    State to pickle.
+
+  Returns
+  -------
+  bytes
+    Pickled state, readable with ``pickle.loads`` by any process that created
+    the same ``deap.creator`` classes.
+  """
+  state_file = io.BytesIO()
+  _dump_state(state, state_file)
+  return state_file.getvalue()
+
+def write_checkpoint(path, header, state):
+  """Write a checkpoint atomically.
+
+  The checkpoint is written and flushed to disk under a temporary name first,
+  and then moved into place, so ``path`` always holds a complete checkpoint.
+
+  Parameters
+  ----------
+  path : str
+    Location of the checkpoint file.
+  header : dict
+    Plain information about the run.
+  state : dict
+    State of the run.
+  """
+  tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+  try:
+    with open(tmp_path, 'wb') as checkpoint_file:
+      pickle.dump(header, checkpoint_file, protocol=pickle.HIGHEST_PROTOCOL)
+      _dump_state(state, checkpoint_file)
+      checkpoint_file.flush()
+      os.fsync(checkpoint_file.fileno())
+    os.replace(tmp_path, path)
+  except BaseException:
+    if os.path.exists(tmp_path):
+      os.remove(tmp_path)
+    raise
+
+def read_checkpoint_header(path):
+  """Read the header of a checkpoint written by py:func:: write_checkpoint.
+
+  Parameters
+  ----------
+  path : str
+    Location of the checkpoint file.
+
+  Returns
+  -------
+  dict
+    Plain information about the run.
+  """
+  with open(path, 'rb') as checkpoint_file:
+    return pickle.load(checkpoint_file)
+
+def read_checkpoint(path):
+  """Read the state of a run from a checkpoint written by
+  py:func:: write_checkpoint.
+
+  Parameters
+  ----------
+  path : str
+    Location of the checkpoint file.
+
+  Returns
+  -------
+  dict
+    State of the run.
+  """
+  with open(path, 'rb') as checkpoint_file:
+    pickle.load(checkpoint_file)
+    return pickle.load(checkpoint_file)
+
+# vim: set ts=2 sw=2 expandtab:
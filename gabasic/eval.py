@@ -1,4 +1,7 @@
 from . import ToolboxContributor
+from . import matrixops
+from . import packedops
+from .indivs import PackedBits
 
 
 class SumItems(ToolboxContributor):
@@ -8,7 +11,12 @@ class SumItems(ToolboxContributor):
   def configure_toolbox(self, toolbox):
     toolbox.register('evaluate', self)
 
+  def configure_matrix_toolbox(self, toolbox):
+    toolbox.register('evaluate', matrixops.sum_rows)
+
   def __call__(self, individual):
+    if isinstance(individual, PackedBits):
+      return (packedops.popcount(individual),)
     return (sum(individual),)
 
 # vim: set ts=2 sw=2 expandtab:
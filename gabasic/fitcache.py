@@ -0,0 +1,161 @@
+"""Caching the fitness of genotypes across evaluations."""
+import collections
+
+
+def genotype_key(individual):
+  """Hashable key identifying the genotype of an individual.
+
+  Array-backed individuals (such as ``BitString`` and NumPy arrays) are
+  identified by their raw bytes, integer-backed ones (such as
+  ``PackedBitString``) by their value, mappings by their sorted items, and
+  any other sequence by the tuple of its items. Individual components whose
+  individuals need something else register their own ``genotype_key``
+  function in the toolbox.
+
+  Parameters
+  ----------
+  individual : object
+    Individual to identify.
+
+  Returns
+  -------
+  object
+    Key; individuals with equal keys have the same genotype.
+  """
+  if isinstance(individual, int):
+    return int(individual)
+  tobytes = getattr(individual, 'tobytes', None)
+  if tobytes is not None:
+    return tobytes()
+  if isinstance(individual, collections.abc.Mapping):
+    return tuple(sorted(individual.items()))
+  return tuple(individual)
+
+
+class FitnessCache(object):
+  """Fitness values of the most recently evaluated genotypes.
+
+  Individuals whose genotype is in the cache get the cached fitness without
+  being evaluated, and individuals sharing a genotype are evaluated only once
+  per call to py:meth:: evaluate. The least recently used genotypes are
+  forgotten once ``max_size`` are held.
+
+  Fitness evaluations may change the individual they evaluate (e.g., adding
+  genes with random actions), in which case the fitness belongs to the changed
+  genotype. The fitness is always cached under the genotype of the individual
+  after its evaluation, and the other individuals that shared its genotype
+  before the evaluation are evaluated on their own.
+
+  Attributes
+  ----------
+  max_size : int
+    Maximum number of genotypes held.
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
+  # Logbook columns produced by py:meth:: lap.
+  fields = ['cache_hits', 'cache_dups', 'cache_hit_rate']
+
+  def __init__(self, max_size, key=genotype_key):
+    super(FitnessCache, self).__init__()
+    if max_size < 1:
+      raise ValueError('Fitness cache size must be positive.')
+    self.max_size = max_size
+    self._key = key
+    self._entries = collections.OrderedDict()
+    self._requests = 0
+    self._hits = 0
+    self._duplicates = 0
+
+  def __len__(self):
+    return len(self._entries)
+
+  def lap(self):
+    """Report how many fitness values were served without evaluating since
+    the last lap (or since the cache was created), and start a new lap.
+
+    Returns
+    -------
+    dict
+      Individuals given a cached fitness (``cache_hits``), individuals given
+      the fitness of another with the same genotype (``cache_dups``), and the
+      fraction of individuals that were not evaluated (``cache_hit_rate``).
+    """
+    result = {
+      'cache_hits': self._hits,
+      'cache_dups': self._duplicates,
+      'cache_hit_rate': (
+        (self._hits + self._duplicates) / self._requests
+        if self._requests else 0.0
+      )
+    }
+    self._requests = 0
+    self._hits = 0
+    self._duplicates = 0
+    return result
+
+  def _store(self, key, values):
+    self._entries[key] = values
+    self._entries.move_to_end(key)
+    if len(self._entries) > self.max_size:
+      self._entries.popitem(last=False)
+
+  def evaluate(self, individuals, evaluate, map_func=map):
+    """Set the fitness of individuals, evaluating as few as possible.
+
+    Parameters
+    ----------
+    individuals : list
+      Individuals to set the fitness of.
+    evaluate : callable
+      Fitness evaluation.
+    map_func : callable
+      Map used to evaluate several individuals (e.g., the toolbox ``map``).
+
+    Returns
+    -------
+    int
+      Number of individuals evaluated.
+    """
+    self._requests += len(individuals)
+    pending = collections.OrderedDict()
+    for an_individual in individuals:
+      key = self._key(an_individual)
+      values = self._entries.get(key)
+      if values is None:
+        pending.setdefault(key, []).append(an_individual)
+      else:
+        self._entries.move_to_end(key)
+        an_individual.fitness.values = values
+        self._hits += 1
+
+    evaluated = [a_group[0] for a_group in pending.values()]
+    changed = []
+    for (key, a_group), fitness in zip(
+      pending.items(),
+      map_func(evaluate, evaluated)
+    ):
+      values = tuple(fitness)
+      a_group[0].fitness.values = values
+      evaluated_key = self._key(a_group[0])
+      self._store(evaluated_key, values)
+      if evaluated_key == key:
+        for a_duplicate in a_group[1:]:
+          a_duplicate.fitness.values = values
+        self._duplicates += len(a_group) - 1
+      else:
+        changed.extend(a_group[1:])
+
+    if changed:
+      for an_individual, fitness in zip(
+        changed,
+        map_func(evaluate, changed)
+      ):
+        values = tuple(fitness)
+        an_individual.fitness.values = values
+        self._store(self._key(an_individual), values)
+
+    return len(evaluated) + len(changed)
+
+# vim: set ts=2 sw=2 expandtab:
@@ -1,7 +1,22 @@
+import bisect
+import random
 import collections
-from functools import partial
+import numpy as np
 from deap import tools
 from . import ToolboxContributor
+from . import matrixops
+from . import packedops
+from .indivs import PackedBits
+
+def packed_aware(sequence_op, packed_op):
+  """Operator that applies ``packed_op`` to py:class:: PackedBits individuals
+  and ``sequence_op`` to any other individual.
+  """
+  def apply_op(individual, *args, **kwargs):
+    if isinstance(individual, PackedBits):
+      return packed_op(individual, *args, **kwargs)
+    return sequence_op(individual, *args, **kwargs)
+  return apply_op
 
 class OnePointCrossover(ToolboxContributor):
   def __init__(self, **kwargs):
@@ -10,9 +25,12 @@ class OnePointCrossover(ToolboxContributor):
   def configure_toolbox(self, toolbox):
     toolbox.register(
       'mate',
-      tools.cxOnePoint
+      packed_aware(tools.cxOnePoint, packedops.cx_one_point)
     )
 
+  def configure_matrix_toolbox(self, toolbox):
+    toolbox.register('mate', matrixops.cx_one_point_rows)
+
 class TwoPointCrossover(ToolboxContributor):
   def __init__(self, **kwargs):
     super(TwoPointCrossover, self).__init__()
@@ -20,9 +38,12 @@ class TwoPointCrossover(ToolboxContributor):
   def configure_toolbox(self, toolbox):
     toolbox.register(
       'mate',
-      tools.cxTwoPoint
+      packed_aware(tools.cxTwoPoint, packedops.cx_two_point)
     )
 
+  def configure_matrix_toolbox(self, toolbox):
+    toolbox.register('mate', matrixops.cx_two_point_rows)
+
 class UniformCrossover(ToolboxContributor):
   def __init__(self, **kwargs):
     super(UniformCrossover, self).__init__()
@@ -31,42 +52,100 @@ class UniformCrossover(ToolboxContributor):
   def configure_toolbox(self, toolbox):
     toolbox.register(
       'mate',
-      tools.cxUniform,
+      packed_aware(tools.cxUniform, packedops.cx_uniform),
+      indpb=self.indiv_item_cx_prob
+    )
+
+  def configure_matrix_toolbox(self, toolbox):
+    toolbox.register(
+      'mate',
+      matrixops.cx_uniform_rows,
       indpb=self.indiv_item_cx_prob
     )
 
-def mapping_keys_to_tuples(id, mapping):
-  return [(id, a_key) for a_key in mapping.keys()]
+class SortedKeyIndex(list):
+  """Sorted keys of a mapping individual (see py:func:: sorted_key_index).
+
+  Keys are immutable, so copies of the index (e.g., made by ``toolbox.clone``)
+  share them instead of copying each.
+  """
+
+  def __deepcopy__(self, memo):
+    return SortedKeyIndex(self)
 
-def mapping_deep_copy(src_mapping):
-  result = {}
-  result.update(src_mapping)
+def sorted_key_index(mapping):
+  """Keys of a mapping, in sorted order.
+
+  The index is kept in the ``sorted_keys`` attribute of the mapping (when it
+  takes attributes, as DEAP individuals do), so crossovers find it without
+  sorting again; crossovers that move keys between mappings update it in
+  place. It is rebuilt whenever the keys of the mapping changed since (e.g.,
+  after a fitness evaluation added genes, or a mutation replaced some), which
+  takes one membership test per key instead of a sort.
+
+  Parameters
+  ----------
+  mapping : collections.abc.Mapping
+    Mapping whose keys are sortable.
+
+  Returns
+  -------
+  list
+    Keys of the mapping, sorted.
+  """
+  result = getattr(mapping, 'sorted_keys', None)
+  # Keys in the index are distinct, so the mapping holds the same keys if it
+  # holds as many and every one of them.
+  if result is None or len(result) != len(mapping) or not all(
+    map(mapping.__contains__, result)
+  ):
+    result = SortedKeyIndex(sorted(mapping))
+    try:
+      mapping.sorted_keys = result
+    except AttributeError:
+      pass
   return result
 
-def blend_mappings_using_tuples(src_map_1, src_map_2, keys_1, keys_2):
-  src_1_copy = mapping_deep_copy(src_map_1)
-  src_2_copy = mapping_deep_copy(src_map_2)
-  src_map_1.clear()
-  src_map_2.clear()
-  for a_mapping, a_key_list in zip([src_map_1, src_map_2], [keys_1, keys_2]):
-    for map_id, a_key in a_key_list:
-      if map_id == 1:
-        a_mapping[a_key] = src_1_copy[a_key]
-      elif map_id == 2:
-        a_mapping[a_key] = src_2_copy[a_key]
+def exchange_mapping_range(ind1, ind2, idx1, idx2, lo1, hi1, lo2, hi2):
+  """Exchange the genes of two mappings within a range of keys, in place.
+
+  The range is given by positions in the sorted key index of each mapping
+  (see py:func:: sorted_key_index), which must delimit the same range of
+  keys. Keys present in both mappings swap their values; keys present in only
+  one move to the other, and the indexes are updated to match.
+  """
+  segment1 = idx1[lo1:hi1]
+  segment2 = idx2[lo2:hi2]
+  for a_key in segment1:
+    if a_key in ind2:
+      (ind1[a_key], ind2[a_key]) = (ind2[a_key], ind1[a_key])
+    else:
+      ind2[a_key] = ind1.pop(a_key)
+  for a_key in segment2:
+    if a_key not in ind1:
+      ind1[a_key] = ind2.pop(a_key)
+  idx1[lo1:hi1] = segment2
+  idx2[lo2:hi2] = segment1
 
 class MappingCrossoverBase(ToolboxContributor):
-  @staticmethod
-  def raise_no_mapped(ind1, ind2):
-    raise TypeError(
-      'Second individual passed to MappingCrossoverBase is not a ' +
-      'MutableMapping'
-    )
+  """Base of crossovers between individuals backed by mappings (e.g.,
+  ``dict``).
+
+  Genes are ordered by key, using the sorted key index of each individual
+  (see py:func:: sorted_key_index), so crossover points are the same for
+  equal individuals and runs are repeatable for a given seed. Only the genes
+  exchanged are touched: values swap in place, and the individuals are never
+  copied. Subclasses implement ``exchange``.
+  """
 
   def __init__(self, **kwargs):
     super(MappingCrossoverBase, self).__init__()
-    self.mapped_deap_cx = MappingCrossoverBase.raise_no_mapped
-  
+
+  def exchange(self, ind1, ind2, idx1, idx2):
+    raise NotImplementedError(
+      'MappingCrossoverBase missing exchange() implementation.'
+    )
+
   def __call__(self, ind1, ind2):
     if not isinstance(ind1, collections.abc.MutableMapping):
       raise TypeError(
@@ -78,42 +157,173 @@ class MappingCrossoverBase(ToolboxContributor):
         'Second individual passed to MappingCrossoverBase is not a ' +
         'MutableMapping'
       )
-    child1 = mapping_keys_to_tuples(1, ind1)
-    child2 = mapping_keys_to_tuples(2, ind2)
-    if self.mapped_deap_cx is None:
-      raise RuntimeError(
-        'MappingCrossoverBase not iniailized with DEAP ' +
-        'operator to adapt.'
-      )
-    self.mapped_deap_cx(child1, child2)
-    blend_mappings_using_tuples(
-      ind1,
-      ind2,
-      child1,
-      child2
-    )
+    self.exchange(ind1, ind2, sorted_key_index(ind1), sorted_key_index(ind2))
     return (ind1, ind2)
-  
+
   def configure_toolbox(self, toolbox):
     toolbox.register('mate', self)
-    
 
 class OnePointMappingCrossover(MappingCrossoverBase):
-  def __init__(self, **kwargs):
-    super(OnePointMappingCrossover, self).__init__()
-    self.mapped_deap_cx = tools.cxOnePoint
+  def exchange(self, ind1, ind2, idx1, idx2):
+    size = min(len(idx1), len(idx2))
+    if size < 2:
+      return
+    cxpoint = random.randint(1, size - 1)
+    exchange_mapping_range(
+      ind1,
+      ind2,
+      idx1,
+      idx2,
+      cxpoint,
+      len(idx1),
+      bisect.bisect_left(idx2, idx1[cxpoint]),
+      len(idx2)
+    )
 
 class TwoPointMappingCrossover(MappingCrossoverBase):
-  def __init__(self, **kwargs):
-    super(TwoPointMappingCrossover, self).__init__()
-    self.mapped_deap_cx = tools.cxTwoPoint
+  def exchange(self, ind1, ind2, idx1, idx2):
+    size = min(len(idx1), len(idx2))
+    if size < 2:
+      return
+    cxpoint1 = random.randint(1, size)
+    cxpoint2 = random.randint(1, size - 1)
+    if cxpoint2 >= cxpoint1:
+      cxpoint2 += 1
+    else:
+      (cxpoint1, cxpoint2) = (cxpoint2, cxpoint1)
+    # Points past the last key of the first individual reach the end of the
+    # second.
+    lo2 = (
+      bisect.bisect_left(idx2, idx1[cxpoint1])
+      if cxpoint1 < len(idx1) else len(idx2)
+    )
+    hi2 = (
+      bisect.bisect_left(idx2, idx1[cxpoint2])
+      if cxpoint2 < len(idx1) else len(idx2)
+    )
+    exchange_mapping_range(
+      ind1,
+      ind2,
+      idx1,
+      idx2,
+      cxpoint1,
+      cxpoint2,
+      lo2,
+      hi2
+    )
 
 class UniformMappingCrossover(MappingCrossoverBase):
+  """Exchanges each key of either individual with a fixed probability.
+
+  The keys of the first individual are visited in sorted order, then those
+  only in the second, drawing one random number per key, so the keys
+  exchanged depend only on the keys of the individuals and the seed.
+  """
+
   def __init__(self, **kwargs):
     super(UniformMappingCrossover, self).__init__()
     self.indiv_item_cx_prob = float(kwargs.get('indiv_item_cx_prob', '0.5'))
-    self.mapped_deap_cx = partial(
-      tools.cxUniform,
+
+  def exchange(self, ind1, ind2, idx1, idx2):
+    cx_prob = self.indiv_item_cx_prob
+    draw = random.random
+    (kept1, moved1) = ([], [])
+    for a_key in idx1:
+      if a_key in ind2:
+        if draw() < cx_prob:
+          (ind1[a_key], ind2[a_key]) = (ind2[a_key], ind1[a_key])
+        kept1.append(a_key)
+      elif draw() < cx_prob:
+        moved1.append(a_key)
+      else:
+        kept1.append(a_key)
+    (kept2, moved2) = ([], [])
+    for a_key in idx2:
+      if a_key not in ind1 and draw() < cx_prob:
+        moved2.append(a_key)
+      else:
+        kept2.append(a_key)
+    if not (moved1 or moved2):
+      return
+    for a_key in moved1:
+      ind2[a_key] = ind1.pop(a_key)
+    for a_key in moved2:
+      ind1[a_key] = ind2.pop(a_key)
+    # The keys kept and the keys received are two sorted runs, which sorting
+    # merges in linear time.
+    idx1[:] = sorted(kept1 + moved2)
+    idx2[:] = sorted(kept2 + moved1)
+
+class ArrayCrossoverBase(ToolboxContributor):
+  """Base of crossovers between individuals backed by NumPy arrays.
+
+  DEAP's sequence crossovers swap slices, which for NumPy arrays are views
+  into the original buffers; these crossovers exchange elements using masks
+  over whole arrays instead. Subclasses implement ``crossover_mask``.
+  """
+
+  def __init__(self, **kwargs):
+    super(ArrayCrossoverBase, self).__init__()
+
+  def crossover_mask(self, size):
+    raise NotImplementedError(
+      'ArrayCrossoverBase missing crossover_mask() implementation.'
+    )
+
+  def __call__(self, ind1, ind2):
+    if not isinstance(ind1, np.ndarray):
+      raise TypeError(
+        'First individual passed to ArrayCrossoverBase is not an array'
+      )
+    if not isinstance(ind2, np.ndarray):
+      raise TypeError(
+        'Second individual passed to ArrayCrossoverBase is not an array'
+      )
+    mask = self.crossover_mask(min(len(ind1), len(ind2)))
+    exchanged = ind1[:len(mask)][mask]
+    ind1[:len(mask)][mask] = ind2[:len(mask)][mask]
+    ind2[:len(mask)][mask] = exchanged
+    return (ind1, ind2)
+
+  def configure_toolbox(self, toolbox):
+    toolbox.register('mate', self)
+
+class OnePointArrayCrossover(ArrayCrossoverBase):
+  def crossover_mask(self, size):
+    result = np.zeros(size, dtype=bool)
+    result[random.randint(1, size - 1):] = True
+    return result
+
+  def configure_matrix_toolbox(self, toolbox):
+    toolbox.register('mate', matrixops.cx_one_point_rows)
+
+class TwoPointArrayCrossover(ArrayCrossoverBase):
+  def crossover_mask(self, size):
+    cxpoint1 = random.randint(1, size)
+    cxpoint2 = random.randint(1, size - 1)
+    if cxpoint2 >= cxpoint1:
+      cxpoint2 += 1
+    else:
+      (cxpoint1, cxpoint2) = (cxpoint2, cxpoint1)
+    result = np.zeros(size, dtype=bool)
+    result[cxpoint1:cxpoint2] = True
+    return result
+
+  def configure_matrix_toolbox(self, toolbox):
+    toolbox.register('mate', matrixops.cx_two_point_rows)
+
+class UniformArrayCrossover(ArrayCrossoverBase):
+  def __init__(self, **kwargs):
+    super(UniformArrayCrossover, self).__init__()
+    self.indiv_item_cx_prob = float(kwargs.get('indiv_item_cx_prob', '0.5'))
+
+  def crossover_mask(self, size):
+    return np.random.random_sample(size) < self.indiv_item_cx_prob
+
+  def configure_matrix_toolbox(self, toolbox):
+    toolbox.register(
+      'mate',
+      matrixops.cx_uniform_rows,
       indpb=self.indiv_item_cx_prob
     )
 
@@ -123,7 +333,18 @@ class FlipBitMutation(ToolboxContributor):
     self.indv_bit_mut_prob = float(kwargs.get('indv_bit_mut_prob', '0.05'))
   
   def configure_toolbox(self, toolbox):
-    toolbox.register('mutate', tools.mutFlipBit, indpb=self.indv_bit_mut_prob)
+    toolbox.register(
+      'mutate',
+      packed_aware(tools.mutFlipBit, packedops.mut_flip_bit),
+      indpb=self.indv_bit_mut_prob
+    )
+
+  def configure_matrix_toolbox(self, toolbox):
+    toolbox.register(
+      'mutate',
+      matrixops.mut_flip_bit_rows,
+      indpb=self.indv_bit_mut_prob
+    )
 
 class GaussianMutation(ToolboxContributor):
   def __init__(self, **kwargs):
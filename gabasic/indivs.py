@@ -1,13 +1,48 @@
 # pylint: disable=no-member
 
+import copy
 import array
 import random
+import collections
 from deap import creator
 from deap import base
 from deap import tools
 from . import ToolboxContributor
+from . import matrixops
 
 
+def copy_attributes(original, clone):
+  """Give the clone of an individual its own copy of every attribute of the
+  original, such as its fitness.
+
+  Fitnesses (``deap.base.Fitness`` instances) are copied by their values,
+  which are immutable, without going through their constructor; any other
+  attribute is deep-copied. This is the part of ``copy.deepcopy`` shared by
+  the ``clone`` operators registered by individual components, which copy the
+  contents of the individual themselves.
+
+  Parameters
+  ----------
+  original : object
+    Individual cloned.
+  clone : object
+    Copy of the contents of ``original``.
+
+  Returns
+  -------
+  object
+    The clone.
+  """
+  for attr_name, attr_value in vars(original).items():
+    if isinstance(attr_value, base.Fitness):
+      fitness = attr_value.__class__.__new__(attr_value.__class__)
+      fitness.wvalues = attr_value.wvalues
+      attr_value = fitness
+    else:
+      attr_value = copy.deepcopy(attr_value)
+    setattr(clone, attr_name, attr_value)
+  return clone
+
 class BitString(ToolboxContributor):
   def __init__(self, fitness_type, **kwargs):
     super(BitString, self).__init__()
@@ -32,5 +67,241 @@ class BitString(ToolboxContributor):
       self.bitstring_size
     )
     toolbox.register('population', tools.initRepeat, list, toolbox.individual)
+    toolbox.register('clone', BitString.clone)
+
+  @staticmethod
+  def clone(individual):
+    """Copy of a bit string, its bits copied as a single buffer."""
+    cls = type(individual)
+    return copy_attributes(individual, cls.__new__(cls, individual))
+
+  def configure_matrix_toolbox(self, toolbox):
+    toolbox.register(
+      'population',
+      matrixops.random_bit_matrix,
+      column_count=self.bitstring_size
+    )
+    toolbox.register('individual_from_row', self._individual_from_row)
+
+  def _individual_from_row(self, row):
+    return self._bit_string(row.tolist())
+
+class PackedBits(int):
+  """Immutable bit string packed into an integer, bit ``n`` being item ``n``.
+
+  The length of the bit string is given by the ``size`` class attribute, so it
+  may include leading zero bits. Iterating yields every item as ``0`` or
+  ``1``, which makes these bit strings usable wherever a sequence of bits is
+  expected, while the operators in ``gabasic.packedops`` work on the whole
+  integer at once and return new instances.
+  """
+
+  size = 0
+
+  def __len__(self):
+    return self.size
+
+  def __iter__(self):
+    for bit_idx in range(self.size):
+      yield (self >> bit_idx) & 1
+
+class PackedBitString(ToolboxContributor):
+  """Bit string individual whose bits are packed into a single integer.
+
+  Counterpart of py:class:: BitString taking an eighth of the memory, whose
+  individuals are py:class:: PackedBits instances. The ``SumItems`` fitness
+  evaluation and the bit string crossovers and mutation recognize these
+  individuals and work on their packed bits directly.
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
+  def __init__(self, fitness_type, **kwargs):
+    super(PackedBitString, self).__init__()
+    fitness = creator.__dict__[fitness_type]
+    self.bitstring_size = int(kwargs.get('bitstring_size', 10))
+    creator.create(
+      'PackedBitString',
+      PackedBits,
+      size=self.bitstring_size,
+      fitness=fitness
+    )
+    self._bit_string = creator.__dict__['PackedBitString']
+
+  def new_random(self):
+    return self._bit_string(random.getrandbits(self.bitstring_size))
+
+  def configure_toolbox(self, toolbox):
+    toolbox.register('individual', self.new_random)
+    toolbox.register('population', tools.initRepeat, list, toolbox.individual)
+    toolbox.register('clone', PackedBitString.clone)
+
+  @staticmethod
+  def clone(individual):
+    """Copy of a bit string; its bits are an immutable integer, so only its
+    attributes are copied.
+    """
+    cls = type(individual)
+    return copy_attributes(individual, cls.__new__(cls, individual))
+
+class _ChunkedValuesView(collections.abc.ValuesView):
+  def __iter__(self):
+    for a_chunk in self._mapping._chunks:
+      yield from a_chunk.values()
+
+class _ChunkedItemsView(collections.abc.ItemsView):
+  def __iter__(self):
+    for a_chunk in self._mapping._chunks:
+      yield from a_chunk.items()
+
+class ChunkedMapping(object):
+  """Mapping whose copies share their contents until they are changed.
+
+  Items are spread over ``chunk_count`` chunks (plain ``dict`` instances) by
+  the hash of their key. Copying a mapping, including with ``copy.deepcopy``
+  and so with the default ``toolbox.clone``, shares every chunk with the
+  original, taking the same time however many items there are. The first
+  change to a shared chunk, by either mapping, copies that chunk alone, so
+  crossovers and mutations only copy the chunks they touch.
+
+  Values are shared along with the chunks, so they must be replaced, never
+  changed in place. Attributes (such as the fitness of an individual created
+  through ``deap.creator``) are deep-copied as usual. Items are iterated chunk
+  by chunk; their order only depends on the hash of the keys and the order in
+  which they were added, so it is the same in every process for keys such as
+  integers and tuples of integers.
+
+  The number of chunks is given by the ``chunk_count`` class attribute, which
+  ``deap.creator`` classes may set as any other. The class is registered as a
+  ``collections.abc.MutableMapping`` rather than derived from it, since
+  ``deap.creator`` classes cannot have an abstract base.
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
+  __slots__ = ('_chunks', '_owned', '_len')
+  __hash__ = None
+
+  chunk_count = 32
+
+  def __init__(self, *args, **kwargs):
+    super(ChunkedMapping, self).__init__()
+    self._chunks = [{} for _ in range(self.chunk_count)]
+    self._owned = bytearray(b'\x01') * self.chunk_count
+    self._len = 0
+    self.update(*args, **kwargs)
+
+  def _writable_chunk(self, key):
+    chunk_idx = hash(key) % len(self._chunks)
+    if not self._owned[chunk_idx]:
+      self._chunks[chunk_idx] = dict(self._chunks[chunk_idx])
+      self._owned[chunk_idx] = 1
+    return self._chunks[chunk_idx]
+
+  def _share(self):
+    cls = type(self)
+    result = cls.__new__(cls)
+    result._chunks = list(self._chunks)
+    result._owned = bytearray(len(self._chunks))
+    result._len = self._len
+    self._owned = bytearray(len(self._chunks))
+    return result
+
+  def __copy__(self):
+    result = self._share()
+    if hasattr(self, '__dict__'):
+      result.__dict__.update(self.__dict__)
+    return result
+
+  def copy(self):
+    """Shallow copy sharing every chunk, as ``copy.copy`` makes."""
+    return self.__copy__()
+
+  def __deepcopy__(self, memo):
+    result = self._share()
+    memo[id(self)] = result
+    for attr_name, attr_value in getattr(self, '__dict__', {}).items():
+      setattr(result, attr_name, copy.deepcopy(attr_value, memo))
+    return result
+
+  def __getitem__(self, key):
+    return self._chunks[hash(key) % len(self._chunks)][key]
+
+  def __contains__(self, key):
+    return key in self._chunks[hash(key) % len(self._chunks)]
+
+  def get(self, key, default=None):
+    return self._chunks[hash(key) % len(self._chunks)].get(key, default)
+
+  def __setitem__(self, key, value):
+    chunk = self._writable_chunk(key)
+    if key not in chunk:
+      self._len += 1
+    chunk[key] = value
+
+  def __delitem__(self, key):
+    if key not in self:
+      raise KeyError(key)
+    del self._writable_chunk(key)[key]
+    self._len -= 1
+
+  def __iter__(self):
+    for a_chunk in self._chunks:
+      yield from a_chunk
+
+  def __len__(self):
+    return self._len
+
+  def __eq__(self, other):
+    if not isinstance(other, collections.abc.Mapping):
+      return NotImplemented
+    return len(self) == len(other) and all(
+      a_key in other and other[a_key] == a_value
+      for a_key, a_value in self.items()
+    )
+
+  def pop(self, key, *default):
+    if key not in self:
+      if default:
+        return default[0]
+      raise KeyError(key)
+    self._len -= 1
+    return self._writable_chunk(key).pop(key)
+
+  def popitem(self):
+    for a_chunk in self._chunks:
+      if a_chunk:
+        key = next(reversed(a_chunk))
+        self._len -= 1
+        return (key, self._writable_chunk(key).pop(key))
+    raise KeyError('popitem(): mapping is empty')
+
+  def setdefault(self, key, default=None):
+    if key not in self:
+      self[key] = default
+    return self[key]
+
+  def update(self, *args, **kwargs):
+    for a_key, a_value in dict(*args, **kwargs).items():
+      self[a_key] = a_value
+
+  def clear(self):
+    self._chunks = [{} for _ in range(len(self._chunks))]
+    self._owned = bytearray(b'\x01') * len(self._chunks)
+    self._len = 0
+
+  def keys(self):
+    return collections.abc.KeysView(self)
+
+  def values(self):
+    return _ChunkedValuesView(self)
+
+  def items(self):
+    return _ChunkedItemsView(self)
+
+  def __repr__(self):
+    return '{}({!r})'.format(type(self).__name__, dict(self.items()))
+
+collections.abc.MutableMapping.register(ChunkedMapping)
 
 # vim: set ts=2 sw=2 expandtab:
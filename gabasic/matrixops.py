@@ -0,0 +1,109 @@
+"""Batched counterparts of the DEAP operators used by ``gabasic`` components.
+
+These operate on a whole population kept as a 2-D matrix (one row per
+individual) and are registered by components in the toolbox that
+py:class:: MatrixGa hands to ``configure_matrix_toolbox``. Every random
+decision is drawn from NumPy's global RNG.
+"""
+import numpy as np
+
+
+def random_bit_matrix(row_count, column_count):
+  """Matrix of uniformly random binary digits."""
+  return np.random.randint(
+    0,
+    2,
+    size=(row_count, column_count),
+    dtype=np.uint8
+  )
+
+def sum_rows(rows):
+  """Fitness of each row as the sum of its items, one column per objective."""
+  return rows.sum(axis=1, dtype=np.int64)[:, np.newaxis].astype(np.float64)
+
+def _exchange_masked(rows1, rows2, mask):
+  return (np.where(mask, rows2, rows1), np.where(mask, rows1, rows2))
+
+def cx_one_point_rows(rows1, rows2):
+  """Row-wise counterpart of ``deap.tools.cxOnePoint``."""
+  (row_count, size) = rows1.shape
+  cxpoints = np.random.randint(1, size, size=(row_count, 1))
+  return _exchange_masked(rows1, rows2, np.arange(size) >= cxpoints)
+
+def cx_two_point_rows(rows1, rows2):
+  """Row-wise counterpart of ``deap.tools.cxTwoPoint``."""
+  (row_count, size) = rows1.shape
+  cxpoints1 = np.random.randint(1, size + 1, size=(row_count, 1))
+  cxpoints2 = np.random.randint(1, size, size=(row_count, 1))
+  cxpoints2 += cxpoints2 >= cxpoints1
+  (cxpoints1, cxpoints2) = (
+    np.minimum(cxpoints1, cxpoints2),
+    np.maximum(cxpoints1, cxpoints2)
+  )
+  columns = np.arange(size)
+  return _exchange_masked(
+    rows1,
+    rows2,
+    (columns >= cxpoints1) & (columns < cxpoints2)
+  )
+
+def cx_uniform_rows(rows1, rows2, indpb):
+  """Row-wise counterpart of ``deap.tools.cxUniform``."""
+  return _exchange_masked(
+    rows1,
+    rows2,
+    np.random.random_sample(rows1.shape) < indpb
+  )
+
+def mut_flip_bit_rows(rows, indpb):
+  """Row-wise counterpart of ``deap.tools.mutFlipBit``."""
+  flips = np.random.random_sample(rows.shape) < indpb
+  return rows ^ flips.astype(rows.dtype)
+
+def fitness_ranks(values, weights):
+  """Dense rank of each individual's fitness (higher is better)."""
+  # Dense ranks of the weighted fitness values, compared lexicographically as
+  # DEAP compares fitnesses, so equal fitnesses get equal ranks.
+  return np.unique(
+    values * np.asarray(weights),
+    axis=0,
+    return_inverse=True
+  )[1].reshape(-1)
+
+def sel_tournament_idx(values, weights, k, tournsize):
+  """Indices chosen by ``deap.tools.selTournament``-style tournaments.
+
+  Parameters
+  ----------
+  values : numpy.ndarray
+    Fitness values, one row per individual and one column per objective.
+  weights : tuple
+    Fitness weights.
+  k : int
+    Number of individuals to select.
+  tournsize : int
+    Number of aspirants in each tournament.
+
+  Returns
+  -------
+  numpy.ndarray
+    Index of each selected individual.
+  """
+  aspirants = np.random.randint(len(values), size=(k, tournsize))
+  ranks = fitness_ranks(values, weights)
+  return aspirants[np.arange(k), np.argmax(ranks[aspirants], axis=1)]
+
+def sel_roulette_idx(values, weights, k):
+  """Indices chosen by ``deap.tools.selRoulette``-style roulette spins.
+
+  Like its DEAP counterpart, the roulette spins over the first raw fitness
+  value, so it requires positive fitnesses and maximization.
+  """
+  first_values = values[:, 0]
+  return np.random.choice(
+    len(values),
+    size=k,
+    p=first_values / first_values.sum()
+  )
+
+# vim: set ts=2 sw=2 expandtab:
@@ -0,0 +1,161 @@
+"""Streaming the per-generation statistics of a GA run to a file.
+
+A metrics file holds one record per generation, with the same fields as the
+run's logbook (``gen``, ``nevals`` and the statistics). Files named ``*.csv``
+are written as CSV with a header row; any other file is written as JSON Lines
+(one JSON object per line). Records are buffered in memory and written out in
+blocks; py:class:: SimpleGa also writes them out whenever it writes a
+checkpoint.
+"""
+import csv
+import json
+
+
+def _plain_value(value):
+  # NumPy scalars (such as those computed by the logbook statistics) are
+  # written as the Python numbers they hold.
+  if hasattr(value, 'item'):
+    return value.item()
+  if hasattr(value, 'tolist'):
+    return value.tolist()
+  raise TypeError(
+    'Cannot write {} as a metric value.'.format(type(value).__name__)
+  )
+
+
+class MetricsSink(object):
+  """Receives the record of each generation as the run progresses.
+
+  Attributes
+  ----------
+  path : str
+    Location of the metrics file.
+  fields : list
+    Name of each field of the records, in order.
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
+  BUFFER_SIZE = 64 * 1024
+
+  def __init__(self, path, fields):
+    super(MetricsSink, self).__init__()
+    self.path = path
+    self.fields = list(fields)
+    self._file = open(
+      path,
+      'w',
+      newline='',
+      buffering=MetricsSink.BUFFER_SIZE
+    )
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    self.close()
+
+  def write(self, record):
+    """Append the record of one generation.
+
+    Parameters
+    ----------
+    record : dict
+      Record, as added to the logbook of the run.
+    """
+    raise NotImplementedError('MetricsSink missing write() implementation.')
+
+  def flush(self):
+    """Write out every buffered record."""
+    self._file.flush()
+
+  def close(self):
+    """Write out every buffered record and close the file."""
+    if not self._file.closed:
+      self._file.close()
+
+
+class JsonLinesMetricsSink(MetricsSink):
+  """Writes each record as a JSON object on its own line.
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
+  def write(self, record):
+    self._file.write(json.dumps(
+      {a_field: record.get(a_field) for a_field in self.fields},
+      default=_plain_value
+    ))
+    self._file.write('\n')
+
+
+class CsvMetricsSink(MetricsSink):
+  """Writes each record as a CSV row, after a header row with the field names.
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
+  def __init__(self, path, fields):
+    super(CsvMetricsSink, self).__init__(path, fields)
+    self._writer = csv.writer(self._file)
+    self._writer.writerow(self.fields)
+
+  def write(self, record):
+    self._writer.writerow([
+      _plain_value(a_value) if hasattr(a_value, 'item') else a_value
+      for a_value in (record.get(a_field, '') for a_field in self.fields)
+    ])
+
+
+def _is_csv(path):
+  return path.lower().endswith('.csv')
+
+def open_metrics_sink(path, fields):
+  """Create the sink for a metrics file, choosing its format by file name.
+
+  Parameters
+  ----------
+  path : str
+    Location of the metrics file; any existing file is replaced.
+  fields : list
+    Name of each field of the records, in order.
+
+  Returns
+  -------
+  MetricsSink
+    New sink.
+  """
+  if _is_csv(path):
+    return CsvMetricsSink(path, fields)
+  return JsonLinesMetricsSink(path, fields)
+
+def _csv_value(text):
+  for a_type in (int, float):
+    try:
+      return a_type(text)
+    except ValueError:
+      pass
+  return text
+
+def read_metrics(path):
+  """Read the records of a metrics file.
+
+  Parameters
+  ----------
+  path : str
+    Location of the metrics file.
+
+  Returns
+  -------
+  list
+    Record (a ``dict``) of each generation, in order.
+  """
+  with open(path, newline='') as metrics_file:
+    if _is_csv(path):
+      return [
+        {a_field: _csv_value(a_value) for a_field, a_value in a_row.items()}
+        for a_row in csv.DictReader(metrics_file)
+      ]
+    return [json.loads(a_line) for a_line in metrics_file if a_line.strip()]
+
+# vim: set ts=2 sw=2 expandtab:
@@ -0,0 +1,60 @@
+"""Building GA models from their INI configuration."""
+from .registry import resolve_component
+
+
+def create_component(ini_config, ini_key, *args, **kwargs):
+  """Create the component named by a key of the ``GA`` section.
+
+  The component is given the key-value pairs of the INI section with its own
+  name (if any), updated with ``kwargs``.
+
+  Parameters
+  ----------
+  ini_config : configparser.ConfigParser
+    Model configuration.
+  ini_key : str
+    Key of the ``GA`` section that names the component.
+
+  Returns
+  -------
+  object
+    New component.
+  """
+  comp_name = ini_config['GA'][ini_key]
+  comp_cls = resolve_component(comp_name)
+  comp_config = {} if not ini_config.has_section(comp_name) else dict(ini_config[comp_name].items())
+  comp_config.update(kwargs)
+  return comp_cls(*args, **comp_config)
+
+def build_ga(ini_config):
+  """Create the components of a model and the algorithm that runs it.
+
+  Parameters
+  ----------
+  ini_config : configparser.ConfigParser
+    Model configuration.
+
+  Returns
+  -------
+  SimpleGa
+    Algorithm (named by the ``algorithm`` key, py:class:: SimpleGa by
+    default), ready to run.
+  """
+  ga_config = dict(ini_config['GA'].items())
+  create_component(ini_config, 'fitness_type')
+  individual = create_component(ini_config, 'individual', ga_config['fitness_type'])
+  fitness_eval = create_component(ini_config, 'fitness_eval')
+  selection = create_component(ini_config, 'selection')
+  crossover_type = create_component(ini_config, 'crossover_type')
+  mutation_type = create_component(ini_config, 'mutation_type')
+  toolbox_mods = [fitness_eval, individual, selection, crossover_type, mutation_type]
+
+  ini_config['GA'].setdefault('algorithm', 'SimpleGa')
+  ga = create_component(ini_config, 'algorithm', toolbox_mods, **ga_config)
+  ga.model_config = {
+    a_section: dict(ini_config[a_section].items())
+    for a_section in ini_config.sections()
+  }
+  return ga
+
+# vim: set ts=2 sw=2 expandtab:
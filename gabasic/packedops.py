@@ -0,0 +1,70 @@
+"""Operators for individuals that pack their bits into a single integer.
+
+Bit ``n`` of the integer holds item ``n`` of the bit string, so crossovers and
+mutations come down to building a mask of the bits involved and combining the
+parents with a few bitwise operations, instead of visiting every item.
+"""
+import math
+import random
+
+
+if hasattr(int, 'bit_count'):
+  popcount = int.bit_count
+else:
+  def popcount(value):
+    """Number of bits set in a non-negative integer."""
+    return bin(value).count('1')
+
+def random_mask(size, prob):
+  """Random mask of ``size`` bits, each set independently with probability
+  ``prob``.
+
+  Rather than drawing one random number per bit, the gaps between set bits are
+  drawn from the geometric distribution, so the cost is proportional to the
+  number of bits set.
+  """
+  if prob <= 0.0:
+    return 0
+  if prob >= 1.0:
+    return (1 << size) - 1
+  if prob == 0.5:
+    return random.getrandbits(size)
+  result = 0
+  log_miss = math.log(1.0 - prob)
+  bit_idx = int(math.log(1.0 - random.random()) / log_miss)
+  while bit_idx < size:
+    result |= 1 << bit_idx
+    bit_idx += 1 + int(math.log(1.0 - random.random()) / log_miss)
+  return result
+
+def _exchange_masked(ind1, ind2, mask):
+  exchanged = (ind1 ^ ind2) & mask
+  return (type(ind1)(ind1 ^ exchanged), type(ind2)(ind2 ^ exchanged))
+
+def cx_one_point(ind1, ind2):
+  """Counterpart of ``deap.tools.cxOnePoint``; returns new individuals."""
+  size = min(len(ind1), len(ind2))
+  cxpoint = random.randint(1, size - 1)
+  return _exchange_masked(ind1, ind2, (1 << size) - (1 << cxpoint))
+
+def cx_two_point(ind1, ind2):
+  """Counterpart of ``deap.tools.cxTwoPoint``; returns new individuals."""
+  size = min(len(ind1), len(ind2))
+  cxpoint1 = random.randint(1, size)
+  cxpoint2 = random.randint(1, size - 1)
+  if cxpoint2 >= cxpoint1:
+    cxpoint2 += 1
+  else:
+    (cxpoint1, cxpoint2) = (cxpoint2, cxpoint1)
+  return _exchange_masked(ind1, ind2, (1 << cxpoint2) - (1 << cxpoint1))
+
+def cx_uniform(ind1, ind2, indpb):
+  """Counterpart of ``deap.tools.cxUniform``; returns new individuals."""
+  size = min(len(ind1), len(ind2))
+  return _exchange_masked(ind1, ind2, random_mask(size, indpb))
+
+def mut_flip_bit(individual, indpb):
+  """Counterpart of ``deap.tools.mutFlipBit``; returns a new individual."""
+  return (type(individual)(individual ^ random_mask(len(individual), indpb)),)
+
+# vim: set ts=2 sw=2 expandtab:
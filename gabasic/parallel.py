@@ -0,0 +1,221 @@
+import random
+import collections
+import multiprocessing
+import numpy as np
+
+
+# Toolbox and wrapped map made available to pool workers. Workers are forked
+# from the process that creates the pool, so these never need to be pickled.
+_worker_toolbox = None
+_worker_map = map
+
+
+def _init_worker(toolbox, inner_map):
+  global _worker_toolbox, _worker_map
+  _worker_toolbox = toolbox
+  _worker_map = inner_map
+
+def in_pool_chunk():
+  """Whether the caller runs as part of a chunk mapped by a
+  py:class:: ProcessPoolMap (in a worker or in process).
+  """
+  return _worker_toolbox is not None
+
+def _run_chunk(chunk_seed, func, args):
+  """Apply a function to a chunk of arguments with a dedicated RNG seed.
+
+  Both the ``random`` module and NumPy RNGs are seeded with ``chunk_seed``
+  before the function is applied, so any random decision taken while
+  processing the chunk is the same no matter which process processes it.
+
+  Parameters
+  ----------
+  chunk_seed : int
+    Seed for the chunk.
+  func : callable or str
+    Function to apply, or the name of the toolbox attribute holding it.
+  args : list
+    List of argument tuples, one per item in the chunk.
+
+  Returns
+  -------
+  list
+    Results of applying the function to each item.
+  """
+  if isinstance(func, str):
+    func = getattr(_worker_toolbox, func)
+  random.seed(chunk_seed)
+  np.random.seed(chunk_seed % (2 ** 32))
+  return list(_worker_map(func, *zip(*args)))
+
+def _item_state(item):
+  """Capture the contents and attributes of an item processed by a worker.
+
+  Individuals created through ``deap.creator`` cannot be sent back as they are,
+  since unpickling them defines their class anew, so only their contents and
+  attributes (other than the fitness) are sent.
+  """
+  if isinstance(item, collections.abc.Mapping):
+    contents = dict(item.items())
+  elif isinstance(item, np.ndarray):
+    contents = np.array(item)
+  elif hasattr(item, '__setitem__'):
+    contents = list(item)
+  else:
+    contents = None
+  attrs = {
+    attr_name: attr_value for attr_name, attr_value in
+    getattr(item, '__dict__', {}).items() if attr_name != 'fitness'
+  }
+  return (contents, attrs)
+
+def _run_chunk_in_worker(chunk_seed, func, args):
+  results = _run_chunk(chunk_seed, func, args)
+  return results, [_item_state(an_arg[0]) for an_arg in args]
+
+def _merge_into(target, item_state):
+  """Copy the state of an item processed by a worker into the original.
+
+  Fitness evaluations are allowed to alter the individual they evaluate (for
+  example, adding genes), so the state of the copy the worker evaluated
+  replaces that of the original. The fitness of the original is left
+  untouched.
+  """
+  (contents, attrs) = item_state
+  if isinstance(target, collections.abc.MutableMapping):
+    target.clear()
+    target.update(contents)
+  elif contents is not None:
+    try:
+      target[:] = contents
+    except TypeError:
+      target[:] = type(target)(contents)
+  for attr_name, attr_value in attrs.items():
+    setattr(target, attr_name, attr_value)
+
+
+class ProcessPoolMap(object):
+  """Drop-in replacement for the toolbox ``map`` backed by a process pool.
+
+  Items are split into chunks of ``chunk_size`` items, and each chunk is
+  processed by one worker using the ``map`` that was registered in the toolbox
+  before this one, so evaluators that score several individuals at once still
+  do so within each chunk. A seed for each chunk is drawn from the ``random``
+  module of the calling process, and the worker seeds its RNGs with it, so
+  results depend on the seed of the run and on ``chunk_size``, but not on the
+  number of workers or on how chunks are scheduled. A single worker processes
+  every chunk in the calling process, producing the same results as any other
+  worker count.
+
+  Workers are forked the first time the map is used, inheriting every global
+  (such as class-level lookup tables) from the calling process at that moment.
+  Components keeping global state must make sure it is complete and does not
+  change afterwards, since changes made by one worker are not seen by others.
+  The contents and attributes of the items processed by workers are copied
+  back into the originals, so changes that fitness evaluations make to
+  individuals are preserved.
+
+  Attributes
+  ----------
+  workers : int
+    Number of worker processes.
+  chunk_size : int
+    Number of items sent to a worker at a time.
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
+  def __init__(self, toolbox, workers, chunk_size=16):
+    super(ProcessPoolMap, self).__init__()
+    if workers < 1:
+      raise ValueError('At least one worker is required.')
+    if chunk_size < 1:
+      raise ValueError('Chunk size must be positive.')
+    self.workers = workers
+    self.chunk_size = chunk_size
+    self._toolbox = toolbox
+    self._inner_map = toolbox.map
+    self._pool = None
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    self.close()
+
+  def close(self):
+    """Terminate the worker processes, if any were started."""
+    if self._pool is not None:
+      self._pool.close()
+      self._pool.join()
+      self._pool = None
+
+  def _ensure_pool(self):
+    if self._pool is None:
+      if 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+      else:
+        context = multiprocessing.get_context()
+      self._pool = context.Pool(
+        self.workers,
+        initializer=_init_worker,
+        initargs=(self._toolbox, self._inner_map)
+      )
+    return self._pool
+
+  def _func_reference(self, func):
+    # Toolbox aliases are partial objects named after their alias; sending
+    # just the name spares pickling the wrapped component for every chunk.
+    func_name = getattr(func, '__name__', None)
+    if getattr(self._toolbox, str(func_name), None) is func:
+      return func_name
+    return func
+
+  def __call__(self, func, *iterables):
+    args = list(zip(*iterables))
+    chunks = [
+      (random.getrandbits(64), args[start:start + self.chunk_size])
+      for start in range(0, len(args), self.chunk_size)
+    ]
+
+    if self.workers == 1:
+      return self._map_in_process(func, chunks)
+
+    func_ref = self._func_reference(func)
+    pending = [
+      self._ensure_pool().apply_async(
+        _run_chunk_in_worker,
+        (chunk_seed, func_ref, chunk_args)
+      )
+      for chunk_seed, chunk_args in chunks
+    ]
+    results = []
+    for (_, chunk_args), a_pending in zip(chunks, pending):
+      (chunk_results, item_states) = a_pending.get()
+      for an_arg, an_item_state in zip(chunk_args, item_states):
+        _merge_into(an_arg[0], an_item_state)
+      results.extend(chunk_results)
+    return results
+
+  def _map_in_process(self, func, chunks):
+    global _worker_toolbox, _worker_map
+    saved_state = (
+      random.getstate(),
+      np.random.get_state(),
+      _worker_toolbox,
+      _worker_map
+    )
+    _worker_toolbox = self._toolbox
+    _worker_map = self._inner_map
+    try:
+      results = []
+      for chunk_seed, chunk_args in chunks:
+        results.extend(_run_chunk(chunk_seed, func, chunk_args))
+      return results
+    finally:
+      random.setstate(saved_state[0])
+      np.random.set_state(saved_state[1])
+      _worker_toolbox = saved_state[2]
+      _worker_map = saved_state[3]
+
+# vim: set ts=2 sw=2 expandtab:
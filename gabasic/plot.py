@@ -0,0 +1,59 @@
+"""Plotting the per-generation statistics of a GA run.
+
+Run as ``python -m gabasic.plot <metrics file>`` to plot a metrics file
+written during a run (see ``gabasic.metrics``).
+"""
+import argparse
+from .metrics import read_metrics
+
+
+def plot_metrics(records, output_path=None):
+  """Plot the average and best fitness of each generation.
+
+  Parameters
+  ----------
+  records : list
+    Record (a ``dict`` with at least ``gen``, ``avg`` and ``max``) of each
+    generation, such as a logbook or the contents of a metrics file.
+  output_path : str or None
+    If provided, the image file the plot is saved to; otherwise the plot is
+    shown in a window.
+  """
+  import matplotlib
+  if output_path is not None:
+    # Saving an image needs no display.
+    matplotlib.use('Agg')
+  import matplotlib.pyplot as plt
+
+  gen = [a_record['gen'] for a_record in records]
+  avg_fit = [a_record['avg'] for a_record in records]
+  best_fit = [a_record['max'] for a_record in records]
+
+  line1 = plt.plot(gen, avg_fit, "b-", label="Average Fitness")
+  line2 = plt.plot(gen, best_fit, "r-", label="Best Fitness")
+  plt.xlabel("Generation")
+  plt.ylabel("Fitness", color="b")
+
+  lns = line1 + line2
+  labels = [l.get_label() for l in lns]
+  plt.legend(lns, labels, loc="center right")
+
+  if output_path is None:
+    plt.show()
+  else:
+    plt.savefig(output_path)
+    plt.close()
+
+if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser(prog='gabasic.plot')
+  arg_parser.add_argument('metrics_file', help='metrics file written by a run')
+  arg_parser.add_argument(
+    '-o',
+    '--output',
+    metavar='IMAGE',
+    help='save the plot to an image file instead of showing it'
+  )
+  args = arg_parser.parse_args()
+  plot_metrics(read_metrics(args.metrics_file), args.output)
+
+# vim: set ts=2 sw=2 expandtab:
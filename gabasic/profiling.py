@@ -0,0 +1,192 @@
+"""Measuring the time taken by the toolbox operators of a GA run."""
+import time
+import pstats
+
+
+def configure_toolbox(
+  toolbox,
+  toolbox_mods,
+  configure_name='configure_toolbox'
+):
+  """Have each component configure a toolbox, noting which component
+  registered each operator.
+
+  Parameters
+  ----------
+  toolbox : deap.base.Toolbox
+    Toolbox to configure.
+  toolbox_mods : list
+    Components (py:class:: ToolboxContributor instances) configuring the
+    toolbox, in order.
+  configure_name : str
+    Name of the component method that configures the toolbox.
+
+  Returns
+  -------
+  dict
+    Name of the component class that last registered each operator, by
+    operator name.
+  """
+  owners = {}
+  for a_mod in toolbox_mods:
+    registered = dict(vars(toolbox))
+    getattr(a_mod, configure_name)(toolbox)
+    for op_name, an_op in vars(toolbox).items():
+      if registered.get(op_name) is not an_op:
+        owners[op_name] = type(a_mod).__name__
+  return owners
+
+
+class OperatorTimer(object):
+  """Measures the wall time taken by, and the number of calls to, each
+  operator of a toolbox.
+
+  While the timer is in use as a context manager, every operator in the
+  toolbox is replaced by a wrapper that times it. The time of an operator
+  includes that of any operator it calls; operators that call others they
+  were given when registered (e.g., ``population`` calling ``individual``) do
+  not go through the wrappers, so only the outer one is timed. Operators run
+  by process pool workers are not timed. The code of each wrapper is named
+  after the component that registered the operator and the operator itself
+  (e.g., ``TournamentSelection.select``), so profiles taken meanwhile
+  attribute time to components (see py:func:: format_profile_summary).
+
+  Attributes
+  ----------
+  op_names : list
+    Name of each operator timed, in order.
+  owners : dict
+    Name of the component that registered each operator, by operator name;
+    operators missing from it are DEAP's own (e.g., ``map``).
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
+  def __init__(self, toolbox, owners):
+    super(OperatorTimer, self).__init__()
+    self.op_names = sorted(
+      op_name for op_name, an_op in vars(toolbox).items() if callable(an_op)
+    )
+    self.owners = dict(owners)
+    self._toolbox = toolbox
+    self._times = dict.fromkeys(self.op_names, 0.0)
+    self._calls = dict.fromkeys(self.op_names, 0)
+    self._originals = {}
+
+  @property
+  def fields(self):
+    """Names of the logbook columns produced by py:meth:: lap."""
+    return [
+      a_field for op_name in self.op_names
+      for a_field in (op_name + '_time', op_name + '_calls')
+    ]
+
+  def label(self, op_name):
+    """Name of the wrapper code of an operator."""
+    return '{}.{}'.format(self.owners.get(op_name, 'Toolbox'), op_name)
+
+  def __enter__(self):
+    for op_name in self.op_names:
+      an_op = getattr(self._toolbox, op_name)
+      self._originals[op_name] = an_op
+      setattr(self._toolbox, op_name, self._timed(op_name, an_op))
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    for op_name, an_op in self._originals.items():
+      setattr(self._toolbox, op_name, an_op)
+    self._originals = {}
+
+  def lap(self):
+    """Report the time taken by, and calls to, each operator since the last
+    lap (or since the timer was created), and start a new lap.
+
+    Returns
+    -------
+    dict
+      Seconds taken (``<operator>_time``) and number of calls
+      (``<operator>_calls``) by each operator.
+    """
+    result = {}
+    for op_name in self.op_names:
+      result[op_name + '_time'] = self._times[op_name]
+      result[op_name + '_calls'] = self._calls[op_name]
+      self._times[op_name] = 0.0
+      self._calls[op_name] = 0
+    return result
+
+  def _timed(self, op_name, an_op):
+    times = self._times
+    calls = self._calls
+    perf_counter = time.perf_counter
+
+    def timed(*args, **kwargs):
+      start_time = perf_counter()
+      try:
+        return an_op(*args, **kwargs)
+      finally:
+        times[op_name] += perf_counter() - start_time
+        calls[op_name] += 1
+
+    # The wrapper keeps the operator's name, so process pool workers find it
+    # in the toolbox (see ProcessPoolMap), and refers to the operator, so
+    # components can recognize their own operators (see ``inspect.unwrap``).
+    timed.__name__ = op_name
+    timed.__wrapped__ = an_op
+    label = self.label(op_name)
+    code_names = {'co_name': label}
+    if hasattr(timed.__code__, 'co_qualname'):
+      code_names['co_qualname'] = label
+    timed.__code__ = timed.__code__.replace(**code_names)
+    return timed
+
+def format_profile_summary(profile, timer):
+  """Summarize a profile of a run by the component that registered each
+  operator.
+
+  Parameters
+  ----------
+  profile : cProfile.Profile
+    Profile taken while ``timer`` was in use.
+  timer : OperatorTimer
+    Timer whose wrappers the profile recorded.
+
+  Returns
+  -------
+  str
+    Table with the number of calls to, and cumulative seconds taken by,
+    each operator, grouped by component.
+  """
+  by_label = {}
+  for (_, _, func_name), func_stats in pstats.Stats(profile).stats.items():
+    by_label[func_name] = func_stats
+  rows = []
+  for op_name in timer.op_names:
+    func_stats = by_label.get(timer.label(op_name))
+    if func_stats is not None:
+      rows.append((
+        timer.owners.get(op_name, 'Toolbox'),
+        op_name,
+        func_stats[1],
+        func_stats[3]
+      ))
+  rows.sort(key=lambda a_row: (a_row[0], -a_row[3]))
+
+  lines = ['{:<28s}{:<14s}{:>10s}{:>12s}'.format(
+    'Component',
+    'Operator',
+    'Calls',
+    'Cum. time'
+  )]
+  last_component = None
+  for component, op_name, calls, cumulative in rows:
+    lines.append('{:<28s}{:<14s}{:>10d}{:>11.3f}s'.format(
+      component if component != last_component else '',
+      op_name,
+      calls,
+      cumulative
+    ))
+    last_component = component
+  return '\n'.join(lines)
+
+# vim: set ts=2 sw=2 expandtab:
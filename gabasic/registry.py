@@ -0,0 +1,71 @@
+"""Registry of the components that GA model INI files refer to by name.
+
+A component name without a package (e.g., ``BitString``) refers to one of the
+components of ``gabasic``; any other name (e.g., ``tictactoe.TicTacToeChromo``)
+is imported from the package it names. Every name resolved is cached, so a
+process running many models imports and looks each component up only once.
+"""
+import importlib
+
+
+_components = {}
+
+
+def register_component(name, component):
+  """Make a component available under a name.
+
+  Parameters
+  ----------
+  name : str
+    Name model INI files use for the component.
+  component : type
+    Component class.
+  """
+  _components[name] = component
+
+def known_components():
+  """Names of the components available without naming their package, along
+  with every name registered or resolved so far.
+
+  Returns
+  -------
+  list
+    Sorted component names.
+  """
+  from . import _EXPORTS
+  return sorted(set(_EXPORTS) | set(_components))
+
+def resolve_component(name):
+  """Obtain the component a model INI file refers to.
+
+  Parameters
+  ----------
+  name : str
+    Component name, optionally qualified with its package.
+
+  Returns
+  -------
+  type
+    Component class.
+
+  Raises
+  ------
+  ValueError
+    If no component has the name.
+  """
+  result = _components.get(name)
+  if result is None:
+    (module_name, _, symbol_name) = name.rpartition('.')
+    source_module = importlib.import_module(module_name or __package__)
+    result = getattr(source_module, symbol_name, None)
+    if result is None:
+      raise ValueError(
+        'Unknown component "{}"; known components: {}'.format(
+          name,
+          ', '.join(known_components())
+        )
+      )
+    _components[name] = result
+  return result
+
+# vim: set ts=2 sw=2 expandtab:
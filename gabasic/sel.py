@@ -1,5 +1,6 @@
 from deap import tools, base
 from . import ToolboxContributor
+from . import matrixops
 
 
 class TournamentSelection(ToolboxContributor):
@@ -14,6 +15,13 @@ class TournamentSelection(ToolboxContributor):
       tournsize=self.tournament_size
     )
 
+  def configure_matrix_toolbox(self, toolbox):
+    toolbox.register(
+      'select',
+      matrixops.sel_tournament_idx,
+      tournsize=self.tournament_size
+    )
+
 class ProportionalSelection(ToolboxContributor):
   def __init__(self, **kwargs):
     super(ProportionalSelection, self).__init__()
@@ -26,4 +34,7 @@ class ProportionalSelection(ToolboxContributor):
       fit_attr=self.fit_attr
     )
 
+  def configure_matrix_toolbox(self, toolbox):
+    toolbox.register('select', matrixops.sel_roulette_idx)
+
 # vim: set ts=2 sw=2 expandtab:
@@ -0,0 +1,475 @@
+"""Running a model many times, over several seeds and parameter values.
+
+Run with ``python -m gabasic.sweep <model INI> <sweep INI>``. The sweep INI
+file has the sections of a model INI file, each key holding the values to try,
+separated by commas; every combination of values (a point of the sweep) is
+run once per seed. An optional ``sweep`` section sets the number of seeds
+(``seeds``, 10 by default), the value the seeds are drawn from (``base_seed``,
+0 by default) and the number of runs at a time (``workers``, one per core by
+default)::
+
+  [sweep]
+  seeds=20
+
+  [GA]
+  population_size=50, 100, 200
+  mutation_probability=0.05, 0.1
+
+  [TournamentSelection]
+  tournament_size=2, 3
+
+Every point is run with the same seeds, and each run happens in a process of
+its own, forked from one where the model was already built once, so the
+results of a run never depend on the other runs, and data the components
+cache per process (such as the ``tictactoe`` state table) is only prepared
+once. The statistics of each generation are averaged over the seeds of each
+point, with 95% confidence intervals, and written to one metrics file (see
+``gabasic.metrics``).
+"""
+import os
+import sys
+import math
+import pickle
+import random
+import argparse
+import itertools
+import tempfile
+import traceback
+import warnings
+import collections
+import configparser
+import multiprocessing
+import multiprocessing.connection
+from .model import build_ga
+from .metrics import open_metrics_sink
+
+
+# Two-sided 95% critical values of Student's t distribution, by degrees of
+# freedom; the normal distribution's is used beyond the table.
+_T_95 = (
+  12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+  2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+  2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042
+)
+
+# Keys of the ``GA`` section that would make runs write over one another's
+# files.
+_RUN_KEYS_REMOVED = ('checkpoint_file', 'metrics_file', 'profile_file')
+
+
+def read_sweep(path):
+  """Read a sweep INI file.
+
+  Parameters
+  ----------
+  path : str
+    Location of the sweep INI file.
+
+  Returns
+  -------
+  tuple
+    Options of the ``sweep`` section (``dict``), and the values to try for
+    each key (``list`` of ``(section, key, values)`` tuples).
+  """
+  sweep_config = configparser.ConfigParser()
+  if not sweep_config.read(path):
+    raise ValueError('Cannot read sweep file "{}".'.format(path))
+  options = {}
+  if sweep_config.has_section('sweep'):
+    options = dict(sweep_config['sweep'].items())
+  parameters = []
+  for a_section in sweep_config.sections():
+    if a_section == 'sweep':
+      continue
+    for a_key, a_value in sweep_config[a_section].items():
+      values = [a_part.strip() for a_part in a_value.split(',')]
+      if not all(values):
+        raise ValueError(
+          'Empty value to try for "{}" in section "{}".'.format(
+            a_key,
+            a_section
+          )
+        )
+      parameters.append((a_section, a_key, values))
+  return options, parameters
+
+def parameter_name(section, key):
+  """Name of a swept parameter in results files: the key alone for the ``GA``
+  section, ``<section>.<key>`` otherwise.
+  """
+  return key if section == 'GA' else '{}.{}'.format(section, key)
+
+def sweep_points(parameters):
+  """Every combination of the values to try.
+
+  Parameters
+  ----------
+  parameters : list
+    Values to try for each key, as returned by py:func:: read_sweep.
+
+  Returns
+  -------
+  list
+    ``dict`` mapping each ``(section, key)`` pair to its value, for each
+    point, varying the last key fastest.
+  """
+  keys = [(a_section, a_key) for a_section, a_key, _ in parameters]
+  return [
+    dict(zip(keys, values)) for values in
+    itertools.product(*(values for _, _, values in parameters))
+  ]
+
+def run_seeds(base_seed, count):
+  """Seeds of the runs of each point, drawn deterministically from
+  ``base_seed``.
+  """
+  seed_rng = random.Random(base_seed)
+  return [seed_rng.getrandbits(32) for _ in range(count)]
+
+def _plain(value):
+  return value.item() if hasattr(value, 'item') else value
+
+def run_model(model, seed):
+  """Run a model once, without printing, and return its logbook records.
+
+  The run happens in a temporary working directory (models may write files
+  there), after the model is built in the current one.
+
+  Parameters
+  ----------
+  model : dict
+    Contents of the model INI file, by section.
+  seed : int
+    Seed of the run.
+
+  Returns
+  -------
+  list
+    Record of each generation, with plain Python values.
+  """
+  ini_config = configparser.ConfigParser()
+  ini_config.read_dict(model)
+  for a_key in _RUN_KEYS_REMOVED:
+    ini_config.remove_option('GA', a_key)
+  ini_config['GA']['seed'] = str(seed)
+  ini_config['GA']['print_every'] = '0'
+  with warnings.catch_warnings():
+    # Each run creates the model's ``deap.creator`` classes again.
+    warnings.simplefilter('ignore', RuntimeWarning)
+    ga = build_ga(ini_config)
+
+  cwd = os.getcwd()
+  with tempfile.TemporaryDirectory() as run_dir:
+    os.chdir(run_dir)
+    try:
+      (_, logbook) = ga.run()
+    finally:
+      os.chdir(cwd)
+  return [
+    {a_field: _plain(a_value) for a_field, a_value in a_record.items()}
+    for a_record in logbook
+  ]
+
+def _run_in_child(connection, model, seed):
+  try:
+    reply = ('ok', run_model(model, seed))
+  except Exception:
+    reply = ('error', traceback.format_exc())
+  connection.send_bytes(pickle.dumps(reply))
+  connection.close()
+
+def run_all(runs, workers):
+  """Run models, several at a time, each in a process of its own.
+
+  Processes are forked from the calling process, inheriting everything it
+  prepared. Unlike pool workers, they may start processes of their own (e.g.,
+  for models using ``workers`` or py:class:: IslandGa).
+
+  Parameters
+  ----------
+  runs : list
+    ``(model, seed)`` tuple for each run (see py:func:: run_model).
+  workers : int
+    Number of runs at a time.
+
+  Yields
+  ------
+  tuple
+    Index of a run in ``runs`` and its records, as each run finishes.
+  """
+  if workers < 1:
+    raise ValueError('At least one worker is required.')
+  if 'fork' in multiprocessing.get_all_start_methods():
+    context = multiprocessing.get_context('fork')
+  else:
+    context = multiprocessing.get_context()
+  pending = collections.deque(enumerate(runs))
+  running = {}
+  try:
+    while pending or running:
+      while pending and len(running) < workers:
+        (run_idx, (model, seed)) = pending.popleft()
+        (connection, child_connection) = context.Pipe(duplex=False)
+        process = context.Process(
+          target=_run_in_child,
+          args=(child_connection, model, seed)
+        )
+        process.start()
+        child_connection.close()
+        running[connection] = (run_idx, process)
+      for connection in multiprocessing.connection.wait(list(running)):
+        (run_idx, process) = running.pop(connection)
+        try:
+          (outcome, payload) = pickle.loads(connection.recv_bytes())
+        except EOFError:
+          (outcome, payload) = ('error', 'Run process exited unexpectedly.')
+        connection.close()
+        process.join()
+        if outcome == 'error':
+          raise RuntimeError('Run {} failed:\n{}'.format(run_idx, payload))
+        yield run_idx, payload
+  finally:
+    for connection, (_, process) in running.items():
+      process.terminate()
+      process.join()
+      connection.close()
+
+def _confidence_interval(values):
+  if len(values) < 2:
+    return None
+  t_value = _T_95[len(values) - 2] if len(values) - 2 < len(_T_95) else 1.96
+  mean = math.fsum(values) / len(values)
+  variance = math.fsum((a_value - mean) ** 2 for a_value in values) / (
+    len(values) - 1
+  )
+  return t_value * math.sqrt(variance / len(values))
+
+def aggregate(run_records):
+  """Average the statistics of each generation over several runs.
+
+  Parameters
+  ----------
+  run_records : list
+    Records of each run (see py:func:: run_model). Runs may have stopped
+    after different generations.
+
+  Returns
+  -------
+  list
+    One record per generation, with the number of runs that reached it
+    (``runs``), and the mean (``<field>_mean``) and 95% confidence interval
+    half-width (``<field>_ci95``, None with fewer than two runs) of each
+    numeric field.
+  """
+  by_gen = collections.defaultdict(list)
+  for records in run_records:
+    for a_record in records:
+      by_gen[a_record['gen']].append(a_record)
+  result = []
+  for gen in sorted(by_gen):
+    records = by_gen[gen]
+    summary = {'gen': gen, 'runs': len(records)}
+    for a_field in numeric_fields(records):
+      values = [
+        float(a_record[a_field]) for a_record in records
+        if a_field in a_record
+      ]
+      summary[a_field + '_mean'] = math.fsum(values) / len(values)
+      summary[a_field + '_ci95'] = _confidence_interval(values)
+    result.append(summary)
+  return result
+
+def numeric_fields(records):
+  """Fields holding numbers in any of the records, other than ``gen``, in
+  order of appearance.
+  """
+  result = []
+  for a_record in records:
+    for a_field, a_value in a_record.items():
+      if (
+        a_field != 'gen' and
+        a_field not in result and
+        isinstance(a_value, (int, float)) and
+        not isinstance(a_value, bool)
+      ):
+        result.append(a_field)
+  return result
+
+def run_sweep(
+  model_ini,
+  sweep_ini,
+  output_path,
+  workers=None,
+  seeds=None,
+  base_seed=None
+):
+  """Run every point of a sweep with every seed, and write the aggregated
+  statistics of each point to a metrics file.
+
+  Parameters
+  ----------
+  model_ini : str
+    Location of the base model INI file.
+  sweep_ini : str
+    Location of the sweep INI file.
+  output_path : str
+    Location of the results file; CSV if named ``*.csv``, JSON Lines
+    otherwise.
+  workers, seeds, base_seed : int or None
+    Override the options of the ``sweep`` section.
+
+  Returns
+  -------
+  list
+    ``(point, records)`` for each point, ``records`` being the aggregated
+    records (see py:func:: aggregate).
+  """
+  (options, parameters) = read_sweep(sweep_ini)
+  if workers is None:
+    workers = int(options.get('workers', os.cpu_count() or 1))
+  if seeds is None:
+    seeds = int(options.get('seeds', '10'))
+  if base_seed is None:
+    base_seed = int(options.get('base_seed', '0'))
+
+  base_config = configparser.ConfigParser()
+  if not base_config.read(model_ini):
+    raise ValueError('Cannot read model file "{}".'.format(model_ini))
+  base_model = {
+    a_section: dict(base_config[a_section].items())
+    for a_section in base_config.sections()
+  }
+  points = sweep_points(parameters)
+  for a_point in points:
+    for (a_section, a_key) in a_point:
+      if a_section not in base_model:
+        raise ValueError(
+          'Section "{}" of the sweep is not in the model.'.format(a_section)
+        )
+
+  # Building the model once here has the components prepare (and cache) what
+  # every run shares, before the runs are forked.
+  with warnings.catch_warnings():
+    warnings.simplefilter('ignore', RuntimeWarning)
+    build_ga(base_config)
+
+  runs = []
+  for a_point in points:
+    model = {
+      a_section: dict(a_section_config)
+      for a_section, a_section_config in base_model.items()
+    }
+    for (a_section, a_key), a_value in a_point.items():
+      model[a_section][a_key] = a_value
+    for a_seed in run_seeds(base_seed, seeds):
+      runs.append((model, a_seed))
+
+  run_records = [None] * len(runs)
+  for done_count, (run_idx, records) in enumerate(
+    run_all(runs, workers),
+    start=1
+  ):
+    run_records[run_idx] = records
+    print('Run {}/{} done: point {}, seed {}, {} generations'.format(
+      done_count,
+      len(runs),
+      run_idx // seeds,
+      runs[run_idx][1],
+      len(records)
+    ), flush=True)
+
+  result = []
+  for point_idx, a_point in enumerate(points):
+    result.append((
+      a_point,
+      aggregate(run_records[point_idx * seeds:(point_idx + 1) * seeds])
+    ))
+  _write_results(output_path, result)
+  return result
+
+def _write_results(output_path, point_results):
+  param_fields = []
+  record_fields = []
+  for a_point, records in point_results:
+    for a_section, a_key in a_point:
+      a_name = parameter_name(a_section, a_key)
+      if a_name not in param_fields:
+        param_fields.append(a_name)
+    for a_record in records:
+      for a_field in a_record:
+        if a_field not in record_fields:
+          record_fields.append(a_field)
+  with open_metrics_sink(
+    output_path,
+    ['point'] + param_fields + record_fields
+  ) as results_sink:
+    for point_idx, (a_point, records) in enumerate(point_results):
+      point_values = {
+        parameter_name(a_section, a_key): a_value
+        for (a_section, a_key), a_value in a_point.items()
+      }
+      for a_record in records:
+        results_sink.write(dict(a_record, point=point_idx, **point_values))
+
+def main(argv):
+  arg_parser = argparse.ArgumentParser(prog='gabasic.sweep')
+  arg_parser.add_argument('model_ini', help='base GA model configuration INI')
+  arg_parser.add_argument(
+    'sweep_ini',
+    help='INI with the values to try for each key'
+  )
+  arg_parser.add_argument(
+    '-o',
+    '--output',
+    metavar='FILE',
+    default='sweep.csv',
+    help='results file (CSV if named *.csv, JSON Lines otherwise; '
+      'default: sweep.csv)'
+  )
+  arg_parser.add_argument(
+    '--workers',
+    type=int,
+    help='number of runs at a time (default: one per core)'
+  )
+  arg_parser.add_argument(
+    '--seeds',
+    type=int,
+    help='number of seeds each point is run with (default: 10)'
+  )
+  arg_parser.add_argument(
+    '--base-seed',
+    type=int,
+    help='value the seeds of the runs are drawn from (default: 0)'
+  )
+  args = arg_parser.parse_args(argv)
+
+  point_results = run_sweep(
+    args.model_ini,
+    args.sweep_ini,
+    args.output,
+    args.workers,
+    args.seeds,
+    args.base_seed
+  )
+  print()
+  for point_idx, (a_point, records) in enumerate(point_results):
+    final = records[-1]
+    print('Point {} ({}): generation {} ({} runs), max {:.4g} +/- {}'.format(
+      point_idx,
+      ', '.join(
+        '{}={}'.format(parameter_name(a_section, a_key), a_value)
+        for (a_section, a_key), a_value in a_point.items()
+      ),
+      final['gen'],
+      final['runs'],
+      final.get('max_mean', float('nan')),
+      'n/a' if final.get('max_ci95') is None
+      else '{:.4g}'.format(final['max_ci95'])
+    ))
+  print('Results written to {}'.format(args.output))
+  return 0
+
+if __name__ == '__main__':
+  sys.exit(main(sys.argv[1:]))
+
+# vim: set ts=2 sw=2 expandtab:
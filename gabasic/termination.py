@@ -0,0 +1,237 @@
+"""Stopping GA runs before their last generation.
+
+A run may be given any of these criteria, each configured by the ``GA``
+section key of the same name: ``target_fitness`` (the best fitness found
+reaches the value given), ``stagnation`` (the best fitness found has not
+improved for the number of generations given), ``time_budget`` (the run has
+taken the number of seconds given) and ``evaluation_budget`` (the run has
+evaluated the number of individuals given). The run stops as soon as the
+``stop_when`` key, an expression combining criterion names with ``and``,
+``or`` and parentheses, holds (e.g., ``target_fitness or (stagnation and
+time_budget)``); without ``stop_when``, as soon as any criterion is met.
+"""
+import ast
+import time
+
+
+class TargetFitness(object):
+  """Met once the best fitness found reaches a target.
+
+  Only the first objective is considered, and "reaching" follows its weight:
+  the best fitness must be at least the target when maximizing, and at most
+  the target when minimizing.
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
+  def __init__(self, target):
+    super(TargetFitness, self).__init__()
+    self.target = float(target)
+
+  def is_met(self, progress):
+    if progress.best is None:
+      return False
+    weight = progress.best.weights[0]
+    return progress.best.wvalues[0] >= self.target * weight
+
+
+class Stagnation(object):
+  """Met once the best fitness found has not improved for a number of
+  generations.
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
+  def __init__(self, generations):
+    super(Stagnation, self).__init__()
+    self.generations = int(generations)
+    if self.generations < 1:
+      raise ValueError('Stagnation must span at least one generation.')
+
+  def is_met(self, progress):
+    return progress.generation - progress.improved_generation >= (
+      self.generations
+    )
+
+
+class TimeBudget(object):
+  """Met once the run has taken a number of seconds.
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
+  def __init__(self, seconds):
+    super(TimeBudget, self).__init__()
+    self.seconds = float(seconds)
+
+  def is_met(self, progress):
+    return progress.elapsed() >= self.seconds
+
+
+class EvaluationBudget(object):
+  """Met once the run has evaluated a number of individuals.
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
+  def __init__(self, evaluations):
+    super(EvaluationBudget, self).__init__()
+    self.evaluations = int(evaluations)
+
+  def is_met(self, progress):
+    return progress.evaluations >= self.evaluations
+
+
+# Criterion created for each key of the ``GA`` section, in the order their
+# names are reported.
+CRITERIA = {
+  'target_fitness': TargetFitness,
+  'stagnation': Stagnation,
+  'time_budget': TimeBudget,
+  'evaluation_budget': EvaluationBudget
+}
+
+
+def _compile_condition(expression, criterion_names):
+  """Turn a ``stop_when`` expression into a function telling whether it
+  holds for a set of criteria met.
+  """
+  try:
+    tree = ast.parse(expression.strip(), mode='eval').body
+  except SyntaxError as exc:
+    raise ValueError(
+      'Invalid stop_when expression "{}": {}'.format(expression, exc.msg)
+    )
+
+  def compile_node(node):
+    if isinstance(node, ast.BoolOp):
+      operands = [compile_node(a_value) for a_value in node.values]
+      combine = all if isinstance(node.op, ast.And) else any
+      return lambda met: combine(an_operand(met) for an_operand in operands)
+    if isinstance(node, ast.Name):
+      if node.id not in criterion_names:
+        raise ValueError(
+          'stop_when refers to "{}", which is not configured; configured '
+          'criteria: {}'.format(node.id, ', '.join(criterion_names))
+        )
+      return lambda met: node.id in met
+    raise ValueError(
+      'stop_when may only combine criterion names with "and" and "or".'
+    )
+
+  return compile_node(tree)
+
+
+class Termination(object):
+  """Progress of a run, checked against its termination criteria after each
+  generation.
+
+  Attributes
+  ----------
+  criteria : dict
+    Criterion by name.
+  generation : int
+    Last generation checked.
+  evaluations : int
+    Individuals evaluated so far.
+  best : deap.base.Fitness or None
+    Best fitness found so far.
+  improved_generation : int
+    Generation in which the best fitness last improved.
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
+  def __init__(self, criteria, stop_when=None):
+    super(Termination, self).__init__()
+    if not criteria:
+      raise ValueError('At least one termination criterion is required.')
+    self.criteria = dict(criteria)
+    if stop_when is None:
+      stop_when = ' or '.join(self.criteria)
+    self.stop_when = stop_when
+    self._condition = _compile_condition(stop_when, list(self.criteria))
+    self.generation = 0
+    self.evaluations = 0
+    self.best = None
+    self.improved_generation = 0
+    self._elapsed = 0.0
+    self._start_time = time.perf_counter()
+
+  def start(self):
+    """Start counting the time taken by the run (again, when resuming)."""
+    self._start_time = time.perf_counter()
+
+  def elapsed(self):
+    """Seconds taken by the run so far, across resumes."""
+    return self._elapsed + time.perf_counter() - self._start_time
+
+  def checkpoint_state(self):
+    return {
+      'generation': self.generation,
+      'evaluations': self.evaluations,
+      'best': self.best,
+      'improved_generation': self.improved_generation,
+      'elapsed': self.elapsed()
+    }
+
+  def restore_checkpoint_state(self, state):
+    self.generation = state['generation']
+    self.evaluations = state['evaluations']
+    self.best = state['best']
+    self.improved_generation = state['improved_generation']
+    self._elapsed = state['elapsed']
+    self._start_time = time.perf_counter()
+
+  def update(self, generation, nevals, best):
+    """Account for a generation, and check the criteria.
+
+    Parameters
+    ----------
+    generation : int
+      Generation that just ended.
+    nevals : int
+      Number of individuals evaluated since the previous update.
+    best : deap.base.Fitness
+      Best fitness found so far.
+
+    Returns
+    -------
+    str or None
+      Names of the criteria met, separated by commas, if the run must stop;
+      None otherwise.
+    """
+    self.generation = generation
+    self.evaluations += nevals
+    if self.best is None or best > self.best:
+      self.best = best.__class__(best.values)
+      self.improved_generation = generation
+    met = [
+      a_name for a_name, a_criterion in self.criteria.items()
+      if a_criterion.is_met(self)
+    ]
+    if self._condition(set(met)):
+      return ','.join(met)
+    return None
+
+
+def create_termination(**kwargs):
+  """Create the termination criteria configured by the keys of a ``GA``
+  section.
+
+  Returns
+  -------
+  Termination or None
+    Criteria to check, or None if no criterion is configured.
+  """
+  criteria = {
+    a_name: a_criterion_cls(kwargs[a_name])
+    for a_name, a_criterion_cls in CRITERIA.items() if a_name in kwargs
+  }
+  if not criteria:
+    if 'stop_when' in kwargs:
+      raise ValueError('stop_when requires at least one criterion.')
+    return None
+  return Termination(criteria, kwargs.get('stop_when'))
+
+# vim: set ts=2 sw=2 expandtab:
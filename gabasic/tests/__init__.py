@@ -1,3 +1,20 @@
-from .gaops_test import OnePointMappingCrossoverTest
+from .gaops_test import (
+  MappingCrossoverTest,
+  ArrayCrossoverTest
+)
+from .parallel_test import ProcessPoolMapTest
+from .matrixops_test import MatrixOpsTest
+from .algo_test import MatrixGaTest
+from .packedops_test import PackedBitStringTest
+from .indivs_test import ChunkedMappingTest, CloneTest
+from .checkpoint_test import CheckpointTest
+from .metrics_test import MetricsSinkTest, SimpleGaMetricsTest
+from .registry_test import ComponentRegistryTest
+from .bench_test import BenchTest
+from .profiling_test import OperatorTimerTest
+from .fitcache_test import FitnessCacheTest
+from .island_test import IslandGaTest
+from .termination_test import TerminationTest
+from .sweep_test import SweepTest
 
 # vim: set ts=2 sw=2 expandtab:
@@ -0,0 +1,93 @@
+import random
+import unittest
+import numpy as np
+from deap import creator
+from gabasic import (
+  FitnessMax,
+  BitString,
+  SumItems,
+  TournamentSelection,
+  TwoPointCrossover,
+  FlipBitMutation,
+  OnePointMappingCrossover,
+  TwoPointMappingCrossover,
+  UniformMappingCrossover,
+  OnePointArrayCrossover,
+  TwoPointArrayCrossover,
+  UniformArrayCrossover,
+  MatrixGa
+)
+
+
+class MatrixGaTest(unittest.TestCase):
+  def setUp(self):
+    FitnessMax()
+    self.mods = [
+      SumItems(),
+      BitString('FitnessMax', bitstring_size='40'),
+      TournamentSelection(tournament_size='3'),
+      TwoPointCrossover(),
+      FlipBitMutation()
+    ]
+    self.config = {
+      'population_size': '60',
+      'max_generation_count': '15',
+      'fitness_type': 'FitnessMax',
+      'seed': '2048'
+    }
+
+  def tearDown(self):
+    del creator.FitnessMax
+    del creator.BitString
+
+  def test_run(self):
+    uut = MatrixGa(self.mods, **self.config)
+    (population, logbook) = uut.run()
+    self.assertEqual((60, 40), population.shape)
+    self.assertEqual(
+      ['gen', 'nevals', 'avg', 'std', 'min', 'max'],
+      logbook.header
+    )
+    self.assertEqual(list(range(16)), logbook.select('gen'))
+    self.assertEqual(60, logbook[0]['nevals'])
+    self.assertGreater(logbook[-1]['avg'], logbook[0]['avg'])
+    best = uut.hof[0]
+    self.assertTrue(isinstance(best, creator.BitString))
+    self.assertEqual((float(sum(best)),), best.fitness.values)
+    self.assertEqual(max(logbook.select('max')), best.fitness.values[0])
+
+  def test_repeatable(self):
+    (population, logbook) = MatrixGa(self.mods, **self.config).run()
+    random.seed(1)
+    (population_again, logbook_again) = MatrixGa(
+      self.mods,
+      **self.config
+    ).run()
+    self.assertTrue(np.array_equal(population, population_again))
+    self.assertEqual(logbook.select('avg'), logbook_again.select('avg'))
+
+  def test_array_crossovers(self):
+    for a_crossover in (
+      OnePointArrayCrossover(),
+      TwoPointArrayCrossover(),
+      UniformArrayCrossover()
+    ):
+      self.mods[3] = a_crossover
+      (population, logbook) = MatrixGa(self.mods, **self.config).run()
+      self.assertEqual((60, 40), population.shape)
+      self.assertGreater(logbook[-1]['avg'], logbook[0]['avg'])
+
+  def test_unsupported_component(self):
+    for a_crossover in (
+      OnePointMappingCrossover(),
+      TwoPointMappingCrossover(),
+      UniformMappingCrossover()
+    ):
+      self.mods[3] = a_crossover
+      with self.assertRaises(NotImplementedError):
+        MatrixGa(self.mods, **self.config)
+
+if __name__ == '__main__':
+  unittest.main()
+
+# vim: set ts=2 sw=2 expandtab:
@@ -0,0 +1,43 @@
+import unittest
+from gabasic.bench import (
+  PER_SECOND,
+  SECONDS,
+  parse_importtime,
+  compare_results
+)
+
+
+class BenchTest(unittest.TestCase):
+  def test_parse_importtime(self):
+    report = '\n'.join([
+      'import time: self [us] | cumulative | imported package',
+      'import time:       120 |        120 |   configparser',
+      'import time:       287 |        407 | gabasic'
+    ])
+    self.assertEqual(
+      [('  configparser', 120, 120), ('gabasic', 287, 407)],
+      parse_importtime(report)
+    )
+
+  def test_compare_results(self):
+    baseline = {'results': {
+      'mates': {'value': 100.0, 'unit': PER_SECOND},
+      'evals': {'value': 100.0, 'unit': PER_SECOND},
+      'startup': {'value': 1.0, 'unit': SECONDS},
+      'removed': {'value': 1.0, 'unit': SECONDS}
+    }}
+    current = {'results': {
+      'mates': {'value': 50.0, 'unit': PER_SECOND},
+      'evals': {'value': 95.0, 'unit': PER_SECOND},
+      'startup': {'value': 2.0, 'unit': SECONDS},
+      'added': {'value': 1.0, 'unit': SECONDS}
+    }}
+    comparison = compare_results(baseline, current, tolerance=0.1)
+    self.assertEqual(
+      [('mates', True), ('evals', False), ('startup', True)],
+      [(a_row[0], a_row[4]) for a_row in comparison]
+    )
+    for expected, a_row in zip([-0.5, -0.05, -0.5], comparison):
+      self.assertAlmostEqual(expected, a_row[3])
+
+# vim: set ts=2 sw=2 expandtab:
@@ -0,0 +1,105 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from deap import creator
+from gabasic import (
+  FitnessMax,
+  BitString,
+  SumItems,
+  TournamentSelection,
+  TwoPointCrossover,
+  FlipBitMutation,
+  SimpleGa,
+  MatrixGa
+)
+from gabasic.checkpoint import (
+  write_checkpoint,
+  read_checkpoint,
+  read_checkpoint_header
+)
+
+
+class CheckpointTest(unittest.TestCase):
+  def setUp(self):
+    FitnessMax()
+    self.mods = [
+      SumItems(),
+      BitString('FitnessMax', bitstring_size='40'),
+      TournamentSelection(tournament_size='3'),
+      TwoPointCrossover(),
+      FlipBitMutation()
+    ]
+    self.config = {
+      'population_size': '30',
+      'max_generation_count': '6',
+      'fitness_type': 'FitnessMax',
+      'seed': '512'
+    }
+    self.tmp_dir = tempfile.mkdtemp()
+    self.checkpoint_path = os.path.join(self.tmp_dir, 'run.ckpt')
+
+  def tearDown(self):
+    shutil.rmtree(self.tmp_dir)
+    del creator.FitnessMax
+    del creator.BitString
+
+  def _interrupted_config(self):
+    config = dict(self.config)
+    config.update(
+      max_generation_count='4',
+      checkpoint_file=self.checkpoint_path,
+      checkpoint_every='2'
+    )
+    return config
+
+  def test_resume_matches_uninterrupted_run(self):
+    uninterrupted = SimpleGa(self.mods, **self.config)
+    (population, logbook) = uninterrupted.run()
+
+    interrupted = SimpleGa(self.mods, **self._interrupted_config())
+    interrupted.model_config = {'GA': self.config}
+    interrupted.run()
+    self.assertEqual(
+      {'generation': 4, 'model': {'GA': self.config}},
+      read_checkpoint_header(self.checkpoint_path)
+    )
+
+    resumed = SimpleGa(self.mods, **self.config)
+    (resumed_population, resumed_logbook) = resumed.run(
+      read_checkpoint(self.checkpoint_path)
+    )
+    self.assertEqual(list(logbook), list(resumed_logbook))
+    self.assertEqual(population, resumed_population)
+    self.assertTrue(
+      all(isinstance(ind, creator.BitString) for ind in resumed_population)
+    )
+    self.assertEqual(uninterrupted.hof[0], resumed.hof[0])
+
+  def test_matrix_resume_matches_uninterrupted_run(self):
+    (population, logbook) = MatrixGa(self.mods, **self.config).run()
+    MatrixGa(self.mods, **self._interrupted_config()).run()
+    (resumed_population, resumed_logbook) = MatrixGa(
+      self.mods,
+      **self.config
+    ).run(read_checkpoint(self.checkpoint_path))
+    self.assertEqual(list(logbook), list(resumed_logbook))
+    self.assertTrue(np.array_equal(population, resumed_population))
+
+  def test_failed_write_keeps_previous_checkpoint(self):
+    write_checkpoint(self.checkpoint_path, {'generation': 1}, {'value': 1})
+    with self.assertRaises(Exception):
+      write_checkpoint(
+        self.checkpoint_path,
+        {'generation': 2},
+        {'value': lambda: None}
+      )
+    self.assertEqual(['run.ckpt'], os.listdir(self.tmp_dir))
+    self.assertEqual(
+      {'generation': 1},
+      read_checkpoint_header(self.checkpoint_path)
+    )
+    self.assertEqual({'value': 1}, read_checkpoint(self.checkpoint_path))
+
+# vim: set ts=2 sw=2 expandtab:
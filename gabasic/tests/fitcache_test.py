@@ -0,0 +1,122 @@
+import unittest
+from deap import creator
+from gabasic import (
+  FitnessMax,
+  BitString,
+  SumItems,
+  TournamentSelection,
+  TwoPointCrossover,
+  FlipBitMutation,
+  SimpleGa
+)
+from gabasic.fitcache import FitnessCache, genotype_key
+
+
+class FitnessCacheTest(unittest.TestCase):
+  def setUp(self):
+    FitnessMax()
+    self.mods = [
+      SumItems(),
+      BitString('FitnessMax', bitstring_size='20'),
+      TournamentSelection(tournament_size='3'),
+      TwoPointCrossover(),
+      FlipBitMutation()
+    ]
+    self.config = {
+      'population_size': '20',
+      'max_generation_count': '5',
+      'seed': '32',
+      'print_every': '0'
+    }
+    self.evaluated = []
+
+  def tearDown(self):
+    del creator.FitnessMax
+    del creator.BitString
+
+  def _individual(self, bits):
+    return creator.BitString(bits)
+
+  def _evaluate(self, individual):
+    self.evaluated.append(genotype_key(individual))
+    return (float(sum(individual)),)
+
+  def test_hits_and_duplicates(self):
+    uut = FitnessCache(10)
+    population = [
+      self._individual([1, 0, 1]),
+      self._individual([1, 0, 1]),
+      self._individual([0, 0, 1])
+    ]
+    self.assertEqual(2, uut.evaluate(population, self._evaluate))
+    self.assertEqual(
+      [(2.0,), (2.0,), (1.0,)],
+      [an_ind.fitness.values for an_ind in population]
+    )
+    self.assertEqual(
+      {'cache_hits': 0, 'cache_dups': 1, 'cache_hit_rate': 1.0 / 3.0},
+      uut.lap()
+    )
+
+    again = [self._individual([0, 0, 1])]
+    self.assertEqual(0, uut.evaluate(again, self._evaluate))
+    self.assertEqual((1.0,), again[0].fitness.values)
+    self.assertEqual(
+      {'cache_hits': 1, 'cache_dups': 0, 'cache_hit_rate': 1.0},
+      uut.lap()
+    )
+    self.assertEqual(2, len(self.evaluated))
+
+  def test_lru_eviction(self):
+    uut = FitnessCache(2)
+    genotypes = ([1, 0], [0, 1], [1, 0], [1, 1], [0, 1])
+    for bits in genotypes:
+      uut.evaluate([self._individual(bits)], self._evaluate)
+    # [0, 1] was the least recently used when [1, 1] was added.
+    self.assertEqual(
+      [genotype_key(self._individual(bits)) for bits in genotypes[:2]] +
+      [genotype_key(self._individual(bits)) for bits in genotypes[3:]],
+      self.evaluated
+    )
+    self.assertEqual(2, len(uut))
+
+  def test_evaluation_changes_genotype(self):
+    def grow(individual):
+      individual.append(1)
+      return self._evaluate(individual)
+
+    uut = FitnessCache(10)
+    population = [self._individual([1, 0]), self._individual([1, 0])]
+    self.assertEqual(2, uut.evaluate(population, grow))
+    self.assertEqual(
+      [[1, 0, 1], [1, 0, 1]],
+      [list(an_ind) for an_ind in population]
+    )
+    self.assertEqual(0, uut.lap()['cache_dups'])
+    # Only the grown genotype is cached.
+    self.assertEqual(
+      1,
+      uut.evaluate([self._individual([1, 0, 1])], self._evaluate)
+      + uut.evaluate([self._individual([1, 0])], self._evaluate)
+    )
+
+  def test_simple_ga(self):
+    (population, logbook) = SimpleGa(self.mods, **self.config).run()
+    (cached_population, cached_logbook) = SimpleGa(
+      self.mods,
+      fitness_cache_size='100',
+      **self.config
+    ).run()
+    self.assertEqual(population, cached_population)
+    self.assertEqual(logbook.select('max'), cached_logbook.select('max'))
+    self.assertEqual(logbook.select('nevals'), cached_logbook.select('nevals'))
+    self.assertNotIn('cache_hits', logbook.header)
+    self.assertEqual(0, cached_logbook[0]['cache_hits'])
+    self.assertGreater(sum(cached_logbook.select('cache_hits')), 0)
+    for a_record in cached_logbook:
+      self.assertLessEqual(
+        a_record['cache_hits'] + a_record['cache_dups'],
+        a_record['nevals']
+      )
+
+# vim: set ts=2 sw=2 expandtab:
@@ -1,94 +1,134 @@
+import random
 import unittest
-from gabasic import OnePointMappingCrossover
-
-
-class OnePointMappingCrossoverTest(unittest.TestCase):
-  def test_mapping_keys_to_tuples(self):
-    sample_1 = {
-      (1, 0): 'Hello',
-      (1, 1): 'There',
-      (2, 0): 'People'
-    }
-    expected_value = [
-      (1, (1, 0)),
-      (1, (1, 1)),
-      (1, (2, 0))
-    ]
-    actual_value = OnePointMappingCrossover.mapping_keys_to_tuples(1, sample_1)
-    self.assertEqual(expected_value, actual_value)
-
-  def test_mapping_deep_copy(self):
-    sample_1 = {
-      (1, 0): 'Hello',
-      (1, 1): 'There',
-      (2, 0): 'People'
-    }
-    the_copy = OnePointMappingCrossover.mapping_deep_copy(sample_1)
-    sample_1[(1, 0)] = 'HELLO'
-    self.assertEqual('HELLO', sample_1[(1, 0)])
-    self.assertEqual('Hello', the_copy[(1, 0)])
-
-  def test_blend_mapping_using_tuples(self):
-    sample_1 = {
-      (1, 0): 'Hello',
-      (1, 1): 'There',
-      (2, 0): 'People'
-    }
-    sample_2 = {
-      (1, 1): 'To',
-      (2, 0): 'The',
-      (1, 0): 'Victor',
-      (2, 1): 'Go',
-      (1, 2): 'The',
-      (2, 2): 'Spoils'
-    }
-    src_keys_1 = [
-      (1, (1, 0)),
-      (1, (1, 1)),
-      (1, (2, 0))
-    ]
-    src_keys_2 = [
-      (2, (1, 1)),
-      (2, (2, 0)),
-      (2, (1, 0)),
-      (2, (2, 1)),
-      (2, (1, 2)),
-      (2, (2, 2))
-    ]
-    # Mimic a cross-over at key tuple index 2
-    keys_1 = [
-      src_keys_1[0],       # (1, 0)
-      src_keys_1[1],       # (1, 1)
-      src_keys_2[2],       # (1, 0) -> Collision
-      src_keys_2[3],       # (2, 1)
-      src_keys_2[4],       # (1, 2)
-      src_keys_2[5]        # (2, 2)
-    ]
-    keys_2 = [
-      src_keys_2[0],       # (1, 1)
-      src_keys_2[1],       # (2, 0)
-      src_keys_1[2]        # (2, 0) -> Collision
-    ]
-    # (1,0) and (2,0) key collisions should be resolved in favor of later item
-    # in key array
-    expected_1 = {
-      (1, 1): 'There',
-      (1, 0): 'Victor',
-      (2, 1): 'Go',
-      (1, 2): 'The',
-      (2, 2): 'Spoils'
-    }
-    expected_2 = {
-      (1, 1): 'To',
-      (2, 0): 'People'
-    }
-    OnePointMappingCrossover.blend_mappings_using_tuples(
-      sample_1,
-      sample_2,
-      keys_1,
-      keys_2
+import numpy as np
+from gabasic import (
+  OnePointMappingCrossover,
+  TwoPointMappingCrossover,
+  UniformMappingCrossover,
+  OnePointArrayCrossover,
+  TwoPointArrayCrossover,
+  UniformArrayCrossover
+)
+
+
+class Policy(dict):
+  pass
+
+class MappingCrossoverTest(unittest.TestCase):
+  def setUp(self):
+    random.seed(2048)
+
+  def parents(self):
+    # Keys 0-29 in the first parent, 10-39 in the second.
+    return (
+      Policy((a_key, 'a{}'.format(a_key)) for a_key in range(29, -1, -1)),
+      Policy((a_key, 'b{}'.format(a_key)) for a_key in range(10, 40))
+    )
+
+  def check_crossover(self, uut):
+    (ind1, ind2) = self.parents()
+    (child1, child2) = uut(ind1, ind2)
+    self.assertIs(ind1, child1)
+    self.assertIs(ind2, child2)
+    self.assertEqual(sorted(child1), child1.sorted_keys)
+    self.assertEqual(sorted(child2), child2.sorted_keys)
+    # Every gene of the parents ends up in exactly one child.
+    (parent1, parent2) = self.parents()
+    self.assertEqual(
+      sorted(list(parent1.values()) + list(parent2.values())),
+      sorted(list(child1.values()) + list(child2.values()))
     )
-    self.assertEqual(expected_1, sample_1)
-    self.assertEqual(expected_2, sample_2)
+    for a_child in (child1, child2):
+      for a_key, a_value in a_child.items():
+        self.assertEqual(a_key, int(a_value[1:]))
+    self.assertNotEqual(parent1, child1)
+    # Deterministic for a given seed.
+    random.seed(2048)
+    (ind1, ind2) = self.parents()
+    uut(ind1, ind2)
+    self.assertEqual((child1, child2), (ind1, ind2))
+    return [a_key for a_key in sorted(child1) if child1[a_key][0] == 'b']
+
+  def test_one_point(self):
+    exchanged = self.check_crossover(OnePointMappingCrossover())
+    self.assertEqual(list(range(exchanged[0], 40)), exchanged)
+
+  def test_two_point(self):
+    exchanged = self.check_crossover(TwoPointMappingCrossover())
+    self.assertEqual(list(range(exchanged[0], exchanged[-1] + 1)), exchanged)
+
+  def test_uniform(self):
+    self.check_crossover(UniformMappingCrossover())
+
+  def test_plain_dict(self):
+    ind1 = {a_key: 1 for a_key in range(10)}
+    ind2 = {a_key: 2 for a_key in range(10)}
+    OnePointMappingCrossover()(ind1, ind2)
+    self.assertEqual(1, ind1[0])
+    self.assertEqual(2, ind1[9])
+
+  def test_keys_added(self):
+    (ind1, ind2) = self.parents()
+    uut = TwoPointMappingCrossover()
+    uut(ind1, ind2)
+    ind1[50] = 'a50'
+    uut(ind1, ind2)
+    self.assertEqual(sorted(ind1), ind1.sorted_keys)
+    self.assertEqual(sorted(ind2), ind2.sorted_keys)
+
+  def test_keys_replaced(self):
+    (ind1, ind2) = self.parents()
+    uut = TwoPointMappingCrossover()
+    uut(ind1, ind2)
+    # As many keys as before, but not the same ones.
+    removed_key = ind1.sorted_keys[0]
+    ind1[50] = 'a50'
+    del ind1[removed_key]
+    uut(ind1, ind2)
+    self.assertEqual(sorted(ind1), ind1.sorted_keys)
+    self.assertEqual(sorted(ind2), ind2.sorted_keys)
+    self.assertNotIn(removed_key, ind1.sorted_keys + ind2.sorted_keys)
+
+  def test_non_mapping(self):
+    with self.assertRaises(TypeError):
+      UniformMappingCrossover()([1, 2], {})
+
+class ArrayCrossoverTest(unittest.TestCase):
+  def setUp(self):
+    random.seed(2048)
+    np.random.seed(2048)
+
+  def check_crossover(self, uut):
+    ind1 = np.arange(20)
+    ind2 = np.arange(100, 120)
+    (child1, child2) = uut(ind1, ind2)
+    self.assertIs(ind1, child1)
+    self.assertIs(ind2, child2)
+    # Every position keeps one item from each parent
+    self.assertTrue(np.array_equal(
+      np.sort(np.stack([child1, child2]), axis=0),
+      np.stack([np.arange(20), np.arange(100, 120)])
+    ))
+    self.assertTrue(np.any(child1 >= 100))
+    self.assertTrue(np.any(child1 < 100))
+    return child1 >= 100
+
+  def test_one_point(self):
+    exchanged = self.check_crossover(OnePointArrayCrossover())
+    self.assertFalse(exchanged[0])
+    self.assertTrue(exchanged[-1])
+    self.assertTrue(np.all(np.diff(exchanged.astype(int)) >= 0))
+
+  def test_two_point(self):
+    exchanged = self.check_crossover(TwoPointArrayCrossover())
+    self.assertFalse(exchanged[0])
+    self.assertGreaterEqual(2, np.count_nonzero(np.diff(exchanged.astype(int))))
+
+  def test_uniform(self):
+    self.check_crossover(UniformArrayCrossover())
+
+  def test_non_array(self):
+    with self.assertRaises(TypeError):
+      OnePointArrayCrossover()([1, 2], np.zeros(2))
 
 # vim: set ts=2 sw=2 expandtab:
@@ -0,0 +1,140 @@
+import copy
+import pickle
+import unittest
+import collections
+from deap import base, creator
+from gabasic import ChunkedMapping, FitnessMax, BitString, PackedBitString
+from gabasic.checkpoint import dumps_state
+
+
+class ChunkedMappingTest(unittest.TestCase):
+  def setUp(self):
+    creator.create('FitnessMax', base.Fitness, weights=(1.0,))
+    creator.create(
+      'SharedMapping',
+      ChunkedMapping,
+      fitness=creator.FitnessMax,
+      chunk_count=4
+    )
+    self.uut = creator.SharedMapping((a_key, str(a_key)) for a_key in range(20))
+    self.uut.fitness.values = (3.0,)
+
+  def tearDown(self):
+    del creator.FitnessMax
+    del creator.SharedMapping
+
+  def test_mapping(self):
+    self.assertIsInstance(self.uut, collections.abc.MutableMapping)
+    self.assertEqual({a_key: str(a_key) for a_key in range(20)}, self.uut)
+    self.assertEqual(20, len(self.uut))
+    self.assertEqual('5', self.uut.pop(5))
+    del self.uut[6]
+    self.assertNotIn(6, self.uut)
+    self.assertIsNone(self.uut.get(6))
+    self.uut[30] = '30'
+    self.assertEqual(19, len(self.uut))
+    self.assertEqual(sorted(self.uut), sorted(self.uut.keys()))
+    self.assertEqual(list(self.uut), [a_key for a_key, _ in self.uut.items()])
+    self.assertEqual(
+      [self.uut[a_key] for a_key in self.uut],
+      list(self.uut.values())
+    )
+    with self.assertRaises(KeyError):
+      del self.uut[6]
+    shared = copy.deepcopy(self.uut)
+    popped = dict(self.uut.popitem() for _ in range(len(self.uut)))
+    self.assertEqual(shared, popped)
+    self.assertEqual(0, len(self.uut))
+    self.assertEqual(19, len(shared))
+    with self.assertRaises(KeyError):
+      self.uut.popitem()
+    self.uut.update(shared)
+    self.uut.clear()
+    self.assertEqual(0, len(self.uut))
+    self.assertEqual({}, self.uut)
+
+  def test_copy(self):
+    the_copy = self.uut.copy()
+    self.assertIsInstance(the_copy, creator.SharedMapping)
+    self.assertEqual(self.uut, the_copy)
+    self.assertIs(self.uut.fitness, the_copy.fitness)
+    the_copy[0] = 'zero'
+    del the_copy[1]
+    self.assertEqual('0', self.uut[0])
+    self.assertIn(1, self.uut)
+
+  def test_clone_shares_chunks(self):
+    clone = copy.deepcopy(self.uut)
+    self.assertEqual(self.uut, clone)
+    self.assertEqual((3.0,), clone.fitness.values)
+    self.assertIsNot(self.uut.fitness, clone.fitness)
+    for a_chunk, clone_chunk in zip(self.uut._chunks, clone._chunks):
+      self.assertIs(a_chunk, clone_chunk)
+
+    clone[0] = 'changed'
+    del clone[1]
+    clone[40] = '40'
+    self.uut[2] = 'also changed'
+    self.assertEqual('0', self.uut[0])
+    self.assertIn(1, self.uut)
+    self.assertNotIn(40, self.uut)
+    self.assertEqual('2', clone[2])
+    self.assertEqual(20, len(self.uut))
+    self.assertEqual(20, len(clone))
+    shared = sum(
+      a_chunk is clone_chunk
+      for a_chunk, clone_chunk in zip(self.uut._chunks, clone._chunks)
+    )
+    self.assertGreater(shared, 0)
+
+  def test_pickle(self):
+    clone = copy.deepcopy(self.uut)
+    clone[0] = 'changed'
+    (restored, restored_clone) = pickle.loads(dumps_state([self.uut, clone]))
+    self.assertIs(creator.SharedMapping, type(restored))
+    self.assertEqual(self.uut, restored)
+    self.assertEqual(clone, restored_clone)
+    self.assertEqual((3.0,), restored.fitness.values)
+    restored_clone[1] = 'changed'
+    self.assertEqual('1', restored[1])
+
+class CloneTest(unittest.TestCase):
+  def setUp(self):
+    FitnessMax()
+
+  def tearDown(self):
+    del creator.FitnessMax
+
+  def check_clone(self, component):
+    toolbox = base.Toolbox()
+    component.configure_toolbox(toolbox)
+    individual = toolbox.individual()
+    individual.fitness.values = (4.0,)
+    individual.notes = ['evaluated']
+    clone = toolbox.clone(individual)
+    self.assertIs(type(individual), type(clone))
+    self.assertEqual(list(individual), list(clone))
+    self.assertEqual((4.0,), clone.fitness.values)
+    self.assertIsNot(individual.fitness, clone.fitness)
+    self.assertEqual(['evaluated'], clone.notes)
+    self.assertIsNot(individual.notes, clone.notes)
+    del clone.fitness.values
+    self.assertTrue(individual.fitness.valid)
+    return (individual, clone)
+
+  def test_bit_string(self):
+    (individual, clone) = self.check_clone(
+      BitString('FitnessMax', bitstring_size='20')
+    )
+    clone[0] = 1 - clone[0]
+    self.assertNotEqual(individual[0], clone[0])
+    del creator.BitString
+
+  def test_packed_bit_string(self):
+    (individual, clone) = self.check_clone(
+      PackedBitString('FitnessMax', bitstring_size='20')
+    )
+    self.assertEqual(20, len(clone))
+    del creator.PackedBitString
+
+# vim: set ts=2 sw=2 expandtab:
@@ -0,0 +1,123 @@
+import os
+import shutil
+import tempfile
+import unittest
+from deap import creator
+from gabasic import (
+  FitnessMax,
+  BitString,
+  SumItems,
+  TournamentSelection,
+  TwoPointCrossover,
+  FlipBitMutation,
+  IslandGa
+)
+from gabasic.checkpoint import read_checkpoint
+
+
+class IslandGaTest(unittest.TestCase):
+  def setUp(self):
+    FitnessMax()
+    self.mods = [
+      SumItems(),
+      BitString('FitnessMax', bitstring_size='40'),
+      TournamentSelection(tournament_size='3'),
+      TwoPointCrossover(),
+      FlipBitMutation()
+    ]
+    self.config = {
+      'population_size': '20',
+      'max_generation_count': '6',
+      'seed': '64',
+      'print_every': '0',
+      'islands': '3',
+      'migration_interval': '2',
+      'migrants': '2'
+    }
+    self.tmp_dir = tempfile.mkdtemp()
+
+  def tearDown(self):
+    shutil.rmtree(self.tmp_dir)
+    del creator.FitnessMax
+    del creator.BitString
+
+  def test_merged_logbook(self):
+    uut = IslandGa(self.mods, **self.config)
+    (population, logbook) = uut.run()
+
+    self.assertEqual(60, len(population))
+    self.assertTrue(
+      all(isinstance(ind, creator.BitString) for ind in population)
+    )
+    self.assertEqual(list(range(7)), logbook.select('gen'))
+    self.assertEqual(
+      ['island0', 'island1', 'island2'],
+      sorted(logbook.chapters)
+    )
+    chapters = [logbook.chapters[a_name] for a_name in sorted(logbook.chapters)]
+    for gen in range(7):
+      self.assertEqual(
+        logbook[gen]['max'],
+        max(a_chapter[gen]['max'] for a_chapter in chapters)
+      )
+      self.assertEqual(
+        logbook[gen]['nevals'],
+        sum(a_chapter[gen]['nevals'] for a_chapter in chapters)
+      )
+    self.assertEqual(60, logbook[0]['nevals'])
+    self.assertEqual(max(logbook.select('max')), uut.hof[0].fitness.values[0])
+
+  def test_runs_are_repeatable(self):
+    for topology in IslandGa.TOPOLOGIES:
+      config = dict(self.config, migration_topology=topology)
+      (population, logbook) = IslandGa(self.mods, **config).run()
+      (other_population, other_logbook) = IslandGa(self.mods, **config).run()
+      self.assertEqual(population, other_population)
+      self.assertEqual(list(logbook), list(other_logbook))
+
+  def test_migration(self):
+    config = dict(self.config, islands='2', migration_interval='1')
+    (population, logbook) = IslandGa(self.mods, **config).run()
+    (isolated_population, _) = IslandGa(
+      self.mods,
+      **dict(config, migrants='0')
+    ).run()
+    self.assertNotEqual(population, isolated_population)
+    # Each island receives the best individual of the other one.
+    best = max(population[:20], key=lambda ind: ind.fitness)
+    self.assertIn(best, population[20:])
+
+  def test_resume_matches_uninterrupted_run(self):
+    checkpoint_path = os.path.join(self.tmp_dir, 'run.ckpt')
+    (population, logbook) = IslandGa(self.mods, **self.config).run()
+    IslandGa(
+      self.mods,
+      **dict(
+        self.config,
+        max_generation_count='3',
+        checkpoint_file=checkpoint_path,
+        checkpoint_every='3'
+      )
+    ).run()
+    (resumed_population, resumed_logbook) = IslandGa(
+      self.mods,
+      **self.config
+    ).run(read_checkpoint(checkpoint_path))
+    self.assertEqual(population, resumed_population)
+    self.assertEqual(list(logbook), list(resumed_logbook))
+    self.assertEqual(
+      list(logbook.chapters['island2']),
+      list(resumed_logbook.chapters['island2'])
+    )
+
+  def test_invalid_configuration(self):
+    for a_key, a_value in (
+      ('islands', '0'),
+      ('migration_interval', '0'),
+      ('migrants', '20'),
+      ('migration_topology', 'star')
+    ):
+      with self.assertRaises(ValueError):
+        IslandGa(self.mods, **dict(self.config, **{a_key: a_value}))
+
+# vim: set ts=2 sw=2 expandtab:
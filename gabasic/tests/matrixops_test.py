@@ -0,0 +1,73 @@
+import unittest
+import numpy as np
+from gabasic import matrixops
+
+
+class MatrixOpsTest(unittest.TestCase):
+  def setUp(self):
+    np.random.seed(2048)
+    self.rows1 = np.zeros((50, 30), dtype=np.uint8)
+    self.rows2 = np.ones((50, 30), dtype=np.uint8)
+
+  def check_crossover(self, children):
+    (children1, children2) = children
+    self.assertTrue(np.all(children1 ^ children2))
+    return children1.astype(bool)
+
+  def test_random_bit_matrix(self):
+    result = matrixops.random_bit_matrix(20, 10)
+    self.assertEqual((20, 10), result.shape)
+    self.assertEqual(np.uint8, result.dtype)
+    self.assertTrue(np.all(result <= 1))
+
+  def test_sum_rows(self):
+    result = matrixops.sum_rows(np.array([[1, 0, 1], [0, 0, 0]], np.uint8))
+    self.assertTrue(np.array_equal([[2.0], [0.0]], result))
+
+  def test_one_point(self):
+    exchanged = self.check_crossover(
+      matrixops.cx_one_point_rows(self.rows1, self.rows2)
+    )
+    self.assertFalse(np.any(exchanged[:, 0]))
+    self.assertTrue(np.all(exchanged[:, -1]))
+    self.assertTrue(np.all(np.diff(exchanged.astype(int), axis=1) >= 0))
+
+  def test_two_point(self):
+    exchanged = self.check_crossover(
+      matrixops.cx_two_point_rows(self.rows1, self.rows2)
+    )
+    self.assertFalse(np.any(exchanged[:, 0]))
+    changes = np.count_nonzero(np.diff(exchanged.astype(int), axis=1), axis=1)
+    self.assertTrue(np.all(changes <= 2))
+    self.assertTrue(np.all(np.any(exchanged, axis=1)))
+
+  def test_uniform(self):
+    exchanged = self.check_crossover(
+      matrixops.cx_uniform_rows(self.rows1, self.rows2, 0.5)
+    )
+    self.assertAlmostEqual(0.5, exchanged.mean(), delta=0.05)
+
+  def test_flip_bit(self):
+    result = matrixops.mut_flip_bit_rows(self.rows2, 0.1)
+    self.assertEqual(np.uint8, result.dtype)
+    self.assertAlmostEqual(0.9, result.mean(), delta=0.02)
+    self.assertTrue(np.array_equal(self.rows2, np.ones_like(self.rows2)))
+
+  def test_tournament(self):
+    values = np.arange(10, dtype=np.float64)[:, np.newaxis]
+    chosen = matrixops.sel_tournament_idx(values, (1.0,), 200, tournsize=3)
+    self.assertEqual((200,), chosen.shape)
+    self.assertGreater(values[chosen].mean(), values.mean())
+    chosen = matrixops.sel_tournament_idx(values, (-1.0,), 200, tournsize=3)
+    self.assertLess(values[chosen].mean(), values.mean())
+
+  def test_roulette(self):
+    values = np.array([[0.0], [1.0], [3.0]])
+    chosen = matrixops.sel_roulette_idx(values, (1.0,), 1000)
+    self.assertNotIn(0, chosen)
+    self.assertAlmostEqual(0.75, np.mean(chosen == 2), delta=0.05)
+
+if __name__ == '__main__':
+  unittest.main()
+
+# vim: set ts=2 sw=2 expandtab:
@@ -0,0 +1,92 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import contextlib
+import numpy as np
+from deap import creator
+from gabasic import (
+  FitnessMax,
+  BitString,
+  SumItems,
+  TournamentSelection,
+  TwoPointCrossover,
+  FlipBitMutation,
+  SimpleGa
+)
+from gabasic.metrics import open_metrics_sink, read_metrics
+
+
+class MetricsSinkTest(unittest.TestCase):
+  def setUp(self):
+    self.tmp_dir = tempfile.mkdtemp()
+    self.fields = ['gen', 'nevals', 'avg', 'max']
+    self.records = [
+      {'gen': 0, 'nevals': 10, 'avg': np.float64(1.5), 'max': np.float64(3)},
+      {'gen': 1, 'nevals': 4, 'avg': np.float64(2.25), 'max': np.float64(4)}
+    ]
+
+  def tearDown(self):
+    shutil.rmtree(self.tmp_dir)
+
+  def _round_trip(self, file_name):
+    path = os.path.join(self.tmp_dir, file_name)
+    with open_metrics_sink(path, self.fields) as uut:
+      for a_record in self.records:
+        uut.write(a_record)
+    return read_metrics(path)
+
+  def test_json_lines(self):
+    self.assertEqual(self.records, self._round_trip('run.jsonl'))
+
+  def test_csv(self):
+    path = os.path.join(self.tmp_dir, 'run.csv')
+    self.assertEqual(self.records, self._round_trip('run.csv'))
+    with open(path) as metrics_file:
+      self.assertEqual('gen,nevals,avg,max', metrics_file.readline().strip())
+
+
+class SimpleGaMetricsTest(unittest.TestCase):
+  def setUp(self):
+    FitnessMax()
+    self.mods = [
+      SumItems(),
+      BitString('FitnessMax', bitstring_size='20'),
+      TournamentSelection(tournament_size='3'),
+      TwoPointCrossover(),
+      FlipBitMutation()
+    ]
+    self.tmp_dir = tempfile.mkdtemp()
+    self.metrics_path = os.path.join(self.tmp_dir, 'run.jsonl')
+    self.config = {
+      'population_size': '20',
+      'max_generation_count': '5',
+      'seed': '64',
+      'metrics_file': self.metrics_path
+    }
+
+  def tearDown(self):
+    shutil.rmtree(self.tmp_dir)
+    del creator.FitnessMax
+    del creator.BitString
+
+  def test_streams_logbook(self):
+    (_, logbook) = SimpleGa(self.mods, **self.config).run()
+    self.assertEqual(list(logbook), read_metrics(self.metrics_path))
+
+  def test_print_every(self):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+      SimpleGa(self.mods, print_every='2', **self.config).run()
+    printed_gens = [
+      a_line.split()[0] for a_line in output.getvalue().splitlines()[1:]
+    ]
+    self.assertEqual(['0', '2', '4', '5'], printed_gens)
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+      SimpleGa(self.mods, print_every='0', **self.config).run()
+    self.assertEqual('', output.getvalue())
+
+# vim: set ts=2 sw=2 expandtab:
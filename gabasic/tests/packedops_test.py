@@ -0,0 +1,90 @@
+import copy
+import random
+import unittest
+from deap import base, creator
+from gabasic import (
+  FitnessMax,
+  PackedBitString,
+  SumItems,
+  OnePointCrossover,
+  TwoPointCrossover,
+  UniformCrossover,
+  FlipBitMutation
+)
+from gabasic import packedops
+
+
+class PackedBitStringTest(unittest.TestCase):
+  def setUp(self):
+    random.seed(2048)
+    FitnessMax()
+    self.toolbox = base.Toolbox()
+    PackedBitString('FitnessMax', bitstring_size='200').configure_toolbox(
+      self.toolbox
+    )
+
+  def tearDown(self):
+    del creator.FitnessMax
+    del creator.PackedBitString
+
+  def exchange(self, mate_component):
+    mate_component.configure_toolbox(self.toolbox)
+    ind1 = creator.PackedBitString(0)
+    ind2 = creator.PackedBitString((1 << 200) - 1)
+    (child1, child2) = self.toolbox.mate(ind1, ind2)
+    self.assertTrue(isinstance(child1, creator.PackedBitString))
+    self.assertTrue(isinstance(child2, creator.PackedBitString))
+    self.assertEqual((1 << 200) - 1, child1 ^ child2)
+    return list(child1)
+
+  def test_individual(self):
+    indiv = self.toolbox.individual()
+    self.assertEqual(200, len(indiv))
+    self.assertEqual(200, len(list(indiv)))
+    self.assertLess(indiv, 1 << 200)
+    the_clone = copy.deepcopy(indiv)
+    self.assertEqual(indiv, the_clone)
+    self.assertTrue(isinstance(the_clone, creator.PackedBitString))
+
+  def test_sum_items(self):
+    indiv = self.toolbox.individual()
+    self.assertEqual((sum(list(indiv)),), SumItems()(indiv))
+
+  def test_one_point(self):
+    bits = self.exchange(OnePointCrossover())
+    self.assertEqual(0, bits[0])
+    self.assertEqual(1, bits[-1])
+    self.assertEqual(sorted(bits), bits)
+
+  def test_two_point(self):
+    bits = self.exchange(TwoPointCrossover())
+    self.assertEqual(0, bits[0])
+    changes = sum(1 for a, b in zip(bits, bits[1:]) if a != b)
+    self.assertLessEqual(changes, 2)
+    self.assertIn(1, bits)
+
+  def test_uniform(self):
+    bits = self.exchange(UniformCrossover())
+    self.assertTrue(0 < sum(bits) < 200)
+
+  def test_flip_bit(self):
+    FlipBitMutation(indv_bit_mut_prob='0.1').configure_toolbox(self.toolbox)
+    indiv = self.toolbox.individual()
+    (mutant,) = self.toolbox.mutate(indiv)
+    self.assertTrue(isinstance(mutant, creator.PackedBitString))
+    self.assertTrue(0 < packedops.popcount(indiv ^ mutant) < 60)
+
+  def test_random_mask(self):
+    self.assertEqual(0, packedops.random_mask(100, 0.0))
+    self.assertEqual((1 << 100) - 1, packedops.random_mask(100, 1.0))
+    mask_bits = sum(
+      packedops.popcount(packedops.random_mask(1000, 0.05))
+      for _ in range(200)
+    )
+    self.assertAlmostEqual(0.05, mask_bits / 200000, delta=0.005)
+    self.assertLess(packedops.random_mask(100, 0.3), 1 << 100)
+
+if __name__ == '__main__':
+  unittest.main()
+
+# vim: set ts=2 sw=2 expandtab:
@@ -0,0 +1,52 @@
+import random
+import unittest
+from deap import base
+from gabasic import ProcessPoolMap
+
+
+class Item(list):
+  pass
+
+def noisy_sum(item):
+  # Alters the item like evaluations that complete individuals do.
+  item.append(random.randint(0, 100))
+  item.note = len(item)
+  return (sum(item),)
+
+class ProcessPoolMapTest(unittest.TestCase):
+  def setUp(self):
+    self.toolbox = base.Toolbox()
+    self.toolbox.register('evaluate', noisy_sum)
+
+  def run_map(self, workers):
+    random.seed(2048)
+    items = [Item([an_idx]) for an_idx in range(37)]
+    with ProcessPoolMap(self.toolbox, workers, chunk_size=5) as uut:
+      results = uut(self.toolbox.evaluate, items)
+    return results, items, random.getstate()
+
+  def test_invalid_configuration(self):
+    with self.assertRaises(ValueError):
+      ProcessPoolMap(self.toolbox, 0)
+    with self.assertRaises(ValueError):
+      ProcessPoolMap(self.toolbox, 2, chunk_size=0)
+
+  def test_serial_matches_parallel(self):
+    (serial_results, serial_items, serial_state) = self.run_map(1)
+    (parallel_results, parallel_items, parallel_state) = self.run_map(3)
+    self.assertEqual(serial_results, parallel_results)
+    self.assertEqual(serial_items, parallel_items)
+    self.assertEqual(serial_state, parallel_state)
+    self.assertEqual(
+      [an_item.note for an_item in serial_items],
+      [an_item.note for an_item in parallel_items]
+    )
+
+  def test_other_functions(self):
+    with ProcessPoolMap(self.toolbox, 2, chunk_size=3) as uut:
+      self.assertEqual([2, 4, 6, 8], uut(pow, [2, 4, 6, 8], [1] * 4))
+
+if __name__ == '__main__':
+  unittest.main()
+
+# vim: set ts=2 sw=2 expandtab:
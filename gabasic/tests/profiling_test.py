@@ -0,0 +1,82 @@
+import io
+import os
+import pstats
+import shutil
+import tempfile
+import unittest
+import contextlib
+from deap import creator
+from gabasic import (
+  FitnessMax,
+  BitString,
+  SumItems,
+  TournamentSelection,
+  TwoPointCrossover,
+  FlipBitMutation,
+  SimpleGa
+)
+
+
+class OperatorTimerTest(unittest.TestCase):
+  def setUp(self):
+    FitnessMax()
+    self.mods = [
+      SumItems(),
+      BitString('FitnessMax', bitstring_size='20'),
+      TournamentSelection(tournament_size='3'),
+      TwoPointCrossover(),
+      FlipBitMutation()
+    ]
+    self.config = {
+      'population_size': '20',
+      'max_generation_count': '4',
+      'seed': '32',
+      'print_every': '0'
+    }
+    self.tmp_dir = tempfile.mkdtemp()
+
+  def tearDown(self):
+    shutil.rmtree(self.tmp_dir)
+    del creator.FitnessMax
+    del creator.BitString
+
+  def test_logbook_columns(self):
+    (population, logbook) = SimpleGa(self.mods, **self.config).run()
+    uut = SimpleGa(self.mods, profile_operators='true', **self.config)
+    (timed_population, timed_logbook) = uut.run()
+
+    self.assertEqual(population, timed_population)
+    self.assertEqual(logbook.select('max'), timed_logbook.select('max'))
+    for a_field in ('select_time', 'mate_calls', 'evaluate_calls'):
+      self.assertIn(a_field, timed_logbook.header)
+    self.assertEqual([1, 0, 0, 0, 0], timed_logbook.select('population_calls'))
+    self.assertEqual([0, 1, 1, 1, 1], timed_logbook.select('select_calls'))
+    self.assertEqual([0, 20, 20, 20, 20], timed_logbook.select('clone_calls'))
+    self.assertEqual(
+      timed_logbook.select('nevals'),
+      timed_logbook.select('evaluate_calls')
+    )
+    self.assertTrue(all(
+      a_time >= 0.0 for a_time in timed_logbook.select('mutate_time')
+    ))
+    # The toolbox is left as it was.
+    self.assertFalse(hasattr(uut.toolbox.select, '__code__'))
+
+  def test_profile_file(self):
+    profile_path = os.path.join(self.tmp_dir, 'run.prof')
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+      (_, logbook) = SimpleGa(
+        self.mods,
+        profile_file=profile_path,
+        **dict(self.config, print_every='1')
+      ).run()
+    self.assertNotIn('select_time', logbook.header)
+    func_names = {
+      func_name for (_, _, func_name) in pstats.Stats(profile_path).stats
+    }
+    self.assertIn('TournamentSelection.select', func_names)
+    self.assertIn('TwoPointCrossover.mate', func_names)
+    self.assertIn('FlipBitMutation', output.getvalue())
+
+# vim: set ts=2 sw=2 expandtab:
@@ -0,0 +1,53 @@
+import sys
+import unittest
+import subprocess
+import gabasic
+import tictactoe
+from gabasic.registry import (
+  register_component,
+  known_components,
+  resolve_component
+)
+
+
+class ComponentRegistryTest(unittest.TestCase):
+  def test_resolve_builtin(self):
+    self.assertIs(gabasic.BitString, resolve_component('BitString'))
+    self.assertIs(gabasic.SimpleGa, resolve_component('SimpleGa'))
+
+  def test_resolve_qualified(self):
+    self.assertIs(
+      tictactoe.TicTacToeChromo,
+      resolve_component('tictactoe.TicTacToeChromo')
+    )
+
+  def test_resolve_registered(self):
+    class CustomSelection(object):
+      pass
+    register_component('CustomSelection', CustomSelection)
+    self.assertIs(CustomSelection, resolve_component('CustomSelection'))
+    self.assertIn('CustomSelection', known_components())
+
+  def test_unknown(self):
+    with self.assertRaises(ValueError) as context:
+      resolve_component('NoSuchSelection')
+    self.assertIn('TournamentSelection', str(context.exception))
+
+  def test_lazy_package_import(self):
+    # Importing the packages alone must not import any component, nor the
+    # libraries they use.
+    result = subprocess.run(
+      [
+        sys.executable,
+        '-c',
+        'import sys, gabasic, tictactoe; '
+        'print(sorted(set(sys.modules) & {"numpy", "deap", "gabasic.algo", '
+        '"tictactoe.indiv", "matplotlib"}))'
+      ],
+      stdout=subprocess.PIPE,
+      universal_newlines=True,
+      check=True
+    )
+    self.assertEqual('[]', result.stdout.strip())
+
+# vim: set ts=2 sw=2 expandtab:
@@ -0,0 +1,109 @@
+import os
+import shutil
+import tempfile
+import unittest
+from deap import creator
+from gabasic.metrics import read_metrics
+from gabasic.sweep import read_sweep, sweep_points, aggregate, run_sweep
+
+
+MODEL_INI = '''
+[GA]
+population_size=20
+max_generation_count=5
+fitness_type=FitnessMax
+fitness_eval=SumItems
+individual=BitString
+selection=TournamentSelection
+crossover_type=TwoPointCrossover
+mutation_type=FlipBitMutation
+
+[BitString]
+bitstring_size=20
+
+[FitnessMax]
+weights=1.0
+
+[TournamentSelection]
+tournament_size=3
+'''
+
+SWEEP_INI = '''
+[sweep]
+seeds=3
+
+[GA]
+mutation_probability=0.1, 0.3
+
+[TournamentSelection]
+tournament_size=2, 4
+'''
+
+
+class SweepTest(unittest.TestCase):
+  def setUp(self):
+    self.tmp_dir = tempfile.mkdtemp()
+    self.model_path = os.path.join(self.tmp_dir, 'model.ini')
+    self.sweep_path = os.path.join(self.tmp_dir, 'sweep.ini')
+    with open(self.model_path, 'w') as model_file:
+      model_file.write(MODEL_INI)
+    with open(self.sweep_path, 'w') as sweep_file:
+      sweep_file.write(SWEEP_INI)
+
+  def tearDown(self):
+    shutil.rmtree(self.tmp_dir)
+    for a_class_name in ('FitnessMax', 'BitString'):
+      if hasattr(creator, a_class_name):
+        delattr(creator, a_class_name)
+
+  def test_points(self):
+    (options, parameters) = read_sweep(self.sweep_path)
+    self.assertEqual({'seeds': '3'}, options)
+    self.assertEqual(
+      [
+        {('GA', 'mutation_probability'): '0.1',
+          ('TournamentSelection', 'tournament_size'): '2'},
+        {('GA', 'mutation_probability'): '0.1',
+          ('TournamentSelection', 'tournament_size'): '4'},
+        {('GA', 'mutation_probability'): '0.3',
+          ('TournamentSelection', 'tournament_size'): '2'},
+        {('GA', 'mutation_probability'): '0.3',
+          ('TournamentSelection', 'tournament_size'): '4'}
+      ],
+      sweep_points(parameters)
+    )
+
+  def test_aggregate(self):
+    summary = aggregate([
+      [{'gen': 0, 'max': 1.0, 'stop': ''}, {'gen': 1, 'max': 2.0}],
+      [{'gen': 0, 'max': 3.0}]
+    ])
+    self.assertEqual(2, len(summary))
+    self.assertEqual(2, summary[0]['runs'])
+    self.assertAlmostEqual(2.0, summary[0]['max_mean'])
+    self.assertAlmostEqual(12.706, summary[0]['max_ci95'])
+    self.assertNotIn('stop_mean', summary[0])
+    self.assertEqual(
+      {'gen': 1, 'runs': 1, 'max_mean': 2.0, 'max_ci95': None},
+      summary[1]
+    )
+
+  def test_results_do_not_depend_on_workers(self):
+    results = []
+    for workers in (1, 3):
+      output_path = os.path.join(self.tmp_dir, '{}.csv'.format(workers))
+      run_sweep(self.model_path, self.sweep_path, output_path, workers)
+      results.append(read_metrics(output_path))
+    self.assertEqual(results[0], results[1])
+    self.assertEqual(4 * 6, len(results[0]))
+    self.assertEqual(
+      [3] * 24,
+      [a_record['runs'] for a_record in results[0]]
+    )
+    self.assertEqual(
+      [4, 2],
+      [results[0][a_row]['TournamentSelection.tournament_size']
+        for a_row in (6, 12)]
+    )
+
+# vim: set ts=2 sw=2 expandtab:
@@ -0,0 +1,138 @@
+import os
+import shutil
+import tempfile
+import unittest
+from deap import creator
+from gabasic import (
+  FitnessMax,
+  BitString,
+  SumItems,
+  TournamentSelection,
+  TwoPointCrossover,
+  FlipBitMutation,
+  SimpleGa,
+  MatrixGa,
+  IslandGa
+)
+from gabasic.checkpoint import read_checkpoint
+from gabasic.termination import create_termination
+
+
+class TerminationTest(unittest.TestCase):
+  def setUp(self):
+    FitnessMax()
+    self.mods = [
+      SumItems(),
+      BitString('FitnessMax', bitstring_size='20'),
+      TournamentSelection(tournament_size='3'),
+      TwoPointCrossover(),
+      FlipBitMutation()
+    ]
+    self.config = {
+      'population_size': '30',
+      'max_generation_count': '60',
+      'seed': '128',
+      'print_every': '0'
+    }
+    self.tmp_dir = tempfile.mkdtemp()
+
+  def tearDown(self):
+    shutil.rmtree(self.tmp_dir)
+    del creator.FitnessMax
+    del creator.BitString
+
+  def _run(self, ga_cls=SimpleGa, **kwargs):
+    return ga_cls(self.mods, **dict(self.config, **kwargs)).run()
+
+  def test_without_criteria(self):
+    (_, logbook) = self._run()
+    self.assertEqual(61, len(logbook))
+    self.assertNotIn('stop', logbook.header)
+
+  def test_target_fitness(self):
+    for ga_cls in (SimpleGa, MatrixGa):
+      (_, logbook) = self._run(ga_cls, target_fitness='18')
+      self.assertLess(len(logbook), 61)
+      self.assertEqual('target_fitness', logbook[-1]['stop'])
+      self.assertGreaterEqual(logbook[-1]['max'], 18)
+      self.assertTrue(all(a_max < 18 for a_max in logbook.select('max')[:-1]))
+      self.assertTrue(all('stop' not in a_record for a_record in logbook[:-1]))
+
+  def test_evaluation_budget(self):
+    (_, logbook) = self._run(evaluation_budget='200')
+    nevals = logbook.select('nevals')
+    self.assertEqual('evaluation_budget', logbook[-1]['stop'])
+    self.assertGreaterEqual(sum(nevals), 200)
+    self.assertLess(sum(nevals[:-1]), 200)
+
+  def test_stagnation(self):
+    (_, logbook) = self._run(stagnation='5')
+    self.assertEqual('stagnation', logbook[-1]['stop'])
+    best = [max(logbook.select('max')[:gen + 1]) for gen in range(len(logbook))]
+    self.assertEqual(best[-6], best[-1])
+    self.assertLess(best[-7], best[-6])
+
+  def test_time_budget(self):
+    (_, logbook) = self._run(time_budget='0')
+    self.assertEqual(1, len(logbook))
+    self.assertEqual('time_budget', logbook[0]['stop'])
+
+  def test_combined_criteria(self):
+    (_, logbook) = self._run(
+      target_fitness='100',
+      stagnation='5',
+      evaluation_budget='100000',
+      stop_when='target_fitness or (stagnation and evaluation_budget)'
+    )
+    self.assertEqual(61, len(logbook))
+    self.assertEqual('max_generation_count', logbook[-1]['stop'])
+
+    (_, logbook) = self._run(
+      stagnation='5',
+      evaluation_budget='200',
+      stop_when='stagnation and evaluation_budget'
+    )
+    self.assertEqual('stagnation,evaluation_budget', logbook[-1]['stop'])
+
+  def test_invalid_criteria(self):
+    for kwargs in (
+      {'stop_when': 'stagnation'},
+      {'stagnation': '5', 'stop_when': 'stagnation or target_fitness'},
+      {'stagnation': '5', 'stop_when': 'not stagnation'},
+      {'stagnation': '5', 'stop_when': 'stagnation or'},
+      {'stagnation': '0'}
+    ):
+      with self.assertRaises(ValueError):
+        create_termination(**kwargs)
+
+  def test_resume_matches_uninterrupted_run(self):
+    checkpoint_path = os.path.join(self.tmp_dir, 'run.ckpt')
+    (population, logbook) = self._run(evaluation_budget='300')
+    self._run(
+      evaluation_budget='300',
+      max_generation_count='6',
+      checkpoint_file=checkpoint_path,
+      checkpoint_every='6'
+    )
+    (resumed_population, resumed_logbook) = SimpleGa(
+      self.mods,
+      evaluation_budget='300',
+      **self.config
+    ).run(read_checkpoint(checkpoint_path))
+    self.assertEqual(population, resumed_population)
+    # The interrupted run ended by reaching its own max_generation_count.
+    self.assertEqual('max_generation_count', resumed_logbook[6].pop('stop'))
+    self.assertEqual(list(logbook), list(resumed_logbook))
+
+  def test_islands_stop_when_synchronized(self):
+    (population, logbook) = self._run(
+      IslandGa,
+      islands='2',
+      migration_interval='4',
+      target_fitness='18'
+    )
+    self.assertEqual(60, len(population))
+    self.assertEqual('target_fitness', logbook[-1]['stop'])
+    self.assertEqual(0, logbook[-1]['gen'] % 4)
+
+# vim: set ts=2 sw=2 expandtab:
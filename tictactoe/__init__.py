@@ -1,8 +1,42 @@
-from .boardstate import BoardState, BoardStateDomain
-from .indiv import TicTacToeChromo, PolicyGene
-from .gaops import ChangeActionMutation
-from .eval import WinsVsLosses
-from .algo import TicTacToeGa
+import importlib
+
+# Submodule defining each public name, imported on first use (see the
+# ``gabasic`` package).
+_EXPORTS = {
+  'BoardState': 'boardstate',
+  'BoardStateDomain': 'boardstate',
+  'StateTable': 'statetable',
+  'StateTableDomain': 'statetable',
+  'StateSampler': 'sampler',
+  'RandomWalkSampler': 'sampler',
+  'TicTacToeChromo': 'indiv',
+  'TicTacToeArrayChromo': 'indiv',
+  'TicTacToeSharedChromo': 'indiv',
+  'PolicyGene': 'indiv',
+  'ChangeActionMutation': 'gaops',
+  'ArrayChangeActionMutation': 'gaops',
+  'WinsVsLosses': 'eval',
+  'BatchWinsVsLosses': 'eval',
+  'SampledWinsVsLosses': 'eval',
+  'TicTacToeGa': 'algo',
+  'TicTacToeIslandGa': 'algo'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+  module_name = _EXPORTS.get(name)
+  if module_name is None:
+    raise AttributeError(
+      'module {!r} has no attribute {!r}'.format(__name__, name)
+    )
+  value = getattr(importlib.import_module('.' + module_name, __name__), name)
+  globals()[name] = value
+  return value
+
+def __dir__():
+  return sorted(set(globals()) | set(_EXPORTS))
 
 
 # vim: set ts=2 sw=2 expandtab:
@@ -0,0 +1,23 @@
+import sys
+from .boardstate import BoardState
+from .statetable import StateTable
+
+
+if len(sys.argv) < 2 or len(sys.argv) > 5:
+  print(
+    'Usage: tictactoe <state table output file> '
+    '[<rows> [<columns> [<win length>]]]'
+  )
+  sys.exit(1)
+
+BoardState.configure(*[int(an_arg) for an_arg in sys.argv[2:]])
+print('Enumerating {} x {} board states (win length {})'.format(
+  *BoardState.geometry()
+))
+state_table = StateTable.build()
+state_table.save(sys.argv[1])
+print(
+  'Wrote {} board states to {}'.format(state_table.state_count, sys.argv[1])
+)
+
+# vim: set ts=2 sw=2 expandtab:
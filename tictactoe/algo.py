@@ -1,23 +1,54 @@
-from gabasic import SimpleGa
+from gabasic import SimpleGa, IslandGa, ChunkedMapping
 from .indiv import  PolicyGene
-import jsonpickle
-import json
+from .statetable import StateTable
+
+
+def _jsonpickle():
+  # jsonpickle (with its NumPy extension) takes longer to import than the rest
+  # of the model, and is only needed once the run is over.
+  import jsonpickle
+  import jsonpickle.ext.numpy
+  import jsonpickle.handlers
+  # Array-backed individuals (see TicTacToeArrayChromo) are written out as
+  # lists of actions.
+  jsonpickle.ext.numpy.register_handlers(ndarray_size_threshold=None)
+
+  class ChunkedMappingHandler(jsonpickle.handlers.BaseHandler):
+    # Individuals sharing their genes (see TicTacToeSharedChromo) are written
+    # out as the dict individuals they stand in for.
+    def flatten(self, obj, data):
+      data.update(self.context.flatten(dict(obj.items()), reset=False))
+      return data
+
+  jsonpickle.handlers.register(
+    ChunkedMapping,
+    ChunkedMappingHandler,
+    base=True
+  )
+  return jsonpickle
 
 
 class TicTacToeGa(SimpleGa):
   def __init__(self, toolbox_mods, **kwargs):
     super(TicTacToeGa, self).__init__(toolbox_mods, **kwargs)
+    if self.multiprocess and PolicyGene.state_table is None:
+      # Evaluation workers and islands cannot share states they discover, so
+      # every state must have its fixed address before the first process
+      # starts.
+      PolicyGene.state_table = StateTable.build()
+      PolicyGene.state_domain = PolicyGene.state_table.to_domain()
   
-  def run(self):
+  def run(self, resume=None):
     # ------------------------------
     # TODO: Add pre-GA run code here
     # ------------------------------
-    population, logbook = super().run()
+    population, logbook = super().run(resume)
     # -------------------------------
     # TODO: Add post-GA run code here
     # Hall of fame available through instance field `self.hof`
     # -------------------------------
 
+    jsonpickle = _jsonpickle()
     PolicyGeneStateDomain = jsonpickle.encode(PolicyGene.state_domain, unpicklable=False)
     BestIndividual = jsonpickle.encode(self.hof, unpicklable=False)
 
@@ -31,4 +62,11 @@ class TicTacToeGa(SimpleGa):
 
     return population, logbook
 
+
+class TicTacToeIslandGa(IslandGa, TicTacToeGa):
+  """Tic-tac-toe model run as several islands (see ``gabasic.IslandGa``).
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
 # vim: set ts=2 sw=2 expandtab:
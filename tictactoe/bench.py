@@ -0,0 +1,191 @@
+"""Microbenchmarks for the Tic-Tac-Toe board state and evaluation hot paths.
+
+Run with ``python -m tictactoe.bench``; each benchmark reports the number of
+operations completed per second. These benchmarks are also part of the suite
+run by ``python -m gabasic.bench``.
+"""
+import sys
+import random
+import warnings
+import numpy as np
+from deap import base
+from gabasic import FitnessMax
+from gabasic.bench import ops_per_second, bench_clone
+from tictactoe import (
+  BoardState,
+  BoardStateDomain,
+  TicTacToeChromo,
+  TicTacToeSharedChromo,
+  WinsVsLosses
+)
+
+
+def sample_contents(count, seed=2048):
+  """Produce board contents for a random mix of reachable board states.
+
+  Parameters
+  ----------
+  count : int
+    Number of board contents to produce.
+  seed : int
+    Seed used for the random number generator, so every run (and every
+    revision of the code) benchmarks the same boards.
+
+  Returns
+  -------
+  list
+    List of ``count`` board contents lists.
+  """
+  rng = random.Random(seed)
+  result = []
+  while len(result) < count:
+    contents = [0] * 9
+    next_player = 1
+    for _ in range(rng.randint(0, 8)):
+      empty_cells = [idx for idx, a_cell in enumerate(contents) if a_cell == 0]
+      contents[rng.choice(empty_cells)] = next_player
+      next_player = 2 if next_player == 1 else 1
+    result.append(contents)
+  return result
+
+def bench_construction(board_count=10000):
+  all_contents = sample_contents(board_count)
+  def construct_all():
+    for contents in all_contents:
+      BoardState(contents)
+  return ops_per_second(construct_all, board_count)
+
+def bench_after_move(board_count=10000):
+  board_states = [
+    BoardState(contents) for contents in sample_contents(board_count)
+  ]
+  moves = [
+    (a_state, a_state.legal_moves()[0])
+    for a_state in board_states if a_state.legal_moves()
+  ]
+  def move_all():
+    for a_state, a_move in moves:
+      a_state.after_move(1, a_move)
+  return ops_per_second(move_all, len(moves))
+
+def bench_final(board_count=10000):
+  board_states = [
+    BoardState(contents) for contents in sample_contents(board_count)
+  ]
+  def check_all():
+    for a_state in board_states:
+      a_state.final
+  return ops_per_second(check_all, board_count)
+
+def bench_intern(board_count=10000):
+  all_contents = sample_contents(board_count)
+  def intern_all():
+    for contents in all_contents:
+      BoardState.intern(contents)
+  return ops_per_second(intern_all, board_count)
+
+def bench_legal_moves(board_count=10000):
+  board_states = [
+    BoardState.intern(contents) for contents in sample_contents(board_count)
+  ]
+  def scan_all():
+    for a_state in board_states:
+      a_state.legal_move_tuple
+  return ops_per_second(scan_all, board_count)
+
+def bench_domain_lookups(board_count=10000):
+  board_states = [
+    BoardState.intern(contents) for contents in sample_contents(board_count)
+  ]
+  domain = BoardStateDomain()
+  def look_up_all():
+    for a_state in board_states:
+      domain.state_to_rank_idx_pair(a_state)
+  # Only the first lookup of each state registers it.
+  look_up_all()
+  return ops_per_second(look_up_all, board_count)
+
+def sample_policies(count, gene_count, seed=2048, chromo_cls=TicTacToeChromo):
+  """Produce random policies, completed so that they cover every board state
+  they can reach.
+
+  Parameters
+  ----------
+  count : int
+    Number of policies to produce.
+  gene_count : int
+    Number of genes each policy starts with.
+  seed : int
+    Seed used for the ``random`` and NumPy random number generators.
+  chromo_cls : type
+    Individual component creating the policies.
+
+  Returns
+  -------
+  list
+    List of ``count`` policies.
+  """
+  with warnings.catch_warnings():
+    # Every benchmark creates the DEAP classes anew.
+    warnings.simplefilter('ignore', RuntimeWarning)
+    FitnessMax()
+    chromo = chromo_cls(
+      'FitnessMax',
+      init_policy_slot_count=str(gene_count)
+    )
+  toolbox = base.Toolbox()
+  chromo.configure_toolbox(toolbox)
+  # Initial genes are drawn with both generators (see
+  # PolicyGene.new_random_batch).
+  random.seed(seed)
+  np.random.seed(seed)
+  result = toolbox.population(n=count)
+  evaluator = WinsVsLosses()
+  for a_policy in result:
+    evaluator(a_policy)
+  return result
+
+def bench_wins_vs_losses(gene_count, policy_count=10):
+  policies = sample_policies(policy_count, gene_count)
+  evaluator = WinsVsLosses()
+  def evaluate_all():
+    for a_policy in policies:
+      # Without its traversal memo, the policy is evaluated from scratch.
+      del a_policy.traversal_memo
+      evaluator(a_policy)
+  return ops_per_second(evaluate_all, policy_count)
+
+def bench_policy_clones(chromo_cls, gene_count, policy_count=100):
+  policies = sample_policies(policy_count, gene_count, chromo_cls=chromo_cls)
+  for a_policy in policies:
+    a_policy.fitness.values = (0.5,)
+  return bench_clone(chromo_cls.clone, policies)
+
+BENCHMARKS = [
+  ('BoardState() constructions', bench_construction),
+  ('BoardState.intern() calls', bench_intern),
+  ('BoardState.after_move() calls', bench_after_move),
+  ('BoardState.legal_move_tuple', bench_legal_moves),
+  ('BoardState.final checks', bench_final),
+  ('BoardStateDomain lookups', bench_domain_lookups),
+  ('WinsVsLosses() calls, 30 genes', lambda: bench_wins_vs_losses(30)),
+  ('WinsVsLosses() calls, 100 genes', lambda: bench_wins_vs_losses(100)),
+  (
+    'TicTacToeChromo clones, 100 genes',
+    lambda: bench_policy_clones(TicTacToeChromo, 100)
+  ),
+  (
+    'TicTacToeSharedChromo clones, 100 genes',
+    lambda: bench_policy_clones(TicTacToeSharedChromo, 100)
+  )
+]
+
+def main(argv):
+  for bench_name, bench_func in BENCHMARKS:
+    print('{:<40s}{:>14,.0f} per second'.format(bench_name, bench_func()))
+  print('BoardState cache counters: {}'.format(BoardState.cache_stats()))
+
+if __name__ == '__main__':
+  main(sys.argv[1:])
+
+# vim: set ts=2 sw=2 expandtab:
@@ -1,12 +1,125 @@
-import numpy as np
+def _winning_mask_table(win_masks, cell_count):
+  """Tabulate, for every possible player move mask, whether it wins."""
+  return [
+    any(a_mask & a_win == a_win for a_win in win_masks)
+    for a_mask in range(1 << cell_count)
+  ]
+
+class _WinningMaskCache(dict):
+  """Whether a player move mask contains a winning line, computed the first
+  time each mask is looked up; stands in for the table of
+  py:func:: _winning_mask_table on boards too large to tabulate.
+  """
+
+  def __init__(self, win_masks):
+    super(_WinningMaskCache, self).__init__()
+    self._win_masks = win_masks
 
+  def __missing__(self, mask):
+    result = any(mask & a_win == a_win for a_win in self._win_masks)
+    self[mask] = result
+    return result
+
+def compose_permutations(first, second):
+  """Permutation of cells applying ``first`` and then ``second``.
+
+  A permutation lists, for each cell of the permuted board, the cell of the
+  original board it is taken from.
+  """
+  return [first[source_idx] for source_idx in second]
+
+def board_symmetries(rows, columns):
+  """Cell permutations producing every configuration equivalent to a board.
+
+  Configurations are the rotations of the board followed by their mirror
+  images. A square board has eight: the board turned by zero, one, two and
+  three quarter turns (counterclockwise), and then the mirror image (left to
+  right) of the board turned by zero, two, one and three quarter turns. Any
+  other board only has four, since a quarter turn changes its shape: the
+  board, its half turn, and the mirror images of both.
+
+  Parameters
+  ----------
+  rows : int
+    Number of rows of the board.
+  columns : int
+    Number of columns of the board.
+
+  Returns
+  -------
+  list
+    Permutations (see py:func:: compose_permutations), the identity first.
+  """
+  cells = [
+    (a_row, a_column) for a_row in range(rows) for a_column in range(columns)
+  ]
+  identity = list(range(rows * columns))
+  half_turn = [
+    (rows - 1 - a_row) * columns + columns - 1 - a_column
+    for a_row, a_column in cells
+  ]
+  mirror = [
+    a_row * columns + columns - 1 - a_column for a_row, a_column in cells
+  ]
+  if rows == columns:
+    quarter_turn = [
+      a_column * columns + columns - 1 - a_row for a_row, a_column in cells
+    ]
+    turns = [
+      identity,
+      quarter_turn,
+      half_turn,
+      compose_permutations(half_turn, quarter_turn)
+    ]
+    mirrored_turns = [turns[0], turns[2], turns[1], turns[3]]
+  else:
+    turns = [identity, half_turn]
+    mirrored_turns = turns
+  return turns + [
+    compose_permutations(a_turn, mirror) for a_turn in mirrored_turns
+  ]
+
+def board_win_lines(rows, columns, win_length):
+  """Every run of ``win_length`` cells in a row, column or diagonal.
+
+  Parameters
+  ----------
+  rows : int
+    Number of rows of the board.
+  columns : int
+    Number of columns of the board.
+  win_length : int
+    Number of cells in a winning line.
+
+  Returns
+  -------
+  list
+    Tuple of cell indices of each line.
+  """
+  result = []
+  for row_step, column_step in ((0, 1), (1, 0), (1, 1), (1, -1)):
+    for a_row in range(rows):
+      for a_column in range(columns):
+        last_row = a_row + row_step * (win_length - 1)
+        last_column = a_column + column_step * (win_length - 1)
+        if 0 <= last_row < rows and 0 <= last_column < columns:
+          result.append(tuple(
+            (a_row + row_step * a_step) * columns + a_column +
+              column_step * a_step
+            for a_step in range(win_length)
+          ))
+  return result
 
 class BoardState(object):
   """Immutable state of the Tic-Tac-Toe board.
 
   Instances of this class represent a particular tic-tac-toe board state, and
-  the state is considered equivalent with seven (7) other rotations and
-  reflexions of the baseline configuration.
+  the state is considered equivalent with the other rotations and reflexions
+  of the baseline configuration (seven of them on the default 3 x 3 board).
+
+  The board is 3 x 3, with three marks in a row winning, unless
+  py:meth:: configure sets another geometry (any number of rows and columns,
+  and any win length) for the whole process.
 
   Instances can also be used to create new board states after making a
   particular move for a player. Since instances are immutable, a new instance
@@ -16,42 +129,97 @@ class BoardState(object):
   translated to moves in the other equivalent configurations.
 
   Board states are also assigned a "rank" based on the number of moves that
-  the state expresses. The rank range is [0, 9] with 0 being an empty board, 9
-  being a full board, and the rest distributed between.
+  the state expresses. The rank range is [0, ``CELL_COUNT``] with 0 being an
+  empty board, ``CELL_COUNT`` (9 on the default board) being a full board, and
+  the rest distributed between.
+
+  Equivalent board states share a canonical key (the smallest of the
+  equivalent configurations), which is also used as the basis for hashing.
+  This allows board states to be used as ``dict`` keys or ``set`` members
+  with the rotations and reflexions of a state all collapsing onto the same
+  entry.
+
+  Internally, the moves of each player are kept as a bit mask (bit ``n`` set
+  meaning the player occupies cell ``n``), and victories are detected by
+  testing the masks against the precomputed masks of every winning line. The
+  alternate configurations are only built the first time they are needed.
+
+  Since instances are immutable, every distinct board position can be shared.
+  py:meth:: intern returns the one shared instance for a position, and
+  py:meth:: after_move memoizes every transition, so once a position has been
+  reached, reaching it again is a dictionary lookup instead of a new instance.
+  Hit and miss counts for these caches are available from
+  py:meth:: cache_stats.
 
   Attributes
   ----------
   rank : int
     Read-only attribute that indicates the rank of this board state.
+  canonical_key : tuple
+    Read-only attribute with the symmetry-invariant key of this board state.
+  canonical_code : int
+    Read-only attribute with the symmetry-invariant key of this board state,
+    as an integer.
 
   codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
   """
-  # TODO: Could these be derived using an algorithm? That would make this class
-  # truly generic, as it would not depend on just a 3 x 3 board.
-  # For any board described by configuration:
+  # Geometry of the board, set by py:meth:: configure (see the end of the
+  # module for the default 3 x 3 board where three in a row wins).
+  ROWS = None
+  COLUMNS = None
+  WIN_LENGTH = None
+  CELL_COUNT = None
+
+  # Equivalent configurations of a board (see py:func:: board_symmetries).
+  # On the 3 x 3 board described by configuration:
   #
   # 0 1 2
   # 3 4 5
   # 6 7 8
   #
-  # Configurations that may be considered equivalent are:
+  # the configurations considered equivalent are:
   # 2 5 8    8 7 6    6 3 0    2 1 0    6 7 8    8 5 2    0 3 6
   # 1 4 7    5 4 3    7 4 1    5 4 3    3 4 5    7 4 1    1 4 7
   # 0 3 6    2 1 0    8 5 2    8 7 6    0 1 2    6 3 0    2 5 8
-  
-  CONFIG_SCHEMAS = [
-    [0, 1, 2, 3, 4, 5, 6, 7, 8],
-    [2, 5, 8, 1, 4, 7, 0, 3, 6],
-    [8, 7, 6, 5, 4, 3, 2, 1, 0],
-    [6, 3, 0, 7, 4, 1, 8, 5, 2],
-    [2, 1, 0, 5, 4, 3, 8, 7, 6],
-    [6, 7, 8, 3, 4, 5, 0, 1, 2],
-    [8, 5, 2, 7, 4, 1, 6, 3, 0],
-    [0, 3, 6, 1, 4, 7, 2, 5, 8]
-  ]
+  CONFIG_SCHEMAS = None
+
+  WIN_LINES = None
+  WIN_MASKS = None
+
+  # Boards with at most this many cells tabulate whether each player move mask
+  # wins; larger ones remember the masks looked up so far.
+  MAX_TABULATED_CELL_COUNT = 16
+
+  # Whether a player move mask contains a winning line, indexed by mask
+  _WINNING_MASK = None
+
+  __slots__ = (
+    '_baseline',
+    '_p1_mask',
+    '_p2_mask',
+    '_rank',
+    '_alt_configs',
+    '_canonical_key',
+    '_canonical_code',
+    '_legal_moves'
+  )
+
+  # Shared instance for every board position, keyed by player masks
+  _interned = {}
+
+  # Board state reached by every (player masks, player, move) transition
+  _transitions = {}
+
+  _cache_counters = {
+    'intern_hits': 0,
+    'intern_misses': 0,
+    'transition_hits': 0,
+    'transition_misses': 0
+  }
 
   def __init__(self, contents):
-    """Save the provided baseline configuration, deriving alternates and rank.
+    """Save the provided baseline configuration, deriving player masks and
+    rank.
 
     Parameters
     ----------
@@ -60,44 +228,170 @@ class BoardState(object):
     """
     super(BoardState, self).__init__()
     self._baseline = contents
-    self._all_configs = [self._baseline,]
-
-    for a_config in BoardState.CONFIG_SCHEMAS[1:]:
-      self._all_configs.append([0] * len(a_config))
-
-      for target_pos, source_idx in enumerate(a_config):
-        self._all_configs[-1][target_pos] = self._baseline[source_idx]
-
-    self._rank = len(BoardState.CONFIG_SCHEMAS[0]) - self._baseline.count(0)
-    self._max_move = max(BoardState.CONFIG_SCHEMAS[0])
-
-    # Assuming board is always a square with n cells, dimensions should be
-    # sqrt(n) by sqrt(n)
-    a_dim = int(np.sqrt(len(BoardState.CONFIG_SCHEMAS[0])))
-    board_shape = (a_dim, a_dim) # simpilest case (3, 3)
-    square_board = np.reshape(np.array(self._baseline), board_shape)
-
-    p1_moves = square_board == 1
-    p2_moves = square_board == 2
-
-    d1_mask = np.eye(a_dim, dtype=int) == 0
-    d2_mask = np.fliplr(np.eye(a_dim, dtype=int)) == 0
-
-    p1_d1_masked = np.ma.array(p1_moves, mask=d1_mask, copy=True)
-    p1_d2_masked = np.ma.array(p1_moves, mask=d2_mask, copy=True)
-    p2_d1_masked = np.ma.array(p2_moves, mask=d1_mask, copy=True)
-    p2_d2_masked = np.ma.array(p2_moves, mask=d2_mask, copy=True)
-
-    (self._p1_victory, self._p2_victory) = (
-      np.any(np.all(p1_moves, axis=1)) or  # Across
-      np.any(np.all(p1_moves, axis=0)) or  # Down
-      np.all(p1_d1_masked) or              # Diagonal high-low
-      np.all(p1_d2_masked),                # Diagonal low-high
-      np.any(np.all(p2_moves, axis=1)) or  # Across
-      np.any(np.all(p2_moves, axis=0)) or  # Down
-      np.all(p2_d1_masked) or              # Diagonal high-low
-      np.all(p2_d2_masked)                 # Diagonal low-high
-    )
+    (self._p1_mask, self._p2_mask) = BoardState._player_masks(contents)
+    self._rank = BoardState.CELL_COUNT - contents.count(0)
+    self._alt_configs = None
+    self._canonical_key = None
+    self._canonical_code = None
+    self._legal_moves = None
+
+  @classmethod
+  def configure(cls, rows=3, columns=None, win_length=None):
+    """Set the geometry of the board for the whole process.
+
+    Symmetries and winning lines are derived for the new geometry, and every
+    interned board state and memoized transition is dropped, so board states
+    created before must not be used afterwards.
+
+    Parameters
+    ----------
+    rows : int
+      Number of rows of the board.
+    columns : int or None
+      Number of columns of the board; as many as rows if ``None``.
+    win_length : int or None
+      Number of marks in a row, column or diagonal that wins the game; the
+      length of the board's shorter side if ``None``.
+
+    Raises
+    ------
+    ValueError
+      If the board has no cells, or no line of ``win_length`` fits in it.
+    """
+    if columns is None:
+      columns = rows
+    if win_length is None:
+      win_length = min(rows, columns)
+    if rows < 1 or columns < 1:
+      raise ValueError('The board needs at least one row and one column.')
+    if win_length < 1 or win_length > max(rows, columns):
+      raise ValueError(
+        'Win length {} does not fit a {} x {} board.'.format(
+          win_length,
+          rows,
+          columns
+        )
+      )
+    cls.ROWS = rows
+    cls.COLUMNS = columns
+    cls.WIN_LENGTH = win_length
+    cls.CELL_COUNT = rows * columns
+    cls.CONFIG_SCHEMAS = board_symmetries(rows, columns)
+    cls.WIN_LINES = board_win_lines(rows, columns, win_length)
+    cls.WIN_MASKS = [
+      sum(1 << a_cell for a_cell in a_line) for a_line in cls.WIN_LINES
+    ]
+    if cls.CELL_COUNT <= cls.MAX_TABULATED_CELL_COUNT:
+      cls._WINNING_MASK = _winning_mask_table(cls.WIN_MASKS, cls.CELL_COUNT)
+    else:
+      cls._WINNING_MASK = _WinningMaskCache(cls.WIN_MASKS)
+    cls.clear_caches()
+
+  @classmethod
+  def geometry(cls):
+    """Geometry of the board.
+
+    Returns
+    -------
+    tuple
+      Number of rows, number of columns and win length.
+    """
+    return (cls.ROWS, cls.COLUMNS, cls.WIN_LENGTH)
+
+  @classmethod
+  def empty(cls):
+    """Obtain the shared instance for the empty board.
+
+    Returns
+    -------
+    BoardState
+      Board state without any moves.
+    """
+    return cls.intern([0] * cls.CELL_COUNT)
+
+  @staticmethod
+  def _player_masks(contents):
+    """Derive the move masks of both players from board contents."""
+    p1_mask = 0
+    p2_mask = 0
+    cell_bit = 1
+    for a_cell in contents:
+      if a_cell == 1:
+        p1_mask |= cell_bit
+      elif a_cell == 2:
+        p2_mask |= cell_bit
+      cell_bit <<= 1
+    return (p1_mask, p2_mask)
+
+  @classmethod
+  def intern(cls, contents):
+    """Obtain the shared instance for a board position.
+
+    Parameters
+    ----------
+    contents : list
+      Board contents of the position. The list is copied if a new instance
+      has to be created, so callers may keep modifying it.
+
+    Returns
+    -------
+    BoardState
+      Shared, immutable instance whose baseline configuration is ``contents``.
+    """
+    position = cls._player_masks(contents)
+    result = cls._interned.get(position)
+    if result is None:
+      cls._cache_counters['intern_misses'] += 1
+      result = cls(list(contents))
+      cls._interned[position] = result
+    else:
+      cls._cache_counters['intern_hits'] += 1
+    return result
+
+  @classmethod
+  def cache_stats(cls):
+    """Report hit and miss counts of the interning and transition caches.
+
+    Returns
+    -------
+    dict
+      Counts keyed by ``intern_hits``, ``intern_misses``, ``transition_hits``
+      and ``transition_misses``, along with the number of ``interned`` board
+      positions and memoized ``transitions``.
+    """
+    result = dict(cls._cache_counters)
+    result['interned'] = len(cls._interned)
+    result['transitions'] = len(cls._transitions)
+    return result
+
+  @classmethod
+  def clear_caches(cls):
+    """Drop every interned instance and memoized transition, resetting the
+    cache counters.
+    """
+    cls._interned.clear()
+    cls._transitions.clear()
+    for a_counter in cls._cache_counters:
+      cls._cache_counters[a_counter] = 0
+
+  @property
+  def _all_configs(self):
+    """Baseline configuration followed by its alternates, built on first
+    access.
+    """
+    if self._alt_configs is None:
+      baseline = self._baseline
+      self._alt_configs = [baseline,] + [
+        [baseline[source_idx] for source_idx in a_config]
+        for a_config in BoardState.CONFIG_SCHEMAS[1:]
+      ]
+    return self._alt_configs
+
+  def __getstate__(self):
+    return self._baseline
+
+  def __setstate__(self, state):
+    self.__init__(state)
   
   def legal_moves(self):
     """Discover moves left in board state
@@ -107,11 +401,24 @@ class BoardState(object):
     list
       Remaining moves in this board state. Could be empty if board is full.
     """
-    result = []
-    for (idx, pos) in enumerate(self._baseline):
-      if pos == 0:
-        result.append(idx)
-    return result
+    return list(self.legal_move_tuple)
+
+  @property
+  def legal_move_tuple(self):
+    """Moves left in board state as a memoized, shared tuple.
+
+    Returns
+    -------
+    tuple
+      Remaining moves in this board state. Could be empty if board is full.
+    """
+    if self._legal_moves is None:
+      occupied = self._p1_mask | self._p2_mask
+      self._legal_moves = tuple(
+        idx for idx in range(BoardState.CELL_COUNT)
+        if not occupied & (1 << idx)
+      )
+    return self._legal_moves
   
   @property
   def rank(self):
@@ -120,15 +427,65 @@ class BoardState(object):
     Returns
     -------
     int
-      Rank of this board state in range [0, 9]
+      Rank of this board state in range [0, ``CELL_COUNT``]
     """
     return self._rank
 
+  @property
+  def canonical_key(self):
+    """Provide the symmetry-invariant key of this board state.
+
+    The key is the lexicographically smallest of the equivalent
+    configurations, so every rotation and reflexion of a board state yields
+    the same key. It is computed on first access and cached afterwards,
+    without keeping the alternate configurations it was chosen from.
+
+    Returns
+    -------
+    tuple
+      Canonical configuration of this board state.
+    """
+    if self._canonical_key is None:
+      if self._alt_configs is not None:
+        self._canonical_key = min(
+          tuple(a_config) for a_config in self._alt_configs
+        )
+      else:
+        baseline = self._baseline
+        self._canonical_key = min(
+          tuple([baseline[source_idx] for source_idx in a_config])
+          for a_config in BoardState.CONFIG_SCHEMAS
+        )
+    return self._canonical_key
+
+  @property
+  def canonical_code(self):
+    """Provide the symmetry-invariant key of this board state as an integer.
+
+    The code reads the canonical key as a number in base 3, with the first
+    cell as the most significant digit, so codes sort as canonical keys do.
+    It identifies the same board states as the canonical key, but takes less
+    memory and hashes faster, which matters for domains holding the states of
+    large boards.
+
+    Returns
+    -------
+    int
+      Canonical code of this board state.
+    """
+    if self._canonical_code is None:
+      result = 0
+      for a_cell in self.canonical_key:
+        result = result * 3 + a_cell
+      self._canonical_code = result
+    return self._canonical_code
+
   def after_move(self, player, move):
     """Create new board state resulting after a player move.
 
-    Since BoardState instances are immutable, a new instance must be created
-    after a player move is applied.
+    Since BoardState instances are immutable, a different instance must
+    represent the board after a player move is applied. The resulting instance
+    is the interned one for the new position, and the transition is memoized.
 
     Given that the resulting board state will be of higher rank, there is no
     chance that the result of this method will be an equivalent configuration
@@ -139,23 +496,33 @@ class BoardState(object):
     player : int
       Identity of player moving in the range [1, 2]
     move : int
-      Move to apply on the baseline board state in range [0, 8]
+      Move to apply on the baseline board state in range
+      [0, ``CELL_COUNT`` - 1]
     
     Returns
     -------
     BoardState
-      New instance reflecting the player move.
+      Shared instance reflecting the player move.
     """
-    if self._baseline[move] != 0:
+    transition = (self._p1_mask, self._p2_mask, player, move)
+    result = BoardState._transitions.get(transition)
+
+    if result is not None:
+      BoardState._cache_counters['transition_hits'] += 1
+      return result
+
+    if (self._p1_mask | self._p2_mask) & (1 << move):
       raise ValueError(
         'Move ({}) illegal on board [{}]'.format(move, self._baseline)
       )
 
-    new_baseline = []
-    new_baseline.extend(self._baseline)
+    BoardState._cache_counters['transition_misses'] += 1
+    new_baseline = list(self._baseline)
     new_baseline[move] = player
+    result = BoardState.intern(new_baseline)
+    BoardState._transitions[transition] = result
 
-    return BoardState(new_baseline)
+    return result
 
   def adjust_move_to_config(self, baseline_move, config_idx):
     """Translate a board move based on a particular equivalent configuration.
@@ -167,12 +534,13 @@ class BoardState(object):
     Parameters
     ----------
     baseline_move : int
-      Move to be translated in the range [0, 8]
+      Move to be translated in the range [0, ``CELL_COUNT`` - 1]
     config_idx : int
       Index of the configuration to translate the move into, with 0 being the
-      baseline configuration and the range [1, 7] being the alternates.
+      baseline configuration and the rest (up to 7 on a square board) being
+      the alternates.
     """
-    if baseline_move < 0 or baseline_move > self._max_move:
+    if baseline_move < 0 or baseline_move >= BoardState.CELL_COUNT:
       raise ValueError('Invalid move ({})'.format(baseline_move))
 
     if config_idx < 0 or config_idx > len(BoardState.CONFIG_SCHEMAS):
@@ -223,8 +591,20 @@ class BoardState(object):
     bool
       ``True`` if ``other`` is equivalent to this instance; ``False`` otherwise.
     """
+    if other is self:
+      return True
     return isinstance(other, BoardState) and self.matching_config(other) != -1
 
+  def __hash__(self):
+    """Hash the board state based on its canonical key.
+
+    Returns
+    -------
+    int
+      Hash value shared by all equivalent board states.
+    """
+    return hash(self.canonical_code)
+
   def __str__(self):
     """Express baseline state as a string-encoded array.
 
@@ -246,7 +626,11 @@ class BoardState(object):
     bool
       ``True`` if this state is a final state; ``False`` otherwise.
     """
-    return np.any(self.player_victory) or self.full
+    return (
+      BoardState._WINNING_MASK[self._p1_mask] or
+      BoardState._WINNING_MASK[self._p2_mask] or
+      self._rank == BoardState.CELL_COUNT
+    )
 
   @property
   def full(self):
@@ -257,7 +641,7 @@ class BoardState(object):
     bool
       ``True`` if this state represents a full board; ``False`` otherwise.
     """
-    return self._rank == len(BoardState.CONFIG_SCHEMAS[0])
+    return self._rank == BoardState.CELL_COUNT
   
   @property
   def player_victory(self):
@@ -269,7 +653,10 @@ class BoardState(object):
       First element shows whether Player 1 is victorious; second element shows
       whether the second player is victorious. For each ``True`` means victory.
     """
-    return (self._p1_victory, self._p2_victory)
+    return (
+      BoardState._WINNING_MASK[self._p1_mask],
+      BoardState._WINNING_MASK[self._p2_mask]
+    )
 
 class BoardStateDomain(object):
   """Domain of all known board state instances.
@@ -280,6 +667,11 @@ class BoardStateDomain(object):
   first tuple member being the state rank, and the second being a unique index
   within that rank.
 
+  Known states are indexed by their canonical code (see
+  py:attr:: BoardState.canonical_code), so registering or looking up a state
+  takes constant time regardless of how many states are known, and the index
+  holds one small integer per state.
+
   codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
   """
 
@@ -287,6 +679,7 @@ class BoardStateDomain(object):
     """Initialize storage for the known py:class:: BoardState instances
     """
     self._rank_map = {}
+    self._address_map = {}
     self._known_state_count = 0
 
   def state_to_rank_idx_pair(self, board_state):
@@ -303,21 +696,17 @@ class BoardStateDomain(object):
     tuple
       Address containing rank and index.
     """
-    rank_branch = []
+    state_key = board_state.canonical_code
+    result = self._address_map.get(state_key)
 
-    if board_state.rank in self._rank_map:
-      rank_branch = self._rank_map[board_state.rank]
-    else:
-      self._rank_map[board_state.rank] = rank_branch
-
-    try:
-      branch_idx = rank_branch.index(board_state)
-    except ValueError:
-      branch_idx = len(rank_branch)
+    if result is None:
+      rank_branch = self._rank_map.setdefault(board_state.rank, [])
+      result = (board_state.rank, len(rank_branch))
       rank_branch.append(board_state)
+      self._address_map[state_key] = result
       self._known_state_count += 1
 
-    return (board_state.rank, branch_idx)
+    return result
 
   def rank_idx_pair_to_state(self, rank_idx_pair):
     """Obtain the py:class:: BoardState instance assigned the given address.
@@ -362,4 +751,6 @@ class BoardStateDomain(object):
     """
     return self._known_state_count
 
+BoardState.configure()
+
 # vim: set ts=2 sw=2 expandtab:
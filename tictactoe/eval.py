@@ -1,16 +1,145 @@
 import random
+import inspect
+import collections
+from functools import partial
+import numpy as np
 from gabasic import ToolboxContributor
-from . import BoardState, PolicyGene
+from gabasic.parallel import in_pool_chunk
+from . import BoardState, PolicyGene, StateTable
 
 
+# Outcome of exploring a sequence of leaf (final) board states, expressed as a
+# tuple of four counts: leaves explored, losses among them, leaves explored up
+# to and including the last decisive (won or lost) leaf, and losses up to and
+# including that same leaf. The last two are zero if no leaf was decisive.
+NO_LEAVES = (0, 0, 0, 0)
+VICTORY_LEAF = (1, 0, 1, 0)
+DEFEAT_LEAF = (1, 1, 1, 1)
+DRAW_LEAF = (1, 0, 0, 0)
+
+def concat_outcomes(first, second):
+  """Combine the outcomes of two consecutively explored leaf sequences."""
+  if second[2]:
+    return (
+      first[0] + second[0],
+      first[1] + second[1],
+      first[0] + second[2],
+      first[1] + second[3]
+    )
+  return (first[0] + second[0], first[1] + second[1], first[2], first[3])
+
+def outcome_score(outcome):
+  """Score an outcome as the fraction of leaves not lost, counted up to the
+  last decisive leaf.
+  """
+  if not outcome[2]:
+    return 0
+  return (outcome[2] - outcome[3]) / outcome[2]
+
+class TraversalMemo(object):
+  """Record of a py:class:: WinsVsLosses traversal kept on an individual.
+
+  For every board state where the individual's policy was consulted, the memo
+  keeps the action that was taken, the outcome of the subtree rooted at that
+  state, and the states whose subtrees contain it. When the individual is
+  evaluated again, only the subtrees containing a gene whose action changed
+  (or that went missing) are traversed again.
+
+  Attributes
+  ----------
+  outcomes : dict
+    Subtree outcome keyed by the state tuple of the subtree root.
+  actions : dict
+    Action taken keyed by state tuple.
+  parents : dict
+    ``frozenset`` of state tuples whose subtrees directly contain the keyed
+    state tuple.
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
+  def __init__(self):
+    super(TraversalMemo, self).__init__()
+    self.outcomes = {}
+    self.actions = {}
+    self.parents = {}
+
+  def __deepcopy__(self, memo):
+    # Every value held is immutable, so copying the containers is enough.
+    result = TraversalMemo()
+    result.outcomes = dict(self.outcomes)
+    result.actions = dict(self.actions)
+    result.parents = dict(self.parents)
+    return result
+
+  def add_parent(self, state_tuple, parent_tuple):
+    parents = self.parents.get(state_tuple, frozenset())
+    if parent_tuple not in parents:
+      self.parents[state_tuple] = parents | {parent_tuple}
+
+  def invalidate(self, individual):
+    """Forget the outcome of every subtree affected by a changed gene.
+
+    Parameters
+    ----------
+    individual : dict
+      Individual (as it is now) the memo was recorded for.
+
+    Returns
+    -------
+    int
+      Number of subtree outcomes forgotten.
+    """
+    pending = [
+      state_tuple for state_tuple, action in self.actions.items()
+      if state_tuple not in individual or
+        individual[state_tuple].action != action
+    ]
+    stale = set()
+
+    while pending:
+      state_tuple = pending.pop()
+      if state_tuple not in stale:
+        stale.add(state_tuple)
+        pending.extend(self.parents.get(state_tuple, ()))
+
+    for state_tuple in stale:
+      self.outcomes.pop(state_tuple, None)
+      self.actions.pop(state_tuple, None)
+
+    return len(stale)
+
 class WinsVsLosses(ToolboxContributor):
+  """Fitness evaluation that plays a policy against every possible opponent.
+
+  The policy plays both going first and going second, and the opponent tries
+  every legal move available to it. Genes are added to the policy with a
+  random action whenever it reaches a board state it has no gene for.
+
+  The outcome of every subtree explored is recorded on the individual (as a
+  py:class:: TraversalMemo under the ``traversal_memo`` attribute), so
+  re-evaluating an individual after mutation or crossover only explores the
+  subtrees rooted at genes that actually changed. The resulting score is the
+  same as that of a full traversal.
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
   def __init__(self, **kwargs):
     super(WinsVsLosses, self).__init__()
-  
+
   def configure_toolbox(self, toolbox):
     toolbox.register('evaluate', self)
-  
+
   def __call__(self, individual):
+    if not isinstance(individual, collections.abc.MutableMapping):
+      raise TypeError('WinsVsLosses requires a mapping individual')
+    memo = getattr(individual, 'traversal_memo', None)
+    if memo is None:
+      individual.traversal_memo = TraversalMemo()
+    else:
+      memo.invalidate(individual)
+
     result = self.player_first(individual)
     result += self.opponent_first(individual)
 
@@ -28,84 +157,710 @@ class WinsVsLosses(ToolboxContributor):
 
     Opponent is able to execute all possible moves for a particular board state.
     """
-    result = 0
-    lost = 0
-    total = 1
-
-    while fringe:
-      board_state = fringe.pop()
-
-      # Point based evaluation going first
-      # if board_state.final and first:
-      #   # Victory: +10 score
-      #   # Defeat: 0 score
-      #   # Draw: +5 score
-      #   if board_state.player_victory[0]:
-      #     result += 10
-      #   elif board_state.player_victory[1]:
-      #     result += 0
-      #   else:
-      #     result += 5
-
-      #   continue
-      # # Point based evaluation going second
-      # elif board_state.final:
-      #   # Victory: +15 score
-      #   # Defeat: 0 score
-      #   # Draw: +10 score
-      #   if board_state.player_victory[0]:
-      #     result += 15
-      #   elif board_state.player_victory[1]:
-      #     result += 0
-      #   else:
-      #     result += 10
-
-      #   continue 
-      # Precentage based evalutation
+    memo = getattr(individual, 'traversal_memo', None)
+    if memo is None:
+      memo = TraversalMemo()
+
+    outcome = self._fringe_outcome(individual, memo, fringe, None)
+
+    return outcome_score(outcome)
+
+  def _fringe_outcome(self, individual, memo, fringe, parent_tuple):
+    """Combined outcome of exploring a fringe, last board state first."""
+    result = NO_LEAVES
+
+    for board_state in reversed(fringe):
       if board_state.final:
+        # Leaves are counted towards the percentage based score (see
+        # outcome_score).
         if board_state.player_victory[0]:
-          result = (total - lost) / total
+          leaf_outcome = VICTORY_LEAF
         elif board_state.player_victory[1]:
-          lost += 1
-          result = (total - lost) / total
+          leaf_outcome = DEFEAT_LEAF
+        else:
+          leaf_outcome = DRAW_LEAF
+        result = concat_outcomes(result, leaf_outcome)
+      else:
+        result = concat_outcomes(
+          result,
+          self._policy_outcome(individual, memo, board_state, parent_tuple)
+        )
 
-        total += 1
-        continue 
+    return result
 
-      # Our move
-      state_addr = PolicyGene.state_domain.state_to_rank_idx_pair(board_state)
-      board_state = PolicyGene.state_domain.rank_idx_pair_to_state(state_addr)
+  def _policy_outcome(self, individual, memo, board_state, parent_tuple):
+    """Outcome of the subtree where the policy moves at ``board_state``."""
+    # Our move
+    state_addr = PolicyGene.state_domain.state_to_rank_idx_pair(board_state)
 
-      if state_addr not in individual:
-        individual[state_addr] = PolicyGene(
-          state_addr,
-          random.choice(board_state.legal_moves())
-        )
-      board_state = board_state.after_move(1, individual[state_addr].action)
-
-      # Opponent move
-      if not board_state.final:
-        state_addr = PolicyGene.state_domain.state_to_rank_idx_pair(board_state)
-        board_state = PolicyGene.state_domain.rank_idx_pair_to_state(state_addr)
-        fringe.extend(
-          [
-            board_state.after_move(2, a_move)
-            for a_move in board_state.legal_moves()
-          ]
-        )
+    if parent_tuple is not None:
+      memo.add_parent(state_addr, parent_tuple)
+
+    result = memo.outcomes.get(state_addr)
+    if result is not None:
+      return result
+
+    board_state = PolicyGene.state_domain.rank_idx_pair_to_state(state_addr)
+
+    if state_addr not in individual:
+      individual[state_addr] = PolicyGene(
+        state_addr,
+        random.choice(board_state.legal_move_tuple)
+      )
+    action = individual[state_addr].action
+    board_state = board_state.after_move(1, action)
+    result = NO_LEAVES
+
+    # Opponent move
+    if not board_state.final:
+      opponent_addr = PolicyGene.state_domain.state_to_rank_idx_pair(
+        board_state
+      )
+      board_state = PolicyGene.state_domain.rank_idx_pair_to_state(
+        opponent_addr
+      )
+      result = self._fringe_outcome(
+        individual,
+        memo,
+        [
+          board_state.after_move(2, a_move)
+          for a_move in board_state.legal_move_tuple
+        ],
+        state_addr
+      )
+
+    memo.outcomes[state_addr] = result
+    memo.actions[state_addr] = action
 
     return result
 
   def opponent_first(self, individual):
-    initial_state = BoardState([0, 0, 0, 0, 0, 0, 0, 0, 0])
+    initial_state = BoardState.empty()
     fringe = [
       initial_state.after_move(2, a_move)
-      for a_move in initial_state.legal_moves()
+      for a_move in initial_state.legal_move_tuple
     ]
     return self._traverse_tree(individual, fringe, False)
 
   def player_first(self, individual):
-    fringe = [BoardState([0, 0, 0, 0, 0, 0, 0, 0, 0]),]
+    fringe = [BoardState.empty(),]
     return self._traverse_tree(individual, fringe, True)
 
+# Outcomes packed into a single 64-bit integer, 16 bits per count, with the
+# first count in the least significant bits. Every count is bounded by the
+# number of leaves in a game tree (see py:func:: max_leaf_count; 945 on the
+# 3 x 3 board), so fields never overflow on boards of up to 12 cells.
+PACKED_FIELD_BITS = 16
+PACKED_LOW_MASK = (1 << (2 * PACKED_FIELD_BITS)) - 1
+
+def max_leaf_count(cell_count):
+  """Most leaves a policy's game tree may have on a board of ``cell_count``
+  cells: the product of the opponent's choices when it moves first and no
+  game ends before the board is full.
+  """
+  result = 1
+  for a_choice_count in range(cell_count, 0, -2):
+    result *= a_choice_count
+  return result
+
+def pack_outcome(outcome):
+  """Pack an outcome tuple into an integer."""
+  result = 0
+  for field_idx, a_count in enumerate(outcome):
+    result |= a_count << (field_idx * PACKED_FIELD_BITS)
+  return result
+
+def concat_packed_outcomes(first, second):
+  """Element-wise py:func:: concat_outcomes over arrays of packed outcomes."""
+  decisive = (second >> (2 * PACKED_FIELD_BITS)) != 0
+  return ((first + second) & PACKED_LOW_MASK) | np.where(
+    decisive,
+    ((first & PACKED_LOW_MASK) << (2 * PACKED_FIELD_BITS)) +
+      (second & ~PACKED_LOW_MASK),
+    first & ~PACKED_LOW_MASK
+  )
+
+def packed_outcome_scores(outcomes):
+  """Element-wise py:func:: outcome_score over an array of packed outcomes."""
+  field_mask = (1 << PACKED_FIELD_BITS) - 1
+  decisive_count = (outcomes >> (2 * PACKED_FIELD_BITS)) & field_mask
+  decisive_losses = (outcomes >> (3 * PACKED_FIELD_BITS)) & field_mask
+  return np.where(
+    decisive_count > 0,
+    (decisive_count - decisive_losses) / np.maximum(decisive_count, 1),
+    0.0
+  )
+
+class BatchWinsVsLosses(ToolboxContributor):
+  """Fitness evaluation equivalent to py:class:: WinsVsLosses that scores a
+  whole population at once.
+
+  The policies of the population are encoded as a matrix of actions with one
+  row per individual and one column per state in the py:class:: StateTable.
+  Exploration of the game tree then happens rank by rank over the table's
+  state graph using NumPy operations on the whole matrix: first from the
+  lowest rank up, to discover which states each policy reaches (adding genes
+  with a random action where a reached state has none), and then from the
+  highest rank down, composing subtree outcomes exactly as
+  py:class:: WinsVsLosses does. Scores are identical to those of
+  py:class:: WinsVsLosses for policies that already hold a gene for every
+  state they reach; genes added at random are drawn in a different order.
+
+  The evaluator requires the board state domain to be backed by a state
+  table, either by configuring ``state_table`` in the
+  ``tictactoe.TicTacToeChromo`` section, or by configuring it under the
+  evaluator's own section. It also accepts the array individuals of
+  py:class:: TicTacToeArrayChromo, which always come with a table.
+
+  Besides registering itself as ``evaluate``, the evaluator replaces the
+  toolbox ``map`` so that whenever the algorithm maps ``evaluate`` over a set
+  of individuals, all of them are scored in one batch. Every other use of
+  ``map`` goes to the previously registered implementation.
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
+  def __init__(self, **kwargs):
+    super(BatchWinsVsLosses, self).__init__()
+    state_table_path = kwargs.get('state_table')
+    if state_table_path is not None:
+      state_table = StateTable.open(state_table_path)
+      if PolicyGene.state_table is not state_table:
+        PolicyGene.state_table = state_table
+        PolicyGene.state_domain = state_table.to_domain()
+    self._state_table = None
+    self._fallback_map = map
+
+  def configure_toolbox(self, toolbox):
+    self._fallback_map = toolbox.map
+    toolbox.register('evaluate', self)
+    toolbox.register('map', self.map)
+
+  def __call__(self, individual):
+    return self.evaluate_population([individual])[0]
+
+  def map(self, func, *iterables):
+    """Map a function over iterables, batching evaluations.
+
+    Parameters
+    ----------
+    func : callable
+      Function to map; if it is this evaluator (or the toolbox alias for it,
+      possibly wrapped), every individual in the single iterable is scored in
+      one batch.
+    iterables
+      Iterables to map ``func`` over.
+
+    Returns
+    -------
+    iterable
+      Results of applying ``func``.
+    """
+    if self._is_batch(func, iterables):
+      return self.evaluate_population(list(iterables[0]))
+    return self._fallback_map(func, *iterables)
+
+  def _is_batch(self, func, iterables):
+    """Whether mapping ``func`` over ``iterables`` scores a population."""
+    # Operators may be wrapped (e.g., while profiling; see
+    # ``gabasic.profiling.OperatorTimer``).
+    target = inspect.unwrap(func)
+    if isinstance(target, partial) and not (target.args or target.keywords):
+      target = inspect.unwrap(target.func)
+    return target is self and len(iterables) == 1
+
+  def _prepare(self):
+    """Derive the state graph arrays from the domain's state table."""
+    state_table = PolicyGene.state_table
+    if state_table is None:
+      raise RuntimeError(
+        '{} requires a board state domain backed by a state '
+        'table.'.format(type(self).__name__)
+      )
+    if state_table is self._state_table:
+      return
+
+    self._derive_arrays(state_table)
+    self._rank_offsets = [
+      state_table.state_id((a_rank, 0))
+      for a_rank in range(state_table.cell_count + 1)
+    ]
+    self._state_table = state_table
+
+  def _derive_arrays(self, state_table):
+    """Derive the arrays scoring policies needs from a state table."""
+    records = state_table.records
+    state_count = state_table.state_count
+    player_children = np.array(records['child'][:, 0, :], dtype=np.int64)
+    opponent_children = np.array(
+      records['child'][:, 1, ::-1],
+      dtype=np.int64
+    )
+    final = np.array(records['final'])
+    winner = np.array(records['winner'])
+
+    # Opponent replies in the order the depth-first traversal explores them
+    # (last legal move first). Missing replies are moved to the end and point
+    # at an extra "sink" state past the end of the table, whose outcome is
+    # always NO_LEAVES.
+    for a_row in opponent_children:
+      a_row[:] = sorted(a_row, key=lambda a_child: a_child < 0)
+    opponent_children[opponent_children < 0] = state_count
+
+    leaf_outcomes = np.zeros(state_count + 1, dtype=np.int64)
+    leaf_outcomes[:-1][final & (winner == 1)] = pack_outcome(VICTORY_LEAF)
+    leaf_outcomes[:-1][final & (winner == 2)] = pack_outcome(DEFEAT_LEAF)
+    leaf_outcomes[:-1][final & (winner == 0)] = pack_outcome(DRAW_LEAF)
+
+    policy_states = (~final) & np.any(player_children >= 0, axis=1)
+    first_legal = np.argmax(player_children >= 0, axis=1)
+    ranks = np.array(records['rank'])
+
+    self._player_children = player_children
+    self._opponent_children = opponent_children
+    self._leaf_outcomes = leaf_outcomes
+    self._first_legal = first_legal
+    self._rank_policy_states = [
+      np.flatnonzero(policy_states & (ranks == a_rank))
+      for a_rank in range(state_table.cell_count + 1)
+    ]
+    self._opening_replies = opponent_children[0][
+      opponent_children[0] < state_count
+    ]
+
+  def _action_matrix(self, individuals):
+    """Encode policies as a matrix of actions, ``-1`` marking no gene."""
+    result = np.full(
+      (len(individuals), self._state_table.state_count),
+      -1,
+      dtype=np.int64
+    )
+    rank_offsets = self._rank_offsets
+    for indiv_idx, an_indiv in enumerate(individuals):
+      if isinstance(an_indiv, np.ndarray):
+        result[indiv_idx] = an_indiv
+        continue
+      state_ids = [
+        rank_offsets[rank] + branch_idx for rank, branch_idx in an_indiv
+      ]
+      result[indiv_idx, state_ids] = [
+        a_gene.action for a_gene in an_indiv.values()
+      ]
+    return result
+
+  def _complete_policies(self, individuals, actions):
+    """Add genes with a random action wherever a policy reaches a state it
+    has no gene for, and return which states each policy reaches.
+    """
+    indiv_count = len(individuals)
+    reached = np.zeros(
+      (indiv_count, self._state_table.state_count + 1),
+      dtype=bool
+    )
+    reached[:, 0] = True
+    reached[:, self._opening_replies] = True
+    flat_reached = reached.reshape(-1)
+    row_starts = (np.arange(indiv_count) * reached.shape[1])[:, np.newaxis]
+
+    for rank_states in self._rank_policy_states:
+      if not len(rank_states):
+        continue
+      rank_actions = actions[:, rank_states]
+      rank_reached = reached[:, rank_states]
+
+      missing = np.argwhere(rank_reached & (rank_actions < 0))
+      for indiv_idx, state_pos in missing:
+        state_id = int(rank_states[state_pos])
+        state_addr = self._state_table.rank_idx_pair(state_id)
+        board_state = PolicyGene.state_domain.rank_idx_pair_to_state(
+          state_addr
+        )
+        action = random.choice(board_state.legal_move_tuple)
+        if isinstance(individuals[indiv_idx], np.ndarray):
+          individuals[indiv_idx][state_id] = action
+        else:
+          individuals[indiv_idx][state_addr] = PolicyGene(state_addr, action)
+        actions[indiv_idx, state_id] = action
+        rank_actions[indiv_idx, state_pos] = action
+
+      rank_actions = np.where(
+        rank_actions < 0,
+        self._first_legal[rank_states],
+        rank_actions
+      )
+      after_move = self._player_children[rank_states, rank_actions]
+      replies = self._opponent_children[after_move]
+      reply_idxs = row_starts[:, :, np.newaxis] + replies
+      flat_reached[reply_idxs[rank_reached]] = True
+
+    return reached
+
+  def evaluate_population(self, individuals):
+    """Score every individual in a population.
+
+    Parameters
+    ----------
+    individuals : list
+      Policies to score; genes are added to them for every state they reach
+      but have no gene for.
+
+    Returns
+    -------
+    list
+      Fitness tuple of each individual.
+    """
+    if not individuals:
+      return []
+    self._prepare()
+    if max_leaf_count(self._state_table.cell_count) >> PACKED_FIELD_BITS:
+      raise ValueError(
+        'BatchWinsVsLosses cannot count the outcomes of boards with more '
+        'than 12 cells.'
+      )
+    actions = self._action_matrix(individuals)
+    self._complete_policies(individuals, actions)
+
+    indiv_count = len(individuals)
+    column_count = self._state_table.state_count + 1
+    outcomes = np.tile(self._leaf_outcomes, indiv_count)
+    row_starts = (np.arange(indiv_count) * column_count)[:, np.newaxis]
+
+    for rank_states in reversed(self._rank_policy_states):
+      if not len(rank_states):
+        continue
+      rank_actions = actions[:, rank_states]
+      rank_actions = np.where(
+        rank_actions < 0,
+        self._first_legal[rank_states],
+        rank_actions
+      )
+      after_move = self._player_children[rank_states, rank_actions]
+      replies = self._opponent_children[after_move]
+      rank_outcomes = np.zeros(rank_actions.shape, dtype=np.int64)
+      for reply_pos in range(replies.shape[-1]):
+        rank_outcomes = concat_packed_outcomes(
+          rank_outcomes,
+          outcomes.take(row_starts + replies[:, :, reply_pos])
+        )
+      outcomes[(row_starts + rank_states).ravel()] = rank_outcomes.ravel()
+
+    outcomes = outcomes.reshape(indiv_count, column_count)
+    player_first = outcomes[:, 0]
+    opponent_first = np.zeros(indiv_count, dtype=np.int64)
+    for a_reply in self._opening_replies:
+      opponent_first = concat_packed_outcomes(
+        opponent_first,
+        outcomes[:, a_reply]
+      )
+    scores = (
+      packed_outcome_scores(player_first) +
+      packed_outcome_scores(opponent_first)
+    )
+
+    return [(float(a_score),) for a_score in scores]
+
+def best_moves(state_table):
+  """Best move of each player at every state of a state table.
+
+  Moves are found by backward induction over the table's state graph, from
+  the highest rank down, with the first player maximizing and the second
+  player minimizing the final outcome (won, drawn or lost by the first
+  player). Ties go to the lowest move.
+
+  Parameters
+  ----------
+  state_table : StateTable
+    Table to find moves in.
+
+  Returns
+  -------
+  numpy.ndarray
+    Two rows (one per player) with the best move (as laid out in the
+    canonical configuration) at each state; ``-1`` where the player cannot
+    move.
+  """
+  records = state_table.records
+  children = records['child']
+  final = np.array(records['final'])
+  winner = np.array(records['winner'])
+  ranks = np.array(records['rank'])
+  # Value of each state for the first player, with each player to move.
+  outcomes = np.where(winner == 1, 1, np.where(winner == 2, -1, 0))
+  values = np.tile(outcomes, (2, 1))
+  result = np.full((2, state_table.state_count), -1, dtype=np.int64)
+
+  for a_rank in range(state_table.cell_count, -1, -1):
+    rank_states = np.flatnonzero((ranks == a_rank) & ~final)
+    for player_idx, pick, worst in ((0, np.argmax, -2), (1, np.argmin, 2)):
+      rank_children = children[rank_states, player_idx]
+      legal = rank_children >= 0
+      child_values = np.where(
+        legal,
+        values[1 - player_idx][rank_children],
+        worst
+      )
+      moves = pick(child_values, axis=1)
+      can_move = np.any(legal, axis=1)
+      values[player_idx][rank_states] = np.where(
+        can_move,
+        child_values[np.arange(len(rank_states)), moves],
+        0
+      )
+      result[player_idx][rank_states] = np.where(can_move, moves, -1)
+
+  return result
+
+class SampledWinsVsLosses(BatchWinsVsLosses):
+  """Fitness evaluation that plays a sample of randomized games instead of
+  every possible game.
+
+  Each policy plays ``games`` games going first and as many going second
+  against an opponent that either moves at random (``opponent=random``, the
+  default) or plays its best reply except for a random move with probability
+  ``epsilon`` (``opponent=epsilon_greedy``). The score is the fraction of
+  games not lost going first plus that going second, which, like the score of
+  py:class:: WinsVsLosses, ranges from 0 to 2.
+
+  The whole population is scored at once, one ply of every game at a time,
+  over the state graph of the py:class:: StateTable and a table of the
+  opponent's best moves (see py:func:: best_moves), so each move costs
+  a few array lookups. Genes are added to the policy with a random action
+  whenever it reaches a board state it has no gene for.
+
+  The opponent's random choices are common to every individual of a
+  generation, so they are compared on the same games. They are drawn from a
+  NumPy generator seeded with ``games_seed`` (default 0) and the generation,
+  and are therefore independent of the GA's own random numbers. The number of
+  games per opening is multiplied by ``games_growth`` (default 1, no growth)
+  for every generation, up to ``max_games`` (default 1000). A generation ends
+  with every population scored through the toolbox ``map``; individuals
+  scored on their own (through the toolbox ``evaluate``, or
+  py:meth:: evaluate_population) play the games of the generation under way,
+  scoring as they would within the population. Since scores depend on the
+  generation, it is saved in checkpoints; island runs count the generations
+  of each island, and restart counting when resumed.
+
+  Batches must not be split, so the evaluator cannot be combined with the
+  ``workers`` key, and scores must not be reused in later generations, so it
+  cannot be combined with the ``fitness_cache_size`` key either. The state
+  table is configured as for py:class:: BatchWinsVsLosses.
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
+  OPPONENTS = ('random', 'epsilon_greedy')
+
+  # Scores of a generation are only comparable with each other.
+  cacheable_fitness = False
+
+  def __init__(self, **kwargs):
+    super(SampledWinsVsLosses, self).__init__(**kwargs)
+    self.games = int(kwargs.get('games', '50'))
+    self.games_growth = float(kwargs.get('games_growth', '1'))
+    self.max_games = int(kwargs.get('max_games', '1000'))
+    self.games_seed = int(kwargs.get('games_seed', '0'))
+    self.opponent = kwargs.get('opponent', 'random')
+    self.epsilon = float(kwargs.get('epsilon', '0.1'))
+    if self.games < 1 or self.max_games < self.games:
+      raise ValueError(
+        'Sampled games must be at least 1 and at most max_games.'
+      )
+    if self.games_growth < 1.0:
+      raise ValueError('games_growth must be at least 1.')
+    if self.opponent not in SampledWinsVsLosses.OPPONENTS:
+      raise ValueError(
+        'Unknown opponent "{}"; expected one of: {}'.format(
+          self.opponent,
+          ', '.join(SampledWinsVsLosses.OPPONENTS)
+        )
+      )
+    if not 0.0 <= self.epsilon <= 1.0:
+      raise ValueError('epsilon must be between 0 and 1.')
+    self.generation = 0
+
+  def checkpoint_state(self):
+    return {'generation': self.generation}
+
+  def restore_checkpoint_state(self, state):
+    self.generation = state['generation']
+
+  def generation_games(self, generation):
+    """Number of games per opening played in a generation."""
+    return min(
+      self.max_games,
+      int(round(self.games * self.games_growth ** generation))
+    )
+
+  def map(self, func, *iterables):
+    if in_pool_chunk():
+      raise RuntimeError(
+        'SampledWinsVsLosses cannot split evaluation batches among workers.'
+      )
+    if not self._is_batch(func, iterables):
+      return self._fallback_map(func, *iterables)
+    result = self.evaluate_population(list(iterables[0]))
+    self.generation += 1
+    return result
+
+  def _derive_arrays(self, state_table):
+    # Child state ids are read from the table as they are, so the largest
+    # tables are not copied.
+    records = state_table.records
+    self._move_children = records['child']
+    self._final = np.array(records['final'])
+    self._winner = np.array(records['winner'])
+    (self._legal_moves, self._legal_counts) = state_table.legal_moves
+    self._best_replies = best_moves(state_table)[1]
+
+  def _opponent_moves(self, states, choice_draws, explore_draws):
+    """Moves the opponent makes at each of ``states``."""
+    counts = self._legal_counts[states]
+    result = self._legal_moves[
+      states,
+      np.minimum((choice_draws * counts).astype(np.int64), counts - 1)
+    ]
+    if self.opponent == 'epsilon_greedy':
+      result = np.where(
+        explore_draws < self.epsilon,
+        result,
+        self._best_replies[states]
+      )
+    return result
+
+  def _policy_entries(self, individuals):
+    """Encode policies as sorted arrays of keys (``individual index * state
+    count + state id``) and actions, one entry per gene.
+
+    Unlike the action matrix of py:class:: BatchWinsVsLosses, these take
+    memory in proportion to the genes held, not to the states in the table.
+    """
+    state_count = self._state_table.state_count
+    rank_offsets = self._rank_offsets
+    keys = []
+    actions = []
+    for indiv_idx, an_indiv in enumerate(individuals):
+      key_base = indiv_idx * state_count
+      if isinstance(an_indiv, np.ndarray):
+        state_ids = np.flatnonzero(np.asarray(an_indiv) >= 0)
+        keys.append(key_base + state_ids)
+        actions.append(np.asarray(an_indiv)[state_ids])
+        continue
+      keys.append(key_base + np.array([
+        rank_offsets[rank] + branch_idx for rank, branch_idx in an_indiv
+      ], dtype=np.int64))
+      actions.append(np.array(
+        [a_gene.action for a_gene in an_indiv.values()],
+        dtype=np.int64
+      ))
+    keys = np.concatenate(keys).astype(np.int64)
+    order = np.argsort(keys)
+    return [keys[order], np.concatenate(actions).astype(np.int64)[order]]
+
+  def _policy_moves(self, individuals, entries, indiv_idxs, states):
+    """Moves each policy makes at each of ``states``, adding genes with a
+    random action (and their entries) where a policy has none.
+    """
+    state_count = self._state_table.state_count
+    wanted = indiv_idxs * state_count + states
+    (keys, actions) = entries
+    positions = np.minimum(np.searchsorted(keys, wanted), len(keys) - 1)
+    found = (keys[positions] == wanted) if len(keys) else (wanted < 0)
+    if np.all(found):
+      return actions[positions]
+
+    added_keys = np.unique(wanted[~found])
+    added_actions = np.empty(len(added_keys), dtype=np.int64)
+    for added_idx, a_key in enumerate(added_keys.tolist()):
+      (indiv_idx, state_id) = divmod(a_key, state_count)
+      state_addr = self._state_table.rank_idx_pair(state_id)
+      board_state = PolicyGene.state_domain.rank_idx_pair_to_state(state_addr)
+      action = random.choice(board_state.legal_move_tuple)
+      if isinstance(individuals[indiv_idx], np.ndarray):
+        individuals[indiv_idx][state_id] = action
+      else:
+        individuals[indiv_idx][state_addr] = PolicyGene(state_addr, action)
+      added_actions[added_idx] = action
+    keys = np.concatenate((keys, added_keys))
+    order = np.argsort(keys, kind='stable')
+    entries[:] = [keys[order], np.concatenate((actions, added_actions))[order]]
+    return self._policy_moves(individuals, entries, indiv_idxs, states)
+
+  def evaluate_population(self, individuals):
+    """Score every individual in a population on the games of the generation
+    under way, without ending it (see py:meth:: map).
+
+    Parameters
+    ----------
+    individuals : list
+      Policies to score; genes are added to them for every state they reach
+      but have no gene for.
+
+    Returns
+    -------
+    list
+      Fitness tuple of each individual.
+    """
+    if not individuals:
+      return []
+    self._prepare()
+    entries = self._policy_entries(individuals)
+    games = self.generation_games(self.generation)
+    rng = np.random.default_rng([self.games_seed, self.generation])
+
+    # One column per game: the first ``games`` with the policy going first,
+    # the rest with the opponent going first. Each of the opponent's moves
+    # takes a pair of draws from the same column for every individual: the
+    # opening from the first row of draws, and the reply to the policy's
+    # n-th move from row n.
+    draw_count = self._state_table.cell_count // 2 + 2
+    choice_draws = rng.random((2 * games, draw_count))
+    explore_draws = rng.random((2 * games, draw_count))
+    openings = self._opponent_moves(
+      np.zeros(games, dtype=np.int64),
+      choice_draws[games:, 0],
+      explore_draws[games:, 0]
+    )
+    start_states = np.concatenate((
+      np.zeros(games, dtype=np.int64),
+      self._move_children[0, 1, openings]
+    ))
+    states = np.tile(start_states, (len(individuals), 1))
+    indiv_idxs = np.repeat(
+      np.arange(len(individuals))[:, np.newaxis],
+      2 * games,
+      axis=1
+    )
+    game_idxs = np.tile(np.arange(2 * games), (len(individuals), 1))
+
+    for draw_idx in range(1, draw_count):
+      active = ~self._final[states]
+      if not np.any(active):
+        break
+      active_states = states[active]
+      moves = self._policy_moves(
+        individuals,
+        entries,
+        indiv_idxs[active],
+        active_states
+      )
+      states[active] = self._move_children[active_states, 0, moves]
+
+      active = ~self._final[states]
+      active_states = states[active]
+      active_games = game_idxs[active]
+      moves = self._opponent_moves(
+        active_states,
+        choice_draws[active_games, draw_idx],
+        explore_draws[active_games, draw_idx]
+      )
+      states[active] = self._move_children[active_states, 1, moves]
+
+    not_lost = self._winner[states] != 2
+    scores = (
+      np.mean(not_lost[:, :games], axis=1) +
+      np.mean(not_lost[:, games:], axis=1)
+    )
+
+    return [(float(a_score),) for a_score in scores]
+
 # vim: set ts=2 sw=2 expandtab:
@@ -1,6 +1,8 @@
 import random
+import collections
+import numpy as np
 from gabasic import ToolboxContributor
-from tictactoe import TicTacToeChromo, PolicyGene
+from tictactoe import TicTacToeChromo, TicTacToeArrayChromo, PolicyGene
 
 
 class ChangeActionMutation(ToolboxContributor):
@@ -9,19 +11,59 @@ class ChangeActionMutation(ToolboxContributor):
     self.indiv_gene_mut_prob = float(kwargs.get('indiv_gene_mut_prob', '0.05'))
 
   def __call__(self, individual):
-    if not isinstance(individual, dict):
+    if not isinstance(individual, collections.abc.MutableMapping):
       raise TypeError(
-        'ChangeActionMutation requires a dict individual'
+        'ChangeActionMutation requires a mapping individual'
       )
 
-    for a_value in individual.values():
+    # Mutated genes are replaced rather than changed, since genes may be
+    # shared with other individuals (see TicTacToeSharedChromo).
+    for state_tuple, a_value in individual.items():
       if random.random() <= self.indiv_gene_mut_prob:
         board_state = PolicyGene.state_domain.rank_idx_pair_to_state(
           a_value.state_tuple
         )
-        new_action = random.choice(board_state.legal_moves())
-        a_value.action = new_action
-        
+        new_action = random.choice(board_state.legal_move_tuple)
+        individual[state_tuple] = PolicyGene(state_tuple, new_action)
+
+    return (individual,)
+
+  def configure_toolbox(self, toolbox):
+    toolbox.register('mutate', self)
+
+class ArrayChangeActionMutation(ToolboxContributor):
+  """Counterpart of py:class:: ChangeActionMutation for individuals created by
+  py:class:: TicTacToeArrayChromo.
+
+  Every gene present in the individual is independently selected with
+  probability ``indiv_gene_mut_prob``, and each selected gene is given a legal
+  action drawn at random, all using NumPy operations over the whole array.
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
+  def __init__(self, **kwargs):
+    super(ArrayChangeActionMutation, self).__init__()
+    self.indiv_gene_mut_prob = float(kwargs.get('indiv_gene_mut_prob', '0.05'))
+
+  def __call__(self, individual):
+    if not isinstance(individual, np.ndarray):
+      raise TypeError(
+        'ArrayChangeActionMutation requires an array individual'
+      )
+
+    (legal_moves, legal_move_counts) = PolicyGene.state_table.legal_moves
+    state_ids = np.flatnonzero(
+      individual != TicTacToeArrayChromo.UNSET_ACTION
+    )
+    state_ids = state_ids[
+      np.random.random_sample(len(state_ids)) <= self.indiv_gene_mut_prob
+    ]
+    move_idxs = (
+      np.random.random_sample(len(state_ids)) * legal_move_counts[state_ids]
+    ).astype(np.intp)
+    individual[state_ids] = legal_moves[state_ids, move_idxs]
+
     return (individual,)
 
   def configure_toolbox(self, toolbox):
@@ -1,10 +1,14 @@
 # pylint: disable=no-member
 
+import copy
 import types
 import random
+import numpy as np
 from deap import tools, creator
-from gabasic import ToolboxContributor
-from . import BoardState, BoardStateDomain
+from gabasic import ToolboxContributor, ChunkedMapping
+from gabasic.indivs import copy_attributes
+from . import BoardState, BoardStateDomain, StateTable
+from .sampler import StateSampler
 
 
 class PolicyGene(object):
@@ -24,11 +28,20 @@ class PolicyGene(object):
   action : int
     Action that must be taken whenever the board state is as shown by the
     ``state_tuple`` attribute.
+
+  The class-level ``state_domain`` attribute holds the
+  py:class::BoardStateDomain shared by all genes. When the domain was created
+  from a precomputed py:class::StateTable, the class-level ``state_table``
+  attribute holds that table; otherwise it is ``None``.
+
+  Genes are shared by the clones of an individual, so they are never changed
+  in place; a gene whose action changes is replaced by a new one.
   
   codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
   """
 
   state_domain = None
+  state_table = None
 
   def __init__(self, state_tuple, action):
     """Initialize the gene instance with the information provided.
@@ -51,7 +64,8 @@ class PolicyGene(object):
     values.
 
     Despite the fact that the gene information is randomly-generated, care is
-    taken so that it is a valid state-action pair.
+    taken so that it is a valid state-action pair. The board state is drawn
+    from a py:class:: StateSampler, so it takes constant time.
 
     Returns
     -------
@@ -67,21 +81,7 @@ class PolicyGene(object):
     if cls.state_domain is None:
       raise RuntimeError('State domain not initialized.')
 
-    found = False
-
-    while not found:
-      target_rank = random.randint(0, 8)
-      next_player = 1
-      board_state = BoardState([0, 0, 0, 0, 0, 0, 0, 0, 0])
-
-      while target_rank > 0:
-        legal_moves = board_state.legal_moves()
-        next_move = random.choice(legal_moves)
-        board_state = board_state.after_move(next_player, next_move)
-        next_player = 2 if next_player == 1 else 1
-        target_rank -= 1
-
-      found = not board_state.final
+    board_state = StateSampler.shared().sample()
 
     # Register board state that we are happy with
     state_tuple = cls.state_domain.state_to_rank_idx_pair(board_state)
@@ -91,13 +91,90 @@ class PolicyGene(object):
     board_state = cls.state_domain.rank_idx_pair_to_state(state_tuple)
 
     # Select a valid action at random from the board state
-    action = random.choice(board_state.legal_moves())
+    action = random.choice(board_state.legal_move_tuple)
 
     return PolicyGene(state_tuple, action)
 
+  @classmethod
+  def new_random_batch(cls, count):
+    """Create many py:class:: PolicyGene instances with randomly-generated
+    values in one call.
+
+    Genes follow the same distribution as those created by py:meth::
+    new_random, but board states and actions are drawn for all of them at
+    once using NumPy's RNG, and each distinct board state is looked up in the
+    domain only once. On boards too large for py:class:: StateSampler, genes
+    are created one by one with py:meth:: new_random.
+
+    Parameters
+    ----------
+    count : int
+      Number of genes to create.
+
+    Returns
+    -------
+    list
+      New randomly-generated py:class::PolicyGene instances.
+
+    Raises
+    ------
+    RuntimeError
+      If the ``state_domain`` class attribute has not been previously
+      initialized.
+    """
+    if cls.state_domain is None:
+      raise RuntimeError('State domain not initialized.')
+
+    sampler = StateSampler.shared()
+    if not isinstance(sampler, StateSampler):
+      return [cls.new_random() for _ in range(count)]
+    board_idxs = sampler.sample_indices(count)
+    action_draws = np.random.random_sample(count)
+    (unique_idxs, inverse) = np.unique(board_idxs, return_inverse=True)
+    state_tuples = []
+    legal_moves = []
+    for board_idx in unique_idxs:
+      state_tuple = cls.state_domain.state_to_rank_idx_pair(
+        sampler.board_state(board_idx)
+      )
+      state_tuples.append(state_tuple)
+      legal_moves.append(
+        cls.state_domain.rank_idx_pair_to_state(state_tuple).legal_move_tuple
+      )
+
+    result = []
+    for unique_pos, an_action_draw in zip(inverse.tolist(), action_draws):
+      moves = legal_moves[unique_pos]
+      result.append(PolicyGene(
+        state_tuples[unique_pos],
+        moves[int(an_action_draw * len(moves))]
+      ))
+    return result
+
   def __str__(self):
     return '{state_tuple:}: {action:}'.format(**vars(self))
 
+def configure_board(kwargs):
+  """Set the board geometry from the configuration keys of an individual
+  component.
+
+  The ``board_rows`` key sets the number of rows (3 by default),
+  ``board_columns`` the number of columns (as many as rows by default), and
+  ``win_length`` the number of marks in a line that wins (the length of the
+  board's shorter side by default). The board is only configured anew (see
+  py:meth:: BoardState.configure) if its geometry changes.
+
+  Parameters
+  ----------
+  kwargs : dict
+    Configuration keys of the component.
+  """
+  rows = int(kwargs.get('board_rows', '3'))
+  columns = int(kwargs.get('board_columns', str(rows)))
+  win_length = int(kwargs.get('win_length', str(min(rows, columns))))
+  if BoardState.geometry() != (rows, columns, win_length):
+    BoardState.configure(rows, columns, win_length)
+
 class TicTacToeChromo(ToolboxContributor):
   """Represents a GA individual that encodes a Tic-Tac-Toe policy.
 
@@ -106,11 +183,26 @@ class TicTacToeChromo(ToolboxContributor):
   these chromosomes will never contain more than one action for each board
   state.
 
+  If the ``state_table`` configuration key names a state table file (see
+  py:class:: StateTable), the file is memory-mapped and used to pre-populate
+  the board state domain, so board state addresses are the same in every
+  process and every run. The file is created if it does not exist yet.
+
+  The ``board_rows``, ``board_columns`` and ``win_length`` configuration keys
+  play the game on another board (see py:func:: configure_board), such as
+  ``board_rows=4`` for 4 x 4 boards where four in a row wins. State tables
+  are specific to a board, so ``state_table`` must name a different file for
+  each.
+
   codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
   """
 
-  @staticmethod
-  def from_generator(generator=None):
+  # Name and base class of the ``deap.creator`` class of the individuals.
+  policy_type = 'PlayerPolicy'
+  policy_base = dict
+
+  @classmethod
+  def from_generator(cls, generator=None):
     """Initialize the chromosome information, using a generator if provided.
 
     Parameters
@@ -118,7 +210,7 @@ class TicTacToeChromo(ToolboxContributor):
     generator : types.GeneratorType or None
       If provided, the generator that will be used to populate the gene.
     """
-    result = creator.PlayerPolicy()
+    result = creator.__dict__[cls.policy_type]()
 
     if generator is not None and isinstance(generator, types.GeneratorType):
       for a_gene in generator:
@@ -129,31 +221,275 @@ class TicTacToeChromo(ToolboxContributor):
 
   def __init__(self, fitness_type, **kwargs):
     super(TicTacToeChromo, self).__init__()
-    fitness = creator.__dict__[fitness_type]
-    creator.create(
-      'PlayerPolicy',
-      dict,
-      fitness=fitness
-    )
+    self.create_policy_type(creator.__dict__[fitness_type])
     self.init_policy_slot_count = int(
       kwargs.get('init_policy_slot_count', '20')
     )
-    PolicyGene.state_domain = BoardStateDomain()
+    configure_board(kwargs)
+    state_table_path = kwargs.get('state_table')
+    if state_table_path is None:
+      PolicyGene.state_table = None
+      PolicyGene.state_domain = BoardStateDomain()
+    else:
+      PolicyGene.state_table = StateTable.open(state_table_path)
+      PolicyGene.state_domain = PolicyGene.state_table.to_domain()
+
+  def create_policy_type(self, fitness):
+    creator.create(self.policy_type, self.policy_base, fitness=fitness)
+
+  def checkpoint_state(self):
+    # Board states discovered during the run get their addresses in the order
+    # they were found, so the domain must be saved along with the policies.
+    # A domain pre-populated from a state table never changes.
+    if PolicyGene.state_table is None:
+      return PolicyGene.state_domain
+    return None
+
+  def restore_checkpoint_state(self, state):
+    PolicyGene.state_domain = state
 
   def configure_toolbox(self, toolbox):
     toolbox.register(
       'individual',
       tools.initRepeat,
-      TicTacToeChromo.from_generator,
+      self.from_generator,
       PolicyGene.new_random,
       n=self.init_policy_slot_count
     )
     toolbox.register(
       'population',
-      tools.initRepeat,
-      list,
-      toolbox.individual
+      self.new_random_population,
+      self.init_policy_slot_count
     )
+    toolbox.register('genotype_key', TicTacToeChromo.genotype_key)
+    toolbox.register('clone', self.clone)
+
+  @staticmethod
+  def clone(individual):
+    """Copy of a policy sharing its genes, which are never changed in place.
+
+    Only the mapping of board states to genes and the attributes of the
+    policy (such as its fitness and traversal memo) are copied.
+    """
+    cls = type(individual)
+    result = cls.__new__(cls)
+    result.update(individual)
+    return copy_attributes(individual, result)
+
+  @staticmethod
+  def genotype_key(individual):
+    """Hashable key identifying the genotype of a policy.
+
+    Parameters
+    ----------
+    individual : collections.abc.Mapping
+      Policy to identify.
+
+    Returns
+    -------
+    tuple
+      Board state and action of each gene, sorted by board state.
+    """
+    return tuple(sorted(
+      (state_tuple, a_gene.action)
+      for state_tuple, a_gene in individual.items()
+    ))
+
+  @classmethod
+  def new_random_population(cls, gene_count, n):
+    """Create a population of individuals with randomly-generated genes.
+
+    The genes of the whole population are created with a single call to
+    py:meth:: PolicyGene.new_random_batch.
+
+    Parameters
+    ----------
+    gene_count : int
+      Number of genes to generate for each individual; genes generated for
+      the same state replace one another.
+    n : int
+      Number of individuals to create.
+
+    Returns
+    -------
+    list
+      New individuals.
+    """
+    all_genes = PolicyGene.new_random_batch(gene_count * n)
+    return [
+      cls.from_generator(
+        a_gene for a_gene in all_genes[start:start + gene_count]
+      )
+      for start in range(0, gene_count * n, gene_count)
+    ]
+
+class TicTacToeSharedChromo(TicTacToeChromo):
+  """Counterpart of py:class:: TicTacToeChromo whose individuals share their
+  genes with their clones.
+
+  Individuals are py:class:: gabasic.ChunkedMapping instances, holding the
+  same genes under the same keys as those of py:class:: TicTacToeChromo, so
+  the same evaluations, crossovers and mutations apply. Cloning an individual
+  copies none of its genes, and changing a clone copies only the chunks of
+  genes changed. The ``chunk_count`` configuration key sets the number of
+  chunks each individual is split into (32 by default); the other keys are
+  those of py:class:: TicTacToeChromo.
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
+  policy_type = 'SharedPlayerPolicy'
+  policy_base = ChunkedMapping
+
+  def __init__(self, fitness_type, **kwargs):
+    self.chunk_count = int(kwargs.get('chunk_count', '32'))
+    if self.chunk_count < 1:
+      raise ValueError('Policies need at least one chunk.')
+    super(TicTacToeSharedChromo, self).__init__(fitness_type, **kwargs)
+
+  def create_policy_type(self, fitness):
+    creator.create(
+      self.policy_type,
+      self.policy_base,
+      fitness=fitness,
+      chunk_count=self.chunk_count
+    )
+
+  @staticmethod
+  def clone(individual):
+    """Copy of a policy sharing its chunks of genes."""
+    return copy_attributes(individual, copy.copy(individual))
+
+def _restore_policy_array(policy_cls, actions):
+  return np.array(actions, dtype=np.int8).view(policy_cls)
+
+def _reduce_policy_array(policy_array):
+  # DEAP pickles NumPy individuals as lists of NumPy scalars; the raw array is
+  # a fraction of the size.
+  return (
+    _restore_policy_array,
+    (type(policy_array), np.asarray(policy_array)),
+    policy_array.__dict__
+  )
+
+class TicTacToeArrayChromo(ToolboxContributor):
+  """Represents a GA individual that encodes a Tic-Tac-Toe policy as a dense
+  array of actions.
+
+  The internal storage of this class' instances is a NumPy ``int8`` array with
+  one element per state in the board state domain's py:class:: StateTable,
+  indexed by state id. Each element holds the action taken at that state, as
+  laid out in its canonical configuration, or ``UNSET_ACTION`` if the policy
+  has no gene for the state. Cloning an individual copies a single buffer,
+  and an individual takes about as many bytes as there are states in the
+  table.
+
+  Individuals are initialized with randomly-generated genes distributed as
+  those of py:class:: TicTacToeChromo. The ``state_table`` and board
+  configuration keys work as in py:class:: TicTacToeChromo, except that when
+  ``state_table`` is missing the table is built in memory, since these
+  individuals cannot exist without one.
+
+  Individuals of this type must be evaluated with
+  py:class:: BatchWinsVsLosses, and varied with array-aware operators, such
+  as py:class:: ArrayChangeActionMutation and the ``gabasic`` array
+  crossovers.
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
+  UNSET_ACTION = -1
+
+  def __init__(self, fitness_type, **kwargs):
+    super(TicTacToeArrayChromo, self).__init__()
+    fitness = creator.__dict__[fitness_type]
+    creator.create(
+      'PlayerPolicyArray',
+      np.ndarray,
+      fitness=fitness,
+      __reduce__=_reduce_policy_array
+    )
+    self.init_policy_slot_count = int(
+      kwargs.get('init_policy_slot_count', '20')
+    )
+    configure_board(kwargs)
+    state_table_path = kwargs.get('state_table')
+    if state_table_path is None:
+      PolicyGene.state_table = StateTable.build()
+    else:
+      PolicyGene.state_table = StateTable.open(state_table_path)
+    PolicyGene.state_domain = PolicyGene.state_table.to_domain()
+
+  @staticmethod
+  def new_random_population(gene_count, n):
+    """Create a population of individuals with randomly-generated genes.
+
+    The genes of the whole population are generated with a single call to
+    py:meth:: PolicyGene.new_random_batch, so they are distributed as those
+    of py:class:: TicTacToeChromo individuals.
+
+    Parameters
+    ----------
+    gene_count : int
+      Number of genes to generate for each individual; genes generated for
+      the same state replace one another.
+    n : int
+      Number of individuals to create.
+
+    Returns
+    -------
+    list
+      New individuals.
+    """
+    state_table = PolicyGene.state_table
+    all_actions = np.full(
+      (n, state_table.state_count),
+      TicTacToeArrayChromo.UNSET_ACTION,
+      dtype=np.int8
+    )
+    all_genes = PolicyGene.new_random_batch(gene_count * n)
+    for gene_idx, a_gene in enumerate(all_genes):
+      all_actions[
+        gene_idx // gene_count,
+        state_table.state_id(a_gene.state_tuple)
+      ] = a_gene.action
+    return [creator.PlayerPolicyArray(actions) for actions in all_actions]
+
+  @staticmethod
+  def new_random(gene_count):
+    """Create an individual with randomly-generated genes.
+
+    Parameters
+    ----------
+    gene_count : int
+      Number of genes to generate; genes generated for the same state replace
+      one another.
+
+    Returns
+    -------
+    creator.PlayerPolicyArray
+      New individual.
+    """
+    return TicTacToeArrayChromo.new_random_population(gene_count, 1)[0]
+
+  def configure_toolbox(self, toolbox):
+    toolbox.register(
+      'individual',
+      TicTacToeArrayChromo.new_random,
+      self.init_policy_slot_count
+    )
+    toolbox.register(
+      'population',
+      TicTacToeArrayChromo.new_random_population,
+      self.init_policy_slot_count
+    )
+    toolbox.register('similar', np.array_equal)
+    toolbox.register('clone', TicTacToeArrayChromo.clone)
+
+  @staticmethod
+  def clone(individual):
+    """Copy of a policy, its actions copied as a single buffer."""
+    return copy_attributes(individual, np.ndarray.copy(individual))
 
 # vim: set ts=2 sw=2 expandtab:
 
@@ -0,0 +1,219 @@
+import math
+import random
+import numpy as np
+from .boardstate import BoardState
+
+
+class StateSampler(object):
+  """Draws random non-final board states in constant time.
+
+  The states are distributed exactly as those produced by the random walk
+  that py:meth:: PolicyGene.new_random originally used: pick a rank from 0 to
+  ``n - 1`` uniformly (``n`` being the number of cells, 9 on the default
+  board), let both players (player 1 first) make that many random legal
+  moves, and start over if the walk ends on a final board. A walk ending on a
+  non-final board never went through a final one, and every ordering of the
+  same moves is equally likely, so each non-final board of rank ``r`` is
+  reached with probability ``a! b! (n - r)! / n!`` (``a`` and ``b`` being the
+  move counts of each player). Every board of the 3^n possible is weighted
+  this way once, and an alias table over the weights allows drawing a board
+  with two random numbers.
+
+  Boards with more than ``MAX_CELL_COUNT`` cells have too many boards to
+  weigh, and are drawn by py:class:: RandomWalkSampler instead.
+
+  Attributes
+  ----------
+  contents : numpy.ndarray
+    Contents (one row per board) of every board that may be drawn.
+  weights : numpy.ndarray
+    Relative probability of drawing each board.
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
+  MAX_CELL_COUNT = 12
+
+  _shared = None
+
+  def __init__(self):
+    super(StateSampler, self).__init__()
+    cell_count = BoardState.CELL_COUNT
+    if cell_count > StateSampler.MAX_CELL_COUNT:
+      raise ValueError(
+        'Boards of {} cells are too large to weigh.'.format(cell_count)
+      )
+    self.geometry = BoardState.geometry()
+    board_codes = np.arange(3 ** cell_count)
+    contents = (
+      board_codes[:, np.newaxis] // 3 ** np.arange(cell_count) % 3
+    ).astype(np.int8)
+    cell_bits = 1 << np.arange(cell_count)
+    p1_masks = (contents == 1) @ cell_bits
+    p2_masks = (contents == 2) @ cell_bits
+    p1_counts = np.count_nonzero(contents == 1, axis=1)
+    p2_counts = np.count_nonzero(contents == 2, axis=1)
+    ranks = p1_counts + p2_counts
+    eligible = (
+      ((p1_counts == p2_counts) | (p1_counts == p2_counts + 1)) &
+      (ranks < cell_count)
+    )
+    for a_win in BoardState.WIN_MASKS:
+      eligible &= (p1_masks & a_win) != a_win
+      eligible &= (p2_masks & a_win) != a_win
+
+    self.contents = contents[eligible]
+    self.weights = np.array([
+      math.factorial(p1_count) * math.factorial(p2_count) *
+        math.factorial(cell_count - p1_count - p2_count)
+      for p1_count, p2_count in zip(
+        p1_counts[eligible],
+        p2_counts[eligible]
+      )
+    ], dtype=np.float64) / math.factorial(cell_count)
+    (self._accept, self._alias) = StateSampler._alias_table(self.weights)
+    self._board_states = [None] * len(self.contents)
+
+  @classmethod
+  def shared(cls):
+    """Obtain the sampler shared by the whole process, creating it if needed
+    (or if the board geometry changed since).
+
+    Returns
+    -------
+    StateSampler or RandomWalkSampler
+      Shared sampler; a py:class:: RandomWalkSampler for boards with more
+      than ``MAX_CELL_COUNT`` cells.
+    """
+    if cls._shared is None or cls._shared.geometry != BoardState.geometry():
+      if BoardState.CELL_COUNT > cls.MAX_CELL_COUNT:
+        cls._shared = RandomWalkSampler()
+      else:
+        cls._shared = cls()
+    return cls._shared
+
+  @staticmethod
+  def _alias_table(weights):
+    """Build Walker's alias table for a discrete distribution."""
+    count = len(weights)
+    scaled = weights * (count / weights.sum())
+    accept = np.ones(count, dtype=np.float64)
+    alias = np.arange(count)
+    small = [idx for idx in range(count) if scaled[idx] < 1.0]
+    large = [idx for idx in range(count) if scaled[idx] >= 1.0]
+
+    while small and large:
+      small_idx = small.pop()
+      large_idx = large.pop()
+      accept[small_idx] = scaled[small_idx]
+      alias[small_idx] = large_idx
+      scaled[large_idx] -= 1.0 - scaled[small_idx]
+      if scaled[large_idx] < 1.0:
+        small.append(large_idx)
+      else:
+        large.append(large_idx)
+
+    return (accept, alias)
+
+  def board_state(self, board_idx):
+    """Interned board state for one of the boards that may be drawn.
+
+    Parameters
+    ----------
+    board_idx : int
+      Index of the board in ``contents``.
+
+    Returns
+    -------
+    BoardState
+      Board state.
+    """
+    result = self._board_states[board_idx]
+    if result is None:
+      result = BoardState.intern(
+        [int(a_cell) for a_cell in self.contents[board_idx]]
+      )
+      self._board_states[board_idx] = result
+    return result
+
+  def sample_index(self):
+    """Draw the index of a board using the ``random`` module.
+
+    Returns
+    -------
+    int
+      Index of the board in ``contents``.
+    """
+    board_idx = random.randrange(len(self._accept))
+    if random.random() < self._accept[board_idx]:
+      return board_idx
+    return int(self._alias[board_idx])
+
+  def sample(self):
+    """Draw a board state using the ``random`` module.
+
+    Returns
+    -------
+    BoardState
+      Non-final board state.
+    """
+    return self.board_state(self.sample_index())
+
+  def sample_indices(self, count):
+    """Draw the indices of many boards at once using NumPy's RNG.
+
+    Parameters
+    ----------
+    count : int
+      Number of boards to draw.
+
+    Returns
+    -------
+    numpy.ndarray
+      Index of each board drawn in ``contents``.
+    """
+    board_idxs = np.random.randint(len(self._accept), size=count)
+    rejected = np.random.random_sample(count) >= self._accept[board_idxs]
+    board_idxs[rejected] = self._alias[board_idxs[rejected]]
+    return board_idxs
+
+class RandomWalkSampler(object):
+  """Draws random non-final board states by walking the game.
+
+  States are distributed as those of py:class:: StateSampler, but each one is
+  drawn by playing the random walk it describes, so drawing takes time in
+  proportion to the rank drawn and nothing is computed in advance. Every
+  ordering of the moves of a walk is equally likely, so the walk is played as
+  a random sample of distinct cells, filled by each player in turn.
+
+  Attributes
+  ----------
+  geometry : tuple
+    Board geometry (see py:meth:: BoardState.geometry) states are drawn for.
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
+  def __init__(self):
+    super(RandomWalkSampler, self).__init__()
+    self.geometry = BoardState.geometry()
+
+  def sample(self):
+    """Draw a board state using the ``random`` module.
+
+    Returns
+    -------
+    BoardState
+      Non-final board state.
+    """
+    cell_count = BoardState.CELL_COUNT
+    while True:
+      contents = [0] * cell_count
+      moves = random.sample(range(cell_count), random.randrange(cell_count))
+      for move_idx, a_move in enumerate(moves):
+        contents[a_move] = move_idx % 2 + 1
+      result = BoardState(contents)
+      if not result.final:
+        return result
+
+# vim: set ts=2 sw=2 expandtab:
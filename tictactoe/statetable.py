@@ -0,0 +1,524 @@
+import os
+import numpy as np
+from .boardstate import BoardState, BoardStateDomain
+
+
+class StateTable(object):
+  """Precomputed table of every reachable canonical Tic-Tac-Toe board state.
+
+  The table enumerates all board states reachable from an empty board when
+  either player is allowed to go first, keeping only one representative (the
+  canonical configuration) for each group of equivalent states. States are
+  sorted by rank and then canonical key, so the position of a state within the
+  table, its "state id", never changes from run to run.
+
+  Each record in the table holds the following fields:
+
+  ``cells``
+    Canonical configuration of the board state.
+  ``rank``
+    Rank of the board state.
+  ``final``
+    Whether the board state is a final state.
+  ``winner``
+    Player that won in the board state; ``0`` if there is no winner.
+  ``child``
+    Two rows (one per player) of nine (one per move) state ids reached after
+    the player makes the move on the canonical configuration; ``-1`` if the
+    move is illegal (or the player cannot move at this state).
+  ``child_config``
+    Index of the configuration of the child state that matches the board
+    produced by the move, as reported by py:meth:: BoardState.matching_config;
+    ``-1`` wherever ``child`` is ``-1``.
+
+  Tables are stored in the NumPy ``.npy`` format, which allows them to be
+  memory-mapped when loaded so processes share the same pages. A table holds
+  the states of the board geometry configured when it was built (see
+  py:meth:: BoardState.configure), and can only be used with that geometry.
+
+  Attributes
+  ----------
+  records : numpy.ndarray
+    Structured array with one record per canonical board state.
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
+  _open_tables = {}
+
+  @staticmethod
+  def record_type(cell_count):
+    """Type of the records of a table for boards of ``cell_count`` cells.
+
+    State ids take 16 bits on boards of up to nine cells, and 32 bits on
+    larger ones.
+
+    Returns
+    -------
+    numpy.dtype
+      Structured record type.
+    """
+    return np.dtype([
+      ('cells', np.int8, (cell_count,)),
+      ('rank', np.int8),
+      ('final', np.bool_),
+      ('winner', np.int8),
+      ('child', np.int16 if cell_count <= 9 else np.int32, (2, cell_count)),
+      ('child_config', np.int8, (2, cell_count))
+    ])
+
+  def __init__(self, records):
+    """Wrap the provided state records.
+
+    Parameters
+    ----------
+    records : numpy.ndarray
+      Structured array of type ``StateTable.record_type()`` for the
+      configured board.
+
+    Raises
+    ------
+    ValueError
+      If the records are not those of a table for the configured board.
+    """
+    super(StateTable, self).__init__()
+    if records.dtype != StateTable.record_type(BoardState.CELL_COUNT):
+      raise ValueError(
+        'State table records do not match a {} x {} board.'.format(
+          BoardState.ROWS,
+          BoardState.COLUMNS
+        )
+      )
+    self.records = records
+    ranks = np.asarray(records['rank'])
+    final_ranks = ranks[np.asarray(records['final'])]
+    # The first player can complete a line at the earliest on their
+    # ``WIN_LENGTH``-th move, unless the board fills up first.
+    first_final_rank = min(
+      2 * BoardState.WIN_LENGTH - 1,
+      BoardState.CELL_COUNT
+    )
+    if len(final_ranks) and final_ranks.min() != first_final_rank:
+      raise ValueError(
+        'State table records do not match a win length of {}.'.format(
+          BoardState.WIN_LENGTH
+        )
+      )
+    self._rank_offsets = np.searchsorted(
+      ranks,
+      np.arange(self.cell_count + 2)
+    )
+    # Plain view of the cells, sparing the overhead of memory-mapped arrays
+    # when reading one state at a time.
+    self._cells = np.asarray(records['cells'])
+    self._codes = None
+    self._legal_moves = None
+
+  @classmethod
+  def build(cls):
+    """Enumerate every reachable canonical board state.
+
+    States are enumerated a rank at a time with NumPy operations over their
+    canonical codes (see py:attr:: BoardState.canonical_code). Each state
+    keeps the code of every one of its configurations, and making a move
+    adds the same digit to each of them, at the position the moved cell
+    takes in that configuration, so the canonical code of every child (the
+    smallest code of its configurations) takes a few array operations.
+
+    Returns
+    -------
+    StateTable
+      Newly-built table.
+
+    Raises
+    ------
+    ValueError
+      If the codes of the configured board do not fit in 64 bits.
+    """
+    cell_count = BoardState.CELL_COUNT
+    if 3 ** cell_count > np.iinfo(np.int64).max:
+      raise ValueError(
+        'Boards of {} cells are too large to tabulate.'.format(cell_count)
+      )
+    schemas = np.array(BoardState.CONFIG_SCHEMAS)
+    # Position taken by each cell in each configuration, and index of the
+    # configuration undoing each configuration.
+    positions = np.argsort(schemas, axis=1)
+    inverse_configs = [
+      [a_schema.tolist() for a_schema in schemas].index(a_position.tolist())
+      for a_position in positions
+    ]
+    digit_values = 3 ** np.arange(cell_count - 1, -1, -1, dtype=np.int64)
+    cell_bits = 1 << np.arange(cell_count, dtype=np.int64)
+    move_values = digit_values[positions]
+
+    rank_codes = np.zeros(1, dtype=np.int64)
+    rank_records = []
+    for a_rank in range(cell_count + 1):
+      cells = (rank_codes[:, np.newaxis] // digit_values % 3).astype(np.int8)
+      config_codes = np.stack(
+        [cells[:, a_schema] @ digit_values for a_schema in schemas],
+        axis=1
+      )
+      records = np.zeros(len(rank_codes), dtype=cls.record_type(cell_count))
+      records['cells'] = cells
+      records['rank'] = a_rank
+      p1_masks = (cells == 1) @ cell_bits
+      p2_masks = (cells == 2) @ cell_bits
+      for a_win in BoardState.WIN_MASKS:
+        records['winner'][(p2_masks & a_win) == a_win] = 2
+      for a_win in BoardState.WIN_MASKS:
+        records['winner'][(p1_masks & a_win) == a_win] = 1
+      records['final'] = (records['winner'] != 0) | (a_rank == cell_count)
+
+      # Either player may move on a board with an equal number of moves from
+      # each player, since either one could have gone first; otherwise only
+      # the player trailing in moves may go next. Nobody may move on a final
+      # board.
+      p1_counts = np.count_nonzero(cells == 1, axis=1)
+      p2_counts = np.count_nonzero(cells == 2, axis=1)
+      child_codes = np.full((len(rank_codes), 2, cell_count), -1, np.int64)
+      child_configs = np.full(child_codes.shape, -1, dtype=np.int8)
+      for player, may_move in (
+        (1, p1_counts <= p2_counts),
+        (2, p2_counts <= p1_counts)
+      ):
+        may_move &= ~records['final']
+        for a_move in range(cell_count):
+          movers = np.flatnonzero(may_move & (cells[:, a_move] == 0))
+          moved_codes = (
+            config_codes[movers] + player * move_values[:, a_move]
+          )
+          canonical_codes = moved_codes.min(axis=1)
+          child_codes[movers, player - 1, a_move] = canonical_codes
+          # The canonical child matches the moved board in the configuration
+          # undoing the one that turned the moved board into the canonical
+          # child; the first such configuration is reported.
+          matches = moved_codes == canonical_codes[:, np.newaxis]
+          child_configs[movers, player - 1, a_move] = np.argmax(
+            matches[:, inverse_configs],
+            axis=1
+          )
+      records['child_config'] = child_configs
+      rank_records.append((rank_codes, records, child_codes))
+      rank_codes = np.unique(child_codes[child_codes >= 0])
+
+    rank_offset = 0
+    for a_rank, (rank_codes, records, child_codes) in enumerate(rank_records):
+      rank_offset += len(rank_codes)
+      if a_rank + 1 < len(rank_records):
+        next_codes = rank_records[a_rank + 1][0]
+        child_ids = rank_offset + np.searchsorted(next_codes, child_codes)
+        records['child'] = np.where(child_codes >= 0, child_ids, -1)
+      else:
+        records['child'] = -1
+
+    result = cls(np.concatenate([
+      records for (_, records, _) in rank_records
+    ]))
+    result._codes = np.concatenate([
+      rank_codes for (rank_codes, _, _) in rank_records
+    ])
+    return result
+
+  @classmethod
+  def load(cls, path):
+    """Memory-map a previously saved table.
+
+    Parameters
+    ----------
+    path : str
+      Location of the table file.
+
+    Returns
+    -------
+    StateTable
+      Table backed by a read-only memory map of the file.
+    """
+    return cls(np.load(path, mmap_mode='r', allow_pickle=False))
+
+  @classmethod
+  def open(cls, path):
+    """Obtain the table stored at ``path``, building it first if necessary.
+
+    Tables opened this way are cached per process, so every component asking
+    for the same file shares the same instance.
+
+    Parameters
+    ----------
+    path : str
+      Location of the table file.
+
+    Returns
+    -------
+    StateTable
+      Memory-mapped table.
+    """
+    abs_path = os.path.abspath(path)
+    table_key = (abs_path, BoardState.geometry())
+    if table_key not in cls._open_tables:
+      if not os.path.exists(abs_path):
+        cls.build().save(abs_path)
+      cls._open_tables[table_key] = cls.load(abs_path)
+    return cls._open_tables[table_key]
+
+  def save(self, path):
+    """Write the table to a file.
+
+    The file is written under a temporary name first and then moved into
+    place, so readers never observe a partially written table.
+
+    Parameters
+    ----------
+    path : str
+      Location of the table file.
+    """
+    tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+    with open(tmp_path, 'wb') as table_file:
+      np.save(table_file, np.asarray(self.records), allow_pickle=False)
+    os.replace(tmp_path, path)
+
+  @property
+  def cell_count(self):
+    """Number of cells of the board the table is for.
+
+    Returns
+    -------
+    int
+      Number of cells.
+    """
+    return self.records.dtype['cells'].shape[0]
+
+  @property
+  def state_count(self):
+    """Number of canonical board states in the table.
+
+    Returns
+    -------
+    int
+      Number of states.
+    """
+    return len(self.records)
+
+  @property
+  def legal_moves(self):
+    """Legal moves of every state, as laid out in its canonical configuration.
+
+    Returns
+    -------
+    tuple
+      Pair of arrays: the first holds one row per state with its legal moves
+      in ascending order, padded with ``-1``; the second holds the number of
+      legal moves of each state. Final states have no legal moves.
+    """
+    if self._legal_moves is None:
+      cells = np.asarray(self.records['cells'])
+      open_cells = (cells == 0) & ~np.asarray(self.records['final'])[:, None]
+      counts = np.count_nonzero(open_cells, axis=1)
+      moves = np.full(cells.shape, -1, dtype=np.int8)
+      # Stable sort of the "occupied" flags brings open cells to the front
+      # while keeping them in ascending order.
+      order = np.argsort(~open_cells, axis=1, kind='stable')
+      in_range = np.arange(self.cell_count) < counts[:, None]
+      moves[in_range] = order[in_range]
+      self._legal_moves = (moves, counts)
+    return self._legal_moves
+
+  def state_id(self, rank_idx_pair):
+    """Translate a domain address into a state id.
+
+    Parameters
+    ----------
+    rank_idx_pair : tuple
+      Address of a state in a domain created with py:meth:: to_domain.
+
+    Returns
+    -------
+    int
+      State id of the addressed state.
+    """
+    (rank, branch_idx) = rank_idx_pair
+    return int(self._rank_offsets[rank]) + branch_idx
+
+  def rank_idx_pair(self, state_id):
+    """Translate a state id into a domain address.
+
+    Parameters
+    ----------
+    state_id : int
+      Id of a state in this table.
+
+    Returns
+    -------
+    tuple
+      Address containing rank and index.
+    """
+    rank = int(np.searchsorted(self._rank_offsets, state_id, 'right')) - 1
+    return (rank, state_id - int(self._rank_offsets[rank]))
+
+  def state_id_of(self, board_state):
+    """Find the state id of a board state or any of its equivalents.
+
+    Parameters
+    ----------
+    board_state : BoardState
+      Board state to look up.
+
+    Returns
+    -------
+    int
+      State id of the board state.
+
+    Raises
+    ------
+    KeyError
+      If the board state is not reachable.
+    """
+    if self._codes is None:
+      digit_values = 3 ** np.arange(
+        self.cell_count - 1,
+        -1,
+        -1,
+        dtype=np.int64
+      )
+      self._codes = self._cells @ digit_values
+    state_code = board_state.canonical_code
+    rank = board_state.rank
+    (rank_start, rank_end) = self._rank_offsets[rank:rank + 2]
+    # States of the same rank are sorted by canonical key, and so by code.
+    state_id = rank_start + int(np.searchsorted(
+      self._codes[rank_start:rank_end],
+      state_code
+    ))
+    if state_id == rank_end or self._codes[state_id] != state_code:
+      raise KeyError(board_state.canonical_key)
+    return int(state_id)
+
+  def board_state(self, state_id):
+    """Create the canonical board state for a state id.
+
+    Parameters
+    ----------
+    state_id : int
+      Id of a state in this table.
+
+    Returns
+    -------
+    BoardState
+      Canonical board state.
+    """
+    return BoardState(self._cells[state_id].tolist())
+
+  def to_domain(self):
+    """Create a domain that already knows every state in the table.
+
+    The domain address of each state is derived from its state id, so it is
+    always the same and can be translated with py:meth:: state_id and
+    py:meth:: rank_idx_pair. Board states are only created when the domain
+    is first asked about them (see py:class:: StateTableDomain).
+
+    Returns
+    -------
+    StateTableDomain
+      Fully-populated domain.
+    """
+    return StateTableDomain(self)
+
+class StateTableDomain(BoardStateDomain):
+  """Domain of the board states in a py:class:: StateTable.
+
+  Every state in the table is known from the start, with the address given by
+  its state id, but the py:class:: BoardState of an address, and the address
+  of a canonical code, are only looked up in the table the first time they
+  are asked for. A domain over the millions of states of larger boards thus
+  takes memory only for the states a run actually reaches.
+
+  States the table does not hold (i.e., unreachable ones) cannot be
+  registered.
+
+  codeauthor:: Rolando J. Nieves <rolando.j.nieves@knights.ucf.edu>
+  """
+
+  def __init__(self, state_table):
+    super(StateTableDomain, self).__init__()
+    self._state_table = state_table
+    self._known_state_count = state_table.state_count
+    rank_offsets = state_table._rank_offsets
+    for a_rank in range(state_table.cell_count + 1):
+      rank_size = int(rank_offsets[a_rank + 1] - rank_offsets[a_rank])
+      if rank_size:
+        self._rank_map[a_rank] = [None] * rank_size
+
+  def __getstate__(self):
+    # Saved domains (e.g., the one written out at the end of a run) hold the
+    # states looked up so far, by rank and index, without the table.
+    result = dict(self.__dict__)
+    del result['_state_table']
+    result['_rank_map'] = {
+      a_rank: {
+        branch_idx: a_state for branch_idx, a_state in enumerate(rank_branch)
+        if a_state is not None
+      }
+      for a_rank, rank_branch in self._rank_map.items()
+    }
+    return result
+
+  def __setstate__(self, state):
+    self.__dict__.update(state)
+    self._rank_map = {}
+    for a_rank, rank_states in state['_rank_map'].items():
+      rank_branch = [None] * (max(rank_states, default=-1) + 1)
+      for branch_idx, a_state in rank_states.items():
+        rank_branch[branch_idx] = a_state
+      self._rank_map[a_rank] = rank_branch
+    self._state_table = None
+
+  def state_to_rank_idx_pair(self, board_state):
+    """Obtain the domain address of a board state.
+
+    Parameters
+    ----------
+    board_state : BoardState
+      Instance to translate.
+
+    Returns
+    -------
+    tuple
+      Address containing rank and index.
+
+    Raises
+    ------
+    KeyError
+      If the board state is not in the table.
+    """
+    state_key = board_state.canonical_code
+    result = self._address_map.get(state_key)
+
+    if result is None:
+      result = self._state_table.rank_idx_pair(
+        self._state_table.state_id_of(board_state)
+      )
+      self._address_map[state_key] = result
+
+    return result
+
+  def rank_idx_pair_to_state(self, rank_idx_pair):
+    result = super(StateTableDomain, self).rank_idx_pair_to_state(
+      rank_idx_pair
+    )
+
+    if result is None:
+      (rank, branch_idx) = rank_idx_pair
+      if self._state_table is None:
+        raise ValueError(
+          'Index {} in rank {} was not saved.'.format(branch_idx, rank)
+        )
+      result = self._state_table.board_state(
+        self._state_table.state_id(rank_idx_pair)
+      )
+      self._rank_map[rank][branch_idx] = result
+      self._address_map[result.canonical_code] = rank_idx_pair
+
+    return result
+
+# vim: set ts=2 sw=2 expandtab:
@@ -1,4 +1,27 @@
-from .boardstate_test import BoardStateTestCase, BoardStateDomainTestCase
-from .indiv_test import PolicyGeneTest, TicTacToeChromoTest
+from .boardstate_test import (
+  BoardStateTestCase,
+  BoardGeometryTestCase,
+  BoardStateDomainTestCase
+)
+from .indiv_test import (
+  PolicyGeneTest,
+  TicTacToeChromoTest,
+  TicTacToeArrayChromoTest,
+  TicTacToeSharedChromoTest
+)
+from .statetable_test import (
+  StateTableTestCase,
+  StateTableGeometryTestCase
+)
+from .sampler_test import (
+  StateSamplerTestCase,
+  RandomWalkSamplerTestCase
+)
+from .eval_test import (
+  WinsVsLossesTest,
+  BatchWinsVsLossesTest,
+  SampledWinsVsLossesTest
+)
+from .bench_test import SamplePoliciesTest
 
 # vim: set ts=2 sw=2 expandtab
@@ -0,0 +1,23 @@
+import unittest
+from tictactoe.bench import sample_policies
+
+
+def policy_actions(policies):
+  return [
+    {state_tuple: a_gene.action for state_tuple, a_gene in a_policy.items()}
+    for a_policy in policies
+  ]
+
+class SamplePoliciesTest(unittest.TestCase):
+  def test_seeded(self):
+    expected = policy_actions(sample_policies(3, 30))
+    self.assertEqual(expected, policy_actions(sample_policies(3, 30)))
+    self.assertNotEqual(
+      expected,
+      policy_actions(sample_policies(3, 30, seed=4096))
+    )
+
+if __name__ == '__main__':
+  unittest.main()
+
+# vim: set ts=2 sw=2 expandtab:
@@ -1,6 +1,8 @@
 import unittest
 import itertools
+import pickle
 from tictactoe import BoardState, BoardStateDomain
+from tictactoe.boardstate import board_symmetries
 
 
 class BoardStateTestCase(unittest.TestCase):
@@ -46,6 +48,22 @@ class BoardStateTestCase(unittest.TestCase):
     for an_alt in alt_states:
       self.assertEqual(baseline_state, an_alt)
 
+  def test_alternate_hash(self):
+    baseline_state = BoardState([1, 0, 0, 2, 0, 0, 0, 0, 0])
+    alt_state = BoardState([0, 0, 1, 0, 0, 2, 0, 0, 0])
+    other_state = BoardState([1, 0, 0, 0, 2, 0, 0, 0, 0])
+    self.assertEqual(baseline_state.canonical_key, alt_state.canonical_key)
+    self.assertEqual(hash(baseline_state), hash(alt_state))
+    self.assertNotEqual(baseline_state.canonical_key, other_state.canonical_key)
+    self.assertEqual(1, len({baseline_state, alt_state}))
+
+  def test_pickle_round_trip(self):
+    baseline_state = BoardState([1, 0, 0, 2, 0, 0, 0, 0, 1])
+    the_copy = pickle.loads(pickle.dumps(baseline_state))
+    self.assertEqual(str(baseline_state), str(the_copy))
+    self.assertEqual(baseline_state.rank, the_copy.rank)
+    self.assertEqual(0, baseline_state.matching_config(the_copy))
+
   def test_basic_inequality(self):
     baseline_state = BoardState([1, 0, 0, 2, 0, 0, 0, 0, 0])
     other_state = BoardState([1, 0, 0, 0, 2, 0, 0, 0, 0])
@@ -127,6 +145,116 @@ class BoardStateTestCase(unittest.TestCase):
     for a_case, expectation in zip(cases, expected_results):
       self.assertEqual(expectation, a_case.legal_moves())
 
+  def test_interning(self):
+    contents = [1, 0, 0, 2, 0, 0, 0, 0, 0]
+    first_state = BoardState.intern(contents)
+    contents[8] = 1
+    self.assertIs(first_state, BoardState.intern([1, 0, 0, 2, 0, 0, 0, 0, 0]))
+    self.assertEqual('[1, 0, 0, 2, 0, 0, 0, 0, 0]', str(first_state))
+    self.assertIs(BoardState.intern(contents), first_state.after_move(1, 8))
+    self.assertIs(first_state.after_move(1, 8), first_state.after_move(1, 8))
+    self.assertIs(first_state.legal_move_tuple, first_state.legal_move_tuple)
+    self.assertEqual([1, 2, 4, 5, 6, 7, 8], first_state.legal_moves())
+
+  def test_cache_stats(self):
+    BoardState.clear_caches()
+    empty_state = BoardState.intern([0, 0, 0, 0, 0, 0, 0, 0, 0])
+    empty_state.after_move(1, 4)
+    empty_state.after_move(1, 4)
+    stats = BoardState.cache_stats()
+    self.assertEqual(1, stats['transition_hits'])
+    self.assertEqual(1, stats['transition_misses'])
+    self.assertEqual(0, stats['intern_hits'])
+    self.assertEqual(2, stats['intern_misses'])
+    self.assertEqual(2, stats['interned'])
+
+  def test_illegal_move(self):
+    with self.assertRaises(ValueError):
+      BoardState.intern([1, 0, 0, 0, 0, 0, 0, 0, 0]).after_move(2, 0)
+
+class BoardGeometryTestCase(unittest.TestCase):
+  def tearDown(self):
+    BoardState.configure()
+
+  def test_default_symmetries(self):
+    self.assertEqual(
+      [
+        [0, 1, 2, 3, 4, 5, 6, 7, 8],
+        [2, 5, 8, 1, 4, 7, 0, 3, 6],
+        [8, 7, 6, 5, 4, 3, 2, 1, 0],
+        [6, 3, 0, 7, 4, 1, 8, 5, 2],
+        [2, 1, 0, 5, 4, 3, 8, 7, 6],
+        [6, 7, 8, 3, 4, 5, 0, 1, 2],
+        [8, 5, 2, 7, 4, 1, 6, 3, 0],
+        [0, 3, 6, 1, 4, 7, 2, 5, 8]
+      ],
+      board_symmetries(3, 3)
+    )
+
+  def test_symmetries_are_distinct(self):
+    for rows, columns, expected in ((4, 4, 8), (3, 4, 4), (2, 5, 4)):
+      symmetries = board_symmetries(rows, columns)
+      self.assertEqual(expected, len(symmetries))
+      self.assertEqual(expected, len(set(map(tuple, symmetries))))
+      for a_symmetry in symmetries:
+        self.assertEqual(list(range(rows * columns)), sorted(a_symmetry))
+
+  def test_configure(self):
+    BoardState.configure(3, 4)
+    self.assertEqual((3, 4, 3), BoardState.geometry())
+    self.assertEqual(12, BoardState.CELL_COUNT)
+    self.assertEqual(12, len(BoardState.empty().legal_moves()))
+    self.assertEqual(3 * 2 + 4 + 2 * 2, len(BoardState.WIN_LINES))
+    # The half turn maps cell 3 to cell 8; a quarter turn is no symmetry.
+    self.assertEqual(
+      BoardState([0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0]),
+      BoardState([0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0])
+    )
+    self.assertNotEqual(
+      BoardState([1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]),
+      BoardState([0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0])
+    )
+    with self.assertRaises(ValueError):
+      BoardState.configure(3, 3, 4)
+    with self.assertRaises(ValueError):
+      BoardState.configure(0)
+
+  def test_win_length(self):
+    contents = [1, 1, 1, 0, 2, 2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+    BoardState.configure(4, 4, 3)
+    self.assertEqual((True, False), BoardState(contents).player_victory)
+    BoardState.configure(4)
+    self.assertEqual((False, False), BoardState(contents).player_victory)
+    self.assertFalse(BoardState(contents).final)
+
+  def test_large_boards(self):
+    BoardState.configure(5, 5, 4)
+    contents = [0] * 25
+    for move_idx, a_cell in enumerate((6, 0, 12, 1, 18, 2, 24)):
+      contents[a_cell] = move_idx % 2 + 1
+    board_state = BoardState(contents)
+    self.assertTrue(board_state.final)
+    self.assertEqual((True, False), board_state.player_victory)
+    self.assertEqual(
+      board_state,
+      BoardState([contents[a_cell] for a_cell in board_symmetries(5, 5)[3]])
+    )
+
+  def test_canonical_code_order(self):
+    states = [
+      BoardState([1, 0, 0, 2, 0, 0, 0, 0, 0]),
+      BoardState([1, 0, 0, 0, 2, 0, 0, 0, 0]),
+      BoardState([1, 2, 1, 0, 0, 0, 0, 0, 0]),
+      BoardState([0, 0, 0, 0, 1, 0, 0, 0, 0])
+    ]
+    by_key = sorted(states, key=lambda a_state: a_state.canonical_key)
+    by_code = sorted(states, key=lambda a_state: a_state.canonical_code)
+    self.assertEqual(by_key, by_code)
+    self.assertEqual(
+      BoardState([0, 0, 0, 0, 0, 0, 1, 2, 0]).canonical_code,
+      states[0].canonical_code
+    )
+
 class BoardStateDomainTestCase(unittest.TestCase):
   def test_discovery_from_empty(self):
     uut = BoardStateDomain()
@@ -150,6 +278,13 @@ class BoardStateDomainTestCase(unittest.TestCase):
     self.assertEqual(rank_2_1, uut.rank_idx_pair_to_state((2, 1)))
     self.assertEqual(rank_3_0, uut.rank_idx_pair_to_state((3, 0)))
 
+  def test_known_state_count(self):
+    uut = BoardStateDomain()
+    uut.state_to_rank_idx_pair(BoardState([1, 0, 0, 2, 0, 0, 0, 0, 0]))
+    uut.state_to_rank_idx_pair(BoardState([0, 0, 0, 0, 0, 0, 1, 2, 0]))
+    uut.state_to_rank_idx_pair(BoardState([1, 0, 0, 0, 2, 0, 0, 0, 0]))
+    self.assertEqual(2, uut.known_state_count)
+
 if __name__ == '__main__':
   unittest.main()
 
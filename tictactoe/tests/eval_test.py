@@ -0,0 +1,303 @@
+# pylint: disable=no-member
+
+import copy
+import random
+import unittest
+import numpy as np
+from deap import base, creator
+from gabasic import (
+  ProcessPoolMap,
+  SimpleGa,
+  TournamentSelection,
+  UniformMappingCrossover
+)
+from tictactoe import (
+  PolicyGene,
+  StateTable,
+  TicTacToeChromo,
+  TicTacToeArrayChromo,
+  ChangeActionMutation,
+  WinsVsLosses,
+  BatchWinsVsLosses,
+  SampledWinsVsLosses
+)
+from tictactoe.eval import best_moves
+
+
+class WinsVsLossesTest(unittest.TestCase):
+  def setUp(self):
+    random.seed(2048)
+    creator.create('FitnessMax', base.Fitness, weights=(1.0,))
+    self.toolbox = base.Toolbox()
+    TicTacToeChromo('FitnessMax').configure_toolbox(self.toolbox)
+    self.uut = WinsVsLosses()
+
+  def tearDown(self):
+    del creator.FitnessMax
+    PolicyGene.state_domain = None
+
+  def fresh_evaluation(self, individual):
+    the_copy = copy.deepcopy(individual)
+    del the_copy.traversal_memo
+    return self.uut(the_copy)
+
+  def test_completes_policy(self):
+    indiv = self.toolbox.individual()
+    gene_count = len(indiv)
+    self.uut(indiv)
+    self.assertLess(gene_count, len(indiv))
+    for state_tuple in indiv.traversal_memo.actions:
+      self.assertIn(state_tuple, indiv)
+
+  def test_unchanged_reevaluation(self):
+    indiv = self.toolbox.individual()
+    first_result = self.uut(indiv)
+    random_state = random.getstate()
+    self.assertEqual(first_result, self.uut(indiv))
+    self.assertEqual(random_state, random.getstate())
+
+  def test_incremental_reevaluation(self):
+    indiv = self.toolbox.individual()
+    self.uut(indiv)
+    for state_tuple in list(indiv.traversal_memo.actions)[::7]:
+      board_state = PolicyGene.state_domain.rank_idx_pair_to_state(state_tuple)
+      legal_moves = board_state.legal_moves()
+      action = indiv[state_tuple].action
+      indiv[state_tuple] = PolicyGene(
+        state_tuple,
+        legal_moves[(legal_moves.index(action) + 1) % len(legal_moves)]
+      )
+      result = self.uut(indiv)
+      self.assertEqual(self.fresh_evaluation(indiv), result)
+
+  def test_missing_gene_reevaluation(self):
+    indiv = self.toolbox.individual()
+    self.uut(indiv)
+    del indiv[(0, 0)]
+    result = self.uut(indiv)
+    self.assertIn((0, 0), indiv)
+    self.assertEqual(self.fresh_evaluation(indiv), result)
+
+class BatchWinsVsLossesTest(unittest.TestCase):
+  @classmethod
+  def setUpClass(cls):
+    cls.state_table = StateTable.build()
+
+  def setUp(self):
+    random.seed(2048)
+    creator.create('FitnessMax', base.Fitness, weights=(1.0,))
+    self.toolbox = base.Toolbox()
+    TicTacToeChromo('FitnessMax').configure_toolbox(self.toolbox)
+    PolicyGene.state_table = self.state_table
+    PolicyGene.state_domain = self.state_table.to_domain()
+    self.uut = BatchWinsVsLosses()
+
+  def tearDown(self):
+    del creator.FitnessMax
+    PolicyGene.state_domain = None
+    PolicyGene.state_table = None
+
+  def test_requires_state_table(self):
+    PolicyGene.state_table = None
+    with self.assertRaises(RuntimeError):
+      self.uut(self.toolbox.individual())
+
+  def test_matches_wins_vs_losses(self):
+    population = [self.toolbox.individual() for _ in range(20)]
+    self.uut.evaluate_population(population)
+    expected = [
+      WinsVsLosses()(copy.deepcopy(an_indiv)) for an_indiv in population
+    ]
+    self.assertEqual(expected, self.uut.evaluate_population(population))
+
+  def test_completes_policy(self):
+    indiv = self.toolbox.individual()
+    gene_count = len(indiv)
+    result = self.uut(indiv)
+    self.assertLess(gene_count, len(indiv))
+    completed_copy = copy.deepcopy(indiv)
+    self.assertEqual(WinsVsLosses()(completed_copy), result)
+    self.assertEqual(len(indiv), len(completed_copy))
+
+  def test_array_individuals(self):
+    population = [self.toolbox.individual() for _ in range(10)]
+    self.uut.evaluate_population(population)
+    arrays = []
+    for an_indiv in population:
+      actions = np.full(
+        self.state_table.state_count,
+        TicTacToeArrayChromo.UNSET_ACTION,
+        dtype=np.int8
+      )
+      for state_tuple, a_gene in an_indiv.items():
+        actions[self.state_table.state_id(state_tuple)] = a_gene.action
+      arrays.append(actions)
+    self.assertEqual(
+      self.uut.evaluate_population(population),
+      self.uut.evaluate_population(arrays)
+    )
+
+  def test_toolbox_map(self):
+    self.uut.configure_toolbox(self.toolbox)
+    population = [self.toolbox.individual() for _ in range(5)]
+    results = list(self.toolbox.map(self.toolbox.evaluate, population))
+    self.assertEqual(self.uut.evaluate_population(population), results)
+    self.assertEqual([2, 4], list(self.toolbox.map(lambda x: 2 * x, [1, 2])))
+
+  def test_profiled_run(self):
+    config = {
+      'population_size': '10',
+      'max_generation_count': '3',
+      'seed': '32',
+      'print_every': '0'
+    }
+    results = []
+    for profile_operators in ('false', 'true'):
+      mods = [
+        BatchWinsVsLosses(),
+        TicTacToeChromo('FitnessMax'),
+        TournamentSelection(tournament_size='3'),
+        UniformMappingCrossover(),
+        ChangeActionMutation()
+      ]
+      PolicyGene.state_table = self.state_table
+      PolicyGene.state_domain = self.state_table.to_domain()
+      (_, logbook) = SimpleGa(
+        mods,
+        profile_operators=profile_operators,
+        **config
+      ).run()
+      results.append([
+        {a_key: a_record[a_key] for a_key in ('nevals', 'avg', 'max', 'min')}
+        for a_record in logbook
+      ])
+    self.assertEqual(results[0], results[1])
+
+class SampledWinsVsLossesTest(unittest.TestCase):
+  @classmethod
+  def setUpClass(cls):
+    cls.state_table = StateTable.build()
+
+  def setUp(self):
+    random.seed(2048)
+    creator.create('FitnessMax', base.Fitness, weights=(1.0,))
+    self.toolbox = base.Toolbox()
+    TicTacToeChromo('FitnessMax').configure_toolbox(self.toolbox)
+    PolicyGene.state_table = self.state_table
+    PolicyGene.state_domain = self.state_table.to_domain()
+    self.uut = SampledWinsVsLosses(games='20')
+
+  def tearDown(self):
+    del creator.FitnessMax
+    PolicyGene.state_domain = None
+    PolicyGene.state_table = None
+
+  def full_policy(self):
+    """Array policy with a random action at every state."""
+    (moves, counts) = self.state_table.legal_moves
+    picks = [random.randrange(max(a_count, 1)) for a_count in counts]
+    return moves[np.arange(len(counts)), picks]
+
+  def test_completes_policy(self):
+    indiv = self.toolbox.individual()
+    gene_count = len(indiv)
+    (score,) = self.uut(indiv)
+    self.assertLess(gene_count, len(indiv))
+    self.assertTrue(0.0 <= score <= 2.0)
+
+  def test_best_policy_never_loses(self):
+    best_policy = best_moves(self.state_table)[0].astype(np.int8)
+    for opponent in SampledWinsVsLosses.OPPONENTS:
+      uut = SampledWinsVsLosses(games='200', opponent=opponent, epsilon='0.5')
+      self.assertEqual([(2.0,)], uut.evaluate_population([best_policy]))
+
+  def test_greedy_opponent(self):
+    population = [self.full_policy() for _ in range(20)]
+    greedy = SampledWinsVsLosses(opponent='epsilon_greedy', epsilon='0')
+    greedy_scores = [a_score for (a_score,) in greedy.evaluate_population(
+      population
+    )]
+    # Without exploration, every game from the same opening is the same.
+    for a_score in greedy_scores:
+      self.assertIn(a_score, (0.0, 1.0, 2.0))
+    random_scores = [a_score for (a_score,) in self.uut.evaluate_population(
+      population
+    )]
+    self.assertLess(sum(greedy_scores), sum(random_scores))
+
+  def test_common_random_numbers(self):
+    self.uut.configure_toolbox(self.toolbox)
+    population = [self.full_policy() for _ in range(10)]
+    results = list(self.toolbox.map(
+      self.toolbox.evaluate,
+      population + population[:1]
+    ))
+    self.assertEqual(results[0], results[-1])
+    alone = SampledWinsVsLosses(games='20')
+    self.assertEqual(
+      results[3:4],
+      alone.evaluate_population(population[3:4])
+    )
+    # Every generation plays new games.
+    self.assertEqual(1, self.uut.generation)
+    self.assertNotEqual(
+      results[:-1],
+      list(self.toolbox.map(self.toolbox.evaluate, population))
+    )
+
+  def test_individual_calls(self):
+    self.uut.configure_toolbox(self.toolbox)
+    population = [self.full_policy() for _ in range(5)]
+    self.toolbox.map(self.toolbox.evaluate, population)
+    results = [self.toolbox.evaluate(an_indiv) for an_indiv in population]
+    self.assertEqual(
+      results,
+      self.uut.evaluate_population(population)
+    )
+    self.assertEqual(1, self.uut.generation)
+    self.assertEqual(
+      results,
+      list(self.toolbox.map(self.toolbox.evaluate, population))
+    )
+    self.assertEqual(2, self.uut.generation)
+
+  def test_games_growth(self):
+    uut = SampledWinsVsLosses(games='10', games_growth='2', max_games='35')
+    self.assertEqual(
+      [10, 20, 35, 35],
+      [uut.generation_games(generation) for generation in range(4)]
+    )
+    uut.configure_toolbox(self.toolbox)
+    population = [self.full_policy() for _ in range(3)]
+    self.toolbox.map(self.toolbox.evaluate, population)
+    state = uut.checkpoint_state()
+    expected = uut.evaluate_population(population)
+    resumed = SampledWinsVsLosses(games='10', games_growth='2', max_games='35')
+    resumed.restore_checkpoint_state(state)
+    self.assertEqual(expected, resumed.evaluate_population(population))
+
+  def test_rejects_fitness_cache(self):
+    mods = [
+      self.uut,
+      TicTacToeChromo('FitnessMax'),
+      TournamentSelection(tournament_size='3'),
+      UniformMappingCrossover(),
+      ChangeActionMutation()
+    ]
+    with self.assertRaises(ValueError):
+      SimpleGa(mods, fitness_cache_size='100')
+    SimpleGa(mods)
+    mods[0] = BatchWinsVsLosses()
+    SimpleGa(mods, fitness_cache_size='100')
+
+  def test_rejects_pool_chunks(self):
+    self.uut.configure_toolbox(self.toolbox)
+    population = [self.toolbox.individual() for _ in range(4)]
+    pool_map = ProcessPoolMap(self.toolbox, 1, chunk_size=2)
+    with self.assertRaises(RuntimeError):
+      pool_map(self.toolbox.evaluate, population)
+
+if __name__ == '__main__':
+  unittest.main()
+
+# vim: set ts=2 sw=2 expandtab:
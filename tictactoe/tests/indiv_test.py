@@ -1,9 +1,20 @@
 # pylint: disable=no-member
 
+import copy
 import unittest
 import random
+import numpy as np
 from deap import base, tools, creator
-from tictactoe import PolicyGene, BoardStateDomain, TicTacToeChromo
+from tictactoe import (
+  PolicyGene,
+  BoardStateDomain,
+  TicTacToeChromo,
+  TicTacToeArrayChromo,
+  TicTacToeSharedChromo,
+  ChangeActionMutation,
+  ArrayChangeActionMutation,
+  WinsVsLosses
+)
 
 
 class PolicyGeneTest(unittest.TestCase):
@@ -20,11 +31,11 @@ class PolicyGeneTest(unittest.TestCase):
     # All expected values obtained empirically after fixing random seed
     PolicyGene.state_domain = BoardStateDomain()
     uut = PolicyGene.new_random()
-    self.assertEqual('(4, 0): 2', str(uut))
+    self.assertEqual('(1, 0): 7', str(uut))
     board_state = PolicyGene.state_domain.rank_idx_pair_to_state(
       uut.state_tuple
     )
-    self.assertEqual('[0, 0, 0, 0, 2, 1, 2, 1, 0]', str(board_state))
+    self.assertEqual('[0, 0, 0, 0, 1, 0, 0, 0, 0]', str(board_state))
 
   def test_random_gen(self):
     PolicyGene.state_domain = BoardStateDomain()
@@ -35,6 +46,23 @@ class PolicyGeneTest(unittest.TestCase):
       )
       self.assertFalse(board_state.final)
 
+  def test_new_random_batch(self):
+    np.random.seed(2048)
+    PolicyGene.state_domain = BoardStateDomain()
+    genes = PolicyGene.new_random_batch(500)
+    self.assertEqual(500, len(genes))
+    for a_gene in genes:
+      board_state = PolicyGene.state_domain.rank_idx_pair_to_state(
+        a_gene.state_tuple
+      )
+      self.assertFalse(board_state.final)
+      self.assertIn(a_gene.action, board_state.legal_move_tuple)
+
+  def test_batch_missing_domain_error(self):
+    PolicyGene.state_domain = None
+    with self.assertRaises(RuntimeError):
+      PolicyGene.new_random_batch(10)
+
 class TicTacToeChromoTest(unittest.TestCase):
   def setUp(self):
     random.seed(2048)
@@ -72,4 +100,139 @@ class TicTacToeChromoTest(unittest.TestCase):
         board_state = board_state.after_move(1, policy_gene.action)
     del creator.FitnessMax
 
+  def test_clone(self):
+    creator.create('FitnessMax', base.Fitness, weights=(1.0,))
+    toolbox = base.Toolbox()
+    TicTacToeChromo('FitnessMax').configure_toolbox(toolbox)
+    indiv = toolbox.individual()
+    WinsVsLosses()(indiv)
+    indiv.fitness.values = (0.5,)
+    the_clone = toolbox.clone(indiv)
+    self.assertIs(type(indiv), type(the_clone))
+    self.assertEqual(indiv, the_clone)
+    self.assertEqual(indiv.fitness, the_clone.fitness)
+    self.assertIsNot(indiv.fitness, the_clone.fitness)
+    self.assertEqual(
+      indiv.traversal_memo.outcomes,
+      the_clone.traversal_memo.outcomes
+    )
+    self.assertIsNot(indiv.traversal_memo, the_clone.traversal_memo)
+    state_tuple = next(iter(the_clone))
+    del the_clone[state_tuple]
+    self.assertIn(state_tuple, indiv)
+    del creator.FitnessMax
+
+class TicTacToeArrayChromoTest(unittest.TestCase):
+  def setUp(self):
+    random.seed(2048)
+    np.random.seed(2048)
+    creator.create('FitnessMax', base.Fitness, weights=(1.0,))
+    self.toolbox = base.Toolbox()
+    TicTacToeArrayChromo('FitnessMax').configure_toolbox(self.toolbox)
+
+  def tearDown(self):
+    del creator.FitnessMax
+    PolicyGene.state_domain = None
+    PolicyGene.state_table = None
+
+  def assert_legal_actions(self, indiv):
+    state_table = PolicyGene.state_table
+    for state_id in np.flatnonzero(indiv != TicTacToeArrayChromo.UNSET_ACTION):
+      board_state = state_table.board_state(state_id)
+      self.assertFalse(board_state.final)
+      self.assertIn(indiv[state_id], board_state.legal_move_tuple)
+
+  def test_toolbox_gen(self):
+    indiv = self.toolbox.individual()
+    self.assertTrue(isinstance(indiv, np.ndarray))
+    self.assertEqual(np.int8, indiv.dtype)
+    self.assertEqual((PolicyGene.state_table.state_count,), indiv.shape)
+    self.assertLess(0, np.count_nonzero(indiv >= 0))
+    self.assert_legal_actions(indiv)
+
+  def test_clone(self):
+    indiv = self.toolbox.individual()
+    indiv.fitness.values = (0.5,)
+    the_clone = self.toolbox.clone(indiv)
+    self.assertIs(type(indiv), type(the_clone))
+    self.assertTrue(np.array_equal(indiv, the_clone))
+    self.assertEqual(indiv.fitness, the_clone.fitness)
+    the_clone[:] = TicTacToeArrayChromo.UNSET_ACTION
+    self.assertFalse(np.array_equal(indiv, the_clone))
+
+  def test_mutation(self):
+    uut = ArrayChangeActionMutation(indiv_gene_mut_prob='1.0')
+    indiv = self.toolbox.individual()
+    original = indiv.copy()
+    (mutant,) = uut(indiv)
+    self.assertIs(indiv, mutant)
+    self.assertTrue(np.array_equal(original < 0, mutant < 0))
+    self.assert_legal_actions(mutant)
+    with self.assertRaises(TypeError):
+      uut({})
+
+class PolicyDict(dict):
+  pass
+
+class TicTacToeSharedChromoTest(unittest.TestCase):
+  def setUp(self):
+    random.seed(2048)
+    np.random.seed(2048)
+    creator.create('FitnessMax', base.Fitness, weights=(1.0,))
+    self.toolbox = base.Toolbox()
+    TicTacToeSharedChromo(
+      'FitnessMax',
+      chunk_count='8'
+    ).configure_toolbox(self.toolbox)
+
+  def tearDown(self):
+    del creator.FitnessMax
+    PolicyGene.state_domain = None
+
+  def test_toolbox_pop_gen(self):
+    ga_population = self.toolbox.population(n=10)
+    self.assertEqual(10, len(ga_population))
+    for an_indiv in ga_population:
+      self.assertIsInstance(an_indiv, creator.SharedPlayerPolicy)
+      self.assertEqual(8, an_indiv.chunk_count)
+      for state_tuple, policy_gene in an_indiv.items():
+        self.assertEqual(state_tuple, policy_gene.state_tuple)
+
+  def test_mutated_clone(self):
+    indiv = self.toolbox.individual()
+    actions = {
+      state_tuple: a_gene.action for state_tuple, a_gene in indiv.items()
+    }
+    the_clone = copy.deepcopy(indiv)
+    ChangeActionMutation(indiv_gene_mut_prob='1.0')(the_clone)
+    self.assertEqual(actions, {
+      state_tuple: a_gene.action for state_tuple, a_gene in indiv.items()
+    })
+    self.assertEqual(set(indiv), set(the_clone))
+
+  def test_dict_interface(self):
+    indiv = self.toolbox.individual()
+    as_dict = PolicyDict(indiv.items())
+    the_copy = indiv.copy()
+    self.assertIsInstance(the_copy, creator.SharedPlayerPolicy)
+    self.assertEqual(as_dict, the_copy)
+    (state_tuple, policy_gene) = the_copy.popitem()
+    self.assertEqual(state_tuple, policy_gene.state_tuple)
+    self.assertNotIn(state_tuple, the_copy)
+    self.assertEqual(len(indiv) - 1, len(the_copy))
+    self.assertEqual(as_dict, indiv)
+
+  def test_same_fitness_as_dict(self):
+    indiv = self.toolbox.individual()
+    as_dict = PolicyDict(indiv.items())
+    evaluation = WinsVsLosses()
+    random.seed(32)
+    dict_fitness = evaluation(as_dict)
+    random.seed(32)
+    self.assertEqual(dict_fitness, evaluation(indiv))
+    self.assertEqual(
+      TicTacToeChromo.genotype_key(as_dict),
+      TicTacToeChromo.genotype_key(indiv)
+    )
+
 # vim: set ts=2 sw=2 expandtab:
@@ -0,0 +1,74 @@
+import random
+import unittest
+import numpy as np
+from tictactoe import BoardState, StateSampler, RandomWalkSampler
+
+
+class StateSamplerTestCase(unittest.TestCase):
+  def setUp(self):
+    random.seed(2048)
+    np.random.seed(2048)
+    self.uut = StateSampler.shared()
+
+  def test_shared(self):
+    self.assertIs(self.uut, StateSampler.shared())
+
+  def test_boards(self):
+    ranks = np.count_nonzero(self.uut.contents, axis=1)
+    for board_idx in range(len(self.uut.contents)):
+      board_state = self.uut.board_state(board_idx)
+      self.assertFalse(board_state.final)
+      contents = list(self.uut.contents[board_idx])
+      self.assertIn(contents.count(1) - contents.count(2), (0, 1))
+    # Every walk of a given rank ends on exactly one board, so the weights of
+    # each rank add up to the probability of the walk not ending on a final
+    # board.
+    for a_rank in range(BoardState.CELL_COUNT):
+      rank_weight = self.uut.weights[ranks == a_rank].sum()
+      self.assertLessEqual(rank_weight, 1.0 + 1e-9)
+    self.assertAlmostEqual(1.0, self.uut.weights[ranks == 0].sum())
+    self.assertAlmostEqual(1.0, self.uut.weights[ranks == 4].sum())
+
+  def test_sample(self):
+    board_state = self.uut.sample()
+    self.assertTrue(isinstance(board_state, BoardState))
+    self.assertFalse(board_state.final)
+
+  def test_sample_distribution(self):
+    sample_count = 200000
+    expected = self.uut.weights / self.uut.weights.sum()
+    counts = np.bincount(
+      self.uut.sample_indices(sample_count),
+      minlength=len(expected)
+    )
+    self.assertLess(np.abs(counts / sample_count - expected).max(), 0.005)
+
+class RandomWalkSamplerTestCase(unittest.TestCase):
+  def setUp(self):
+    random.seed(2048)
+    BoardState.configure(4)
+
+  def tearDown(self):
+    BoardState.configure()
+
+  def test_shared(self):
+    uut = StateSampler.shared()
+    self.assertTrue(isinstance(uut, RandomWalkSampler))
+    self.assertEqual((4, 4, 4), uut.geometry)
+    BoardState.configure()
+    self.assertTrue(isinstance(StateSampler.shared(), StateSampler))
+
+  def test_sample(self):
+    ranks = set()
+    for _ in range(500):
+      board_state = RandomWalkSampler().sample()
+      self.assertFalse(board_state.final)
+      contents = board_state.__getstate__()
+      self.assertIn(contents.count(1) - contents.count(2), (0, 1))
+      ranks.add(board_state.rank)
+    self.assertEqual(set(range(16)), ranks)
+
+if __name__ == '__main__':
+  unittest.main()
+
+# vim: set ts=2 sw=2 expandtab:
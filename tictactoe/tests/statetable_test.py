@@ -0,0 +1,128 @@
+import os
+import pickle
+import unittest
+import tempfile
+from tictactoe import BoardState, StateTable, StateTableDomain
+
+
+class StateTableTestCase(unittest.TestCase):
+  @classmethod
+  def setUpClass(cls):
+    cls.state_table = StateTable.build()
+
+  def test_state_ordering(self):
+    records = self.state_table.records
+    self.assertEqual([0] * 9, list(records['cells'][0]))
+    self.assertEqual(sorted(records['rank']), list(records['rank']))
+    self.assertEqual(1192, self.state_table.state_count)
+
+  def test_address_round_trip(self):
+    for state_id in range(self.state_table.state_count):
+      rank_idx_pair = self.state_table.rank_idx_pair(state_id)
+      self.assertEqual(state_id, self.state_table.state_id(rank_idx_pair))
+
+  def test_children(self):
+    board_state = BoardState([1, 0, 0, 2, 0, 0, 0, 0, 0])
+    state_id = self.state_table.state_id_of(board_state)
+    canonical_state = self.state_table.board_state(state_id)
+    record = self.state_table.records[state_id]
+    self.assertFalse(record['final'])
+    for a_move in range(9):
+      child_id = record['child'][0][a_move]
+      if a_move in canonical_state.legal_moves():
+        child_state = canonical_state.after_move(1, a_move)
+        self.assertEqual(self.state_table.state_id_of(child_state), child_id)
+        child_config = record['child_config'][0][a_move]
+        self.assertEqual(
+          child_config,
+          self.state_table.board_state(child_id).matching_config(child_state)
+        )
+      else:
+        self.assertEqual(-1, child_id)
+
+  def test_final_states(self):
+    board_state = BoardState([2, 2, 2, 1, 1, 0, 1, 0, 0])
+    record = self.state_table.records[self.state_table.state_id_of(board_state)]
+    self.assertTrue(record['final'])
+    self.assertEqual(2, record['winner'])
+    self.assertEqual([-1] * 18, list(record['child'].flatten()))
+
+  def test_domain_addresses(self):
+    domain = self.state_table.to_domain()
+    self.assertEqual(self.state_table.state_count, domain.known_state_count)
+    board_state = BoardState([0, 0, 0, 0, 0, 2, 0, 0, 1])
+    self.assertEqual(
+      self.state_table.rank_idx_pair(self.state_table.state_id_of(board_state)),
+      domain.state_to_rank_idx_pair(board_state)
+    )
+
+  def test_save_and_load(self):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      table_path = os.path.join(tmp_dir, 'states.npy')
+      self.state_table.save(table_path)
+      loaded_table = StateTable.load(table_path)
+      self.assertEqual(
+        self.state_table.records.tobytes(),
+        loaded_table.records.tobytes()
+      )
+      self.assertIs(StateTable.open(table_path), StateTable.open(table_path))
+      del loaded_table
+      StateTable._open_tables.clear()
+
+class StateTableGeometryTestCase(unittest.TestCase):
+  @classmethod
+  def setUpClass(cls):
+    BoardState.configure(3, 4)
+    cls.state_table = StateTable.build()
+
+  @classmethod
+  def tearDownClass(cls):
+    BoardState.configure()
+
+  def test_state_ids(self):
+    self.assertEqual(12, self.state_table.cell_count)
+    self.assertEqual(45879, self.state_table.state_count)
+    for state_id in range(0, self.state_table.state_count, 97):
+      board_state = self.state_table.board_state(state_id)
+      self.assertEqual(state_id, self.state_table.state_id_of(board_state))
+    with self.assertRaises(KeyError):
+      self.state_table.state_id_of(
+        BoardState([1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0])
+      )
+
+  def test_children(self):
+    board_state = BoardState([0, 1, 0, 0, 0, 2, 0, 0, 0, 0, 0, 0])
+    state_id = self.state_table.state_id_of(board_state)
+    canonical_state = self.state_table.board_state(state_id)
+    record = self.state_table.records[state_id]
+    for a_move in canonical_state.legal_moves():
+      child_state = canonical_state.after_move(1, a_move)
+      child_id = record['child'][0][a_move]
+      self.assertEqual(self.state_table.state_id_of(child_state), child_id)
+      self.assertEqual(
+        record['child_config'][0][a_move],
+        self.state_table.board_state(child_id).matching_config(child_state)
+      )
+
+  def test_lazy_domain(self):
+    domain = self.state_table.to_domain()
+    self.assertTrue(isinstance(domain, StateTableDomain))
+    board_state = BoardState([0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 1])
+    rank_idx_pair = domain.state_to_rank_idx_pair(board_state)
+    self.assertEqual(
+      self.state_table.rank_idx_pair(self.state_table.state_id_of(board_state)),
+      rank_idx_pair
+    )
+    self.assertEqual(board_state, domain.rank_idx_pair_to_state(rank_idx_pair))
+    restored = pickle.loads(pickle.dumps(domain))
+    self.assertEqual(
+      board_state,
+      restored.rank_idx_pair_to_state(rank_idx_pair)
+    )
+    with self.assertRaises(ValueError):
+      restored.rank_idx_pair_to_state((rank_idx_pair[0], rank_idx_pair[1] + 1))
+
+if __name__ == '__main__':
+  unittest.main()
+
+# vim: set ts=2 sw=2 expandtab: